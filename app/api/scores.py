@@ -0,0 +1,44 @@
+"""
+Scores API
+Endpoints for submitting replay-backed high scores
+"""
+
+import base64
+import binascii
+from fastapi import APIRouter, HTTPException
+from models.schemas import ScoreSubmissionModel
+from core.replay import DIRECTIONS, Replay
+from app.services.score_verifier import DuplicateReplayError, ScoreSubmission, ScoreVerifier
+
+
+def create_scores_router(verifier: ScoreVerifier, board_size: int) -> APIRouter:
+    """Build the scores router around a verification pipeline"""
+    router = APIRouter(prefix='/api/scores', tags=['scores'])
+    
+    @router.post('', status_code=202)
+    async def submit_score(submission: ScoreSubmissionModel):
+        """Queue a score for verification by re-simulating its replay"""
+        if submission.board_size != board_size:
+            raise HTTPException(400, f"board_size must be {board_size}")
+        try:
+            inputs = base64.b64decode(submission.inputs, validate=True)
+        except binascii.Error:
+            raise HTTPException(400, "inputs must be base64")
+        if any(code >= len(DIRECTIONS) for code in set(inputs)):
+            raise HTTPException(400, "inputs contain an invalid direction code")
+        
+        replay = Replay(submission.board_size, submission.seed, inputs)
+        try:
+            queued = verifier.submit(ScoreSubmission(submission.player, submission.score, replay))
+        except DuplicateReplayError:
+            raise HTTPException(409, "this replay was already submitted")
+        if not queued:
+            raise HTTPException(429, "verification queue is full, retry later")
+        return {'status': 'queued'}
+    
+    @router.get('/verification')
+    async def verification_status():
+        """Verification pipeline counters"""
+        return verifier.counts()
+    
+    return router
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""
+Draw Canvas
+A <canvas> element drawn with server-side primitives, one message per frame
+"""
+
+from nicegui import ui
+from typing import List
+import json
+
+
+class DrawCommand:
+    """One draw primitive; style calls chain, e.g. ``rect(...).fill_color(...)``"""
+    
+    __slots__ = ('data',)
+    
+    def __init__(self, kind: str, args: tuple):
+        self.data = {'kind': kind, 'args': list(args)}
+    
+    def _style(self, name: str, value) -> 'DrawCommand':
+        self.data[name] = value
+        return self
+    
+    def fill_color(self, color: str) -> 'DrawCommand':
+        return self._style('fill_color', color)
+    
+    def stroke_color(self, color: str) -> 'DrawCommand':
+        return self._style('stroke_color', color)
+    
+    def stroke_width(self, width: float) -> 'DrawCommand':
+        return self._style('stroke_width', width)
+    
+    def font_size(self, size: float) -> 'DrawCommand':
+        return self._style('font_size', size)
+    
+    def text_anchor(self, anchor: str) -> 'DrawCommand':
+        return self._style('text_anchor', anchor)
+
+
+class DrawCanvas(ui.element):
+    """Canvas element the "full" and "dirty" render modes draw on
+    
+    Primitives are queued as they are made and sent by flush() as a single
+    SnakeRenderer.draw() call (static/snake_renderer.js), which paints them
+    in order on the canvas's 2D context.
+    """
+    
+    def __init__(self, width: int, height: int):
+        super().__init__('canvas')
+        self.props(f'width={width} height={height}')
+        self.commands: List[DrawCommand] = []
+    
+    def _add(self, kind: str, *args) -> DrawCommand:
+        command = DrawCommand(kind, args)
+        self.commands.append(command)
+        return command
+    
+    def clear(self) -> DrawCommand:
+        return self._add('clear')
+    
+    def rect(self, x: float, y: float, width: float, height: float) -> DrawCommand:
+        return self._add('rect', x, y, width, height)
+    
+    def line(self, x1: float, y1: float, x2: float, y2: float) -> DrawCommand:
+        return self._add('line', x1, y1, x2, y2)
+    
+    def circle(self, x: float, y: float, radius: float) -> DrawCommand:
+        return self._add('circle', x, y, radius)
+    
+    def text(self, text: str, x: float, y: float) -> DrawCommand:
+        return self._add('text', text, x, y)
+    
+    def flush(self) -> int:
+        """Send the queued primitives to the browser; returns the message size in bytes"""
+        if not self.commands:
+            return 0
+        primitives = json.dumps([command.data for command in self.commands], separators=(',', ':'))
+        self.commands = []
+        call = f"SnakeRenderer.draw('c{self.id}',{primitives})"
+        self.client.run_javascript(call)
+        return len(call)
\ No newline at end of file
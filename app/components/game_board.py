@@ -4,41 +4,115 @@ Visual representation of the Snake game
 """
 
 from nicegui import ui
-from typing import Callable, Optional
+from typing import Callable, List, Optional
+import json
 from models.game_state import GameState, Position
+from core.frames import FrameDelta, FrameTracker, Viewport, encode_frame
 from app.config import settings
+from core.metrics import registry, COUNT_BUCKETS
+from app.components.draw_canvas import DrawCanvas
+
+
+DRAW_PRIMITIVES = registry.histogram('snake_draw_primitives', 'Canvas draw primitives sent per frame', COUNT_BUCKETS)
+FRAME_BYTES = registry.histogram('snake_frame_bytes', 'Size of frame messages sent to the browser',
+                                 (16, 32, 64, 128, 256, 512, 1024, 4096, 16384))
+SKIPPED_FRAMES = registry.counter('snake_frames_skipped', 'Ticks not drawn while render work is shed under load')
+
+
+def client_renderer_init_call(canvas: ui.element, name: Optional[str] = None) -> str:
+    """JavaScript giving the browser-side renderer the colors and sizes for a canvas element"""
+    config = {
+        'cellSize': settings.cell_size,
+        'backgroundColor': settings.background_color,
+        'borderColor': settings.border_color,
+        'snakeColor': settings.snake_color,
+        'snakeHeadColor': settings.snake_head_color,
+        'foodColor': settings.food_color,
+    }
+    name = json.dumps(name) if name else 'undefined'
+    return f"SnakeRenderer.init('c{canvas.id}', {json.dumps(config)}, {name})"
+
+
+def init_client_renderer(canvas: ui.element, name: Optional[str] = None):
+    """Send colors and sizes to the browser-side renderer for a canvas element"""
+    canvas.client.run_javascript(client_renderer_init_call(canvas, name))
 
 
 class GameBoard:
-    """Snake game board component"""
+    """Snake game board component
     
-    def __init__(self, on_key_press: Optional[Callable] = None):
+    Render modes:
+    - ``full``: clear and redraw the whole board every frame
+    - ``dirty``: draw the background and grid once on a static layer and
+      send only the cells that changed since the previous frame
+    
+    Both draw on DrawCanvas elements, sending one message of primitives
+    per frame.
+    - ``client``: draw in the browser (static/snake_renderer.js) from one
+      compact frame message per tick; no draw commands are built server-side
+    
+    Boards larger than ``viewport_size`` show only a window of cells around
+    the snake head, which re-centers when the head nears its edge.
+    """
+    
+    def __init__(self, on_key_press: Optional[Callable] = None, render_mode: Optional[str] = None):
         self.on_key_press = on_key_press
+        self.render_mode = render_mode or settings.render_mode
         self.canvas = None
+        self.background_canvas = None
         self.game_state: Optional[GameState] = None
+        self.frame_tracker = FrameTracker()
+        self._skipped_deltas: List[FrameDelta] = []  # changes of ticks not drawn yet
+        self._viewport_moved = False
+        self._frame_primitives = 0
+        self.view_size = min(settings.board_size, settings.viewport_size)
+        self.viewport = Viewport(self.view_size)
         self._setup_board()
     
     def _setup_board(self):
         """Setup the game board canvas"""
-        board_pixel_size = settings.board_size * settings.cell_size
+        board_pixel_size = self.view_size * settings.cell_size
         
         with ui.card().classes('p-4 bg-gray-900 border-2 border-gray-700'):
             with ui.row().classes('justify-center'):
-                self.canvas = ui.canvas(
-                    width=board_pixel_size,
-                    height=board_pixel_size
-                ).classes('border-2 border-gray-600 rounded-lg')
+                if self.render_mode == 'client':
+                    self.canvas = ui.element('canvas').props(
+                        f'width={board_pixel_size} height={board_pixel_size}'
+                    ).classes('border-2 border-gray-600 rounded-lg')
+                    self._init_client_renderer()
+                elif self.render_mode == 'dirty':
+                    # Static background layer below the dynamic canvas
+                    with ui.element('div').classes('relative'):
+                        self.background_canvas = DrawCanvas(
+                            width=board_pixel_size,
+                            height=board_pixel_size
+                        ).classes('border-2 border-gray-600 rounded-lg')
+                        self.canvas = DrawCanvas(
+                            width=board_pixel_size,
+                            height=board_pixel_size
+                        ).classes('absolute top-0 left-0 border-2 border-transparent')
+                    self._draw_background(self.background_canvas)
+                    self.background_canvas.flush()
+                else:
+                    self.canvas = DrawCanvas(
+                        width=board_pixel_size,
+                        height=board_pixel_size
+                    ).classes('border-2 border-gray-600 rounded-lg')
                 
                 # Setup keyboard controls
                 if self.on_key_press:
-                    self.canvas.on('keydown', self._handle_keydown)
+                    self.canvas.on('keydown', self._handle_keydown, ['key'])
                 
                 # Make canvas focusable for keyboard events
                 self.canvas.props('tabindex="0"')
-                
+        
         # Focus the canvas for immediate keyboard input
         ui.timer(0.1, lambda: self.canvas.run_method('focus'), once=True)
     
+    def _init_client_renderer(self):
+        """Send colors and sizes to the browser-side renderer"""
+        init_client_renderer(self.canvas)
+    
     def _handle_keydown(self, event):
         """Handle keyboard input"""
         if self.on_key_press:
@@ -50,16 +124,108 @@ class GameBoard:
         self.game_state = game_state
         self._draw_game()
     
+    def skip_frame(self, game_state: GameState):
+        """Take a tick without drawing it; the next drawn frame catches up
+        
+        The tick's cell changes are kept so the next frame can still be sent
+        as deltas instead of a full redraw.
+        """
+        self.game_state = game_state
+        if not self.canvas:
+            return
+        SKIPPED_FRAMES.inc()
+        if self.viewport.follow(game_state):
+            self._viewport_moved = True
+        if self.render_mode != 'full':
+            delta = self.frame_tracker.diff(game_state)
+            if delta is not None:
+                self._skipped_deltas.append(delta)
+    
     def _draw_game(self):
-        """Draw the complete game state"""
+        """Draw the current game state"""
         if not self.canvas or not self.game_state:
             return
         
+        viewport_moved = self.viewport.follow(self.game_state) or self._viewport_moved
+        self._viewport_moved = False
+        if self.render_mode == 'client':
+            self._send_frame(viewport_moved)
+            return
+        
+        self._frame_primitives = 0
+        if self.render_mode == 'dirty':
+            self._draw_dirty(viewport_moved)
+        else:
+            self._draw_full()
+        DRAW_PRIMITIVES.observe(self._frame_primitives)
+        sent = self.canvas.flush()
+        if sent:
+            FRAME_BYTES.observe(sent)
+    
+    def _frame_deltas(self) -> List[FrameDelta]:
+        """Changes since the last drawn frame: those of skipped ticks, then this one"""
+        deltas = self._skipped_deltas
+        self._skipped_deltas = []
+        delta = self.frame_tracker.diff(self.game_state)
+        if delta is not None:
+            deltas.append(delta)
+        return deltas
+    
+    def _send_frame(self, viewport_moved: bool = False):
+        """Send one compact frame message to the browser-side renderer
+        
+        Deltas of skipped ticks go out in the same message, or a keyframe
+        replaces them all.
+        """
+        deltas = self._frame_deltas()
+        if not deltas:
+            return
+        
+        if viewport_moved or any(delta.full for delta in deltas):
+            deltas = deltas[-1:]
+            deltas[0].full = True
+        calls = []
+        for delta in deltas:
+            frame = encode_frame(delta, self.game_state, self.viewport.bounds)
+            frame = json.dumps(frame, separators=(',', ':'))
+            FRAME_BYTES.observe(len(frame))
+            calls.append(f"SnakeRenderer.frame('c{self.canvas.id}',{frame})")
+        self.canvas.client.run_javascript(';'.join(calls))
+    
+    def _draw_dirty(self, viewport_moved: bool = False):
+        """Draw only the cells that changed since the previous frame"""
+        deltas = self._frame_deltas()
+        if not deltas:
+            return
+        
+        # Full redraw of the dynamic layer on state changes
+        if viewport_moved or any(delta.full for delta in deltas):
+            self._draw_full(background=False)
+            return
+        
+        for delta in deltas:
+            self._draw_delta(delta)
+    
+    def _draw_delta(self, delta: FrameDelta):
+        """Draw the cells one tick changed"""
+        body = self.game_state.body
+        if delta.removed_tail >= 0:
+            self._erase_cell(*body.unpack(delta.removed_tail))
+        if delta.food >= 0:
+            x, y = body.unpack(delta.food)
+            self._draw_food(Position(x=x, y=y))
+        self._draw_segment(*body.unpack(delta.neck), settings.snake_color)
+        self._draw_segment(*body.unpack(delta.head), settings.snake_head_color)
+    
+    def _draw_full(self, background: bool = True):
+        """Draw the complete game state"""
         # Clear canvas
         self.canvas.clear()
+        self._frame_primitives += 1
         
         # Draw background
-        self._draw_background()
+        if background:
+            self._draw_background()
         
         # Draw food
         if self.game_state.food:
@@ -69,30 +235,48 @@ class GameBoard:
         self._draw_snake(self.game_state.snake)
         
         # Draw game over overlay
-        if self.game_state.is_game_over:
+        if self.game_state.is_won:
+            self._draw_victory()
+        elif self.game_state.is_game_over:
             self._draw_game_over()
         elif self.game_state.is_paused:
             self._draw_paused()
     
-    def _draw_background(self):
+    def _draw_background(self, canvas=None):
         """Draw the game background"""
-        board_size = settings.board_size * settings.cell_size
+        canvas = canvas or self.canvas
+        board_size = self.view_size * settings.cell_size
         
         # Background
-        self.canvas.rect(0, 0, board_size, board_size).fill_color(settings.background_color)
+        canvas.rect(0, 0, board_size, board_size).fill_color(settings.background_color)
+        
+        self._frame_primitives += 1 + 2 * (self.view_size + 1)
         
         # Grid lines
-        for i in range(settings.board_size + 1):
+        for i in range(self.view_size + 1):
             pos = i * settings.cell_size
             # Vertical lines
-            self.canvas.line(pos, 0, pos, board_size).stroke_color(settings.border_color).stroke_width(1)
+            canvas.line(pos, 0, pos, board_size).stroke_color(settings.border_color).stroke_width(1)
             # Horizontal lines
-            self.canvas.line(0, pos, board_size, pos).stroke_color(settings.border_color).stroke_width(1)
+            canvas.line(0, pos, board_size, pos).stroke_color(settings.border_color).stroke_width(1)
+    
+    def _erase_cell(self, cell_x: int, cell_y: int):
+        """Paint a cell back to the background"""
+        view = self.viewport.to_view(cell_x, cell_y)
+        if view is None:
+            return
+        x, y = view
+        size = settings.cell_size
+        self._frame_primitives += 1
+        self.canvas.rect(x * size, y * size, size, size).fill_color(settings.background_color).stroke_color(settings.border_color).stroke_width(1)
     
     def _draw_food(self, food: Position):
         """Draw food item"""
-        x = food.x * settings.cell_size + 2
-        y = food.y * settings.cell_size + 2
+        view = self.viewport.to_view(food.x, food.y)
+        if view is None:
+            return
+        x = view[0] * settings.cell_size + 2
+        y = view[1] * settings.cell_size + 2
         size = settings.cell_size - 4
         
         # Draw food as a circle
@@ -100,25 +284,34 @@ class GameBoard:
         center_y = y + size // 2
         radius = size // 2 - 2
         
+        self._frame_primitives += 1
         self.canvas.circle(center_x, center_y, radius).fill_color(settings.food_color)
     
     def _draw_snake(self, snake: list[Position]):
         """Draw the snake"""
         for i, segment in enumerate(snake):
-            x = segment.x * settings.cell_size + 1
-            y = segment.y * settings.cell_size + 1
-            size = settings.cell_size - 2
-            
             # Head is different color
             color = settings.snake_head_color if i == 0 else settings.snake_color
-            
-            self.canvas.rect(x, y, size, size).fill_color(color).stroke_color('#ffffff').stroke_width(1)
+            self._draw_segment(segment.x, segment.y, color)
+    
+    def _draw_segment(self, cell_x: int, cell_y: int, color: str):
+        """Draw a single snake segment"""
+        view = self.viewport.to_view(cell_x, cell_y)
+        if view is None:
+            return
+        x = view[0] * settings.cell_size + 1
+        y = view[1] * settings.cell_size + 1
+        size = settings.cell_size - 2
+        
+        self._frame_primitives += 1
+        self.canvas.rect(x, y, size, size).fill_color(color).stroke_color('#ffffff').stroke_width(1)
     
     def _draw_game_over(self):
         """Draw game over overlay"""
-        board_size = settings.board_size * settings.cell_size
+        board_size = self.view_size * settings.cell_size
         
         # Semi-transparent overlay
+        self._frame_primitives += 3
         self.canvas.rect(0, 0, board_size, board_size).fill_color('rgba(0, 0, 0, 0.7)')
         
         # Game Over text
@@ -128,11 +321,27 @@ class GameBoard:
         self.canvas.text('GAME OVER', center_x, center_y - 20).font_size(24).fill_color('#ff4444').text_anchor('middle')
         self.canvas.text('Press R to restart', center_x, center_y + 10).font_size(16).fill_color('#ffffff').text_anchor('middle')
     
+    def _draw_victory(self):
+        """Draw victory overlay when the snake fills the board"""
+        board_size = self.view_size * settings.cell_size
+        
+        # Semi-transparent overlay
+        self._frame_primitives += 3
+        self.canvas.rect(0, 0, board_size, board_size).fill_color('rgba(0, 0, 0, 0.7)')
+        
+        # Victory text
+        center_x = board_size // 2
+        center_y = board_size // 2
+        
+        self.canvas.text('YOU WIN!', center_x, center_y - 20).font_size(24).fill_color('#44ff44').text_anchor('middle')
+        self.canvas.text('Press R to play again', center_x, center_y + 10).font_size(16).fill_color('#ffffff').text_anchor('middle')
+    
     def _draw_paused(self):
         """Draw paused overlay"""
-        board_size = settings.board_size * settings.cell_size
+        board_size = self.view_size * settings.cell_size
         
         # Semi-transparent overlay
+        self._frame_primitives += 3
         self.canvas.rect(0, 0, board_size, board_size).fill_color('rgba(0, 0, 0, 0.5)')
         
         # Paused text
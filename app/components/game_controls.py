@@ -10,7 +10,7 @@ from typing import Callable, Optional
 class GameControls:
     """Game control buttons and instructions"""
     
-    def __init__(self, 
+    def __init__(self,
                  on_start: Optional[Callable] = None,
                  on_pause: Optional[Callable] = None,
                  on_reset: Optional[Callable] = None):
@@ -76,6 +76,7 @@ class KeyboardInstructions:
                 ('→ / D', 'Move Right'),
                 ('SPACE', 'Pause/Resume'),
                 ('R', 'Restart Game'),
+                ('P', 'Autopilot'),
             ]
             
             for key, action in controls:
@@ -14,6 +14,7 @@ class ScoreDisplay:
         self.score_label = None
         self.high_score_label = None
         self.length_label = None
+        self._shown = None
         self._setup_display()
     
     def _setup_display(self):
@@ -27,15 +28,21 @@ class ScoreDisplay:
                 self.length_label = ui.label('Length: 3').classes('text-lg text-blue-400 font-mono')
     
     def update(self, game_state: GameState, high_score: int):
-        """Update the score display"""
-        if self.score_label:
+        """Update the score display, touching only labels whose value changed"""
+        shown = (game_state.score, high_score, len(game_state.body))
+        if shown == self._shown:
+            return
+        previous = self._shown or (None, None, None)
+        self._shown = shown
+        
+        if self.score_label and shown[0] != previous[0]:
             self.score_label.text = f'Score: {game_state.score}'
         
-        if self.high_score_label:
+        if self.high_score_label and shown[1] != previous[1]:
             self.high_score_label.text = f'High Score: {high_score}'
         
-        if self.length_label:
-            self.length_label.text = f'Length: {len(game_state.snake)}'
+        if self.length_label and shown[2] != previous[2]:
+            self.length_label.text = f'Length: {len(game_state.body)}'
 
 
 class HighScoreTable:
@@ -43,6 +50,7 @@ class HighScoreTable:
     
     def __init__(self):
         self.table = None
+        self._rendered = None
         self._setup_table()
     
     def _setup_table(self):
@@ -64,6 +72,12 @@ class HighScoreTable:
         if not self.table_content:
             return
         
+        # Skip the rebuild unless the scores changed since the last render
+        rendered = (id(high_scores), high_scores.revision)
+        if rendered == self._rendered:
+            return
+        self._rendered = rendered
+        
         # Clear existing content
         self.table_content.clear()
         
@@ -5,6 +5,7 @@ Application Configuration
 import os
 from pydantic_settings import BaseSettings
 from typing import Optional
+from core.game_engine import SPARSE_BOARD_THRESHOLD
 
 
 class Settings(BaseSettings):
@@ -14,14 +15,40 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8000
     debug: bool = False
+    workers: int = 1          # game processes; >1 starts a sticky sharding router
+    worker_base_port: int = 9000
+    worker_name: str = ""     # set by the sharding router; spectator links name their worker
     
     # Game Configuration
     game_speed: int = 150  # milliseconds between moves
     board_size: int = 20   # board dimensions (20x20)
-    high_score_file: str = "high_scores.json"
+    sparse_board_threshold: int = SPARSE_BOARD_THRESHOLD  # larger boards use hashed occupancy
+    high_score_file: str = "high_scores.json"   # legacy file, migrated on first start
+    high_score_db: str = "high_scores.db"
+    score_fsync: str = "normal"        # "off", "normal" or "full"
+    score_cache_ttl: float = 5.0       # seconds between top-N cache refreshes
+    replay_dir: str = ""               # directory for finished-game replays ("" disables)
+    verify_workers: int = 1            # processes re-simulating submitted scores
+    verify_queue_size: int = 100       # pending submissions before new ones are refused
+    
+    # Session Configuration
+    max_sessions: int = 200            # concurrent game sessions per process
+    session_idle_timeout: int = 300    # seconds without input before eviction
+    session_sweep_interval: int = 30   # seconds between idle session sweeps
+    spectator_max_backlog: int = 2     # queued socket packets before a spectator skips frames
+    session_snapshot_db: str = "sessions.db"  # in-progress games kept across restarts ("" disables)
+    session_snapshot_interval: float = 2.0    # seconds between saves of changed sessions
+    session_snapshot_max_age: int = 86400     # seconds a saved game stays resumable
+    storage_secret: str = ""           # signs the browser id cookie; kept with the snapshots when empty
+    bot_count: int = 0                 # server-side autopilot games ticked alongside players
+    governor_high_water: float = 0.6   # share of the tick period in use before render work is shed
+    governor_low_water: float = 0.3    # share of the tick period below which it is restored
+    admission_utilization: float = 0.8  # share of measured capacity new sessions may fill (0 disables)
     
     # Visual Configuration
+    render_mode: str = "dirty"   # "full" redraw, "dirty" cells only, or "client" side
     cell_size: int = 25    # pixels per cell
+    viewport_size: int = 40  # cells shown around the head on larger boards
     border_width: int = 2
     
     # Colors
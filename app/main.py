@@ -3,32 +3,90 @@ Snake Game - Main Application
 Professional Snake game with NiceGUI interface
 """
 
-from nicegui import ui, app
+from nicegui import ui, app, Client
+from typing import Callable, Optional
 from core.game_engine import SnakeGameEngine
+from core.snapshot import SnapshotError, restore_engine
+from core.autopilot import Autopilot
 from models.game_state import Direction
-from app.components.game_board import GameBoard
+from app.components.game_board import GameBoard, client_renderer_init_call
 from app.components.score_display import ScoreDisplay, HighScoreTable
 from app.components.game_controls import GameControls, KeyboardInstructions
 from app.config import settings
+from app.services.session_manager import SessionManager, SessionLimitError
+from app.services.tick_scheduler import tick_scheduler
+from app.services.tick_governor import TickGovernor
+from app.services.score_verifier import ScoreVerifier
+from app.services.spectator import SpectatorHub, SPECTATOR_BOARD
+from app.services.latency import LatencyStats
+from app.services.session_snapshots import SessionSnapshotStore
+from app.services.bots import BotPool
+from fastapi.responses import PlainTextResponse
+from core.metrics import registry
+from app.api.scores import create_scores_router
+from core.score_store import get_score_store
+from core.replay import get_replay_archive
 import asyncio
+import random
+import secrets
+import time
+from pathlib import Path
 
 
 class SnakeGameApp:
     """Main Snake Game Application"""
     
-    def __init__(self):
-        self.game_engine = SnakeGameEngine()
+    def __init__(self, on_activity: Optional[Callable] = None, game_speed: Optional[int] = None,
+                 snapshot_key: Optional[str] = None, snapshot: Optional[bytes] = None):
+        self.snapshot_key = snapshot_key  # browser id the game is saved under across restarts
+        self.game_engine = self._create_engine(snapshot)
+        self.autopilot: Optional[Autopilot] = None  # set while the computer plays (demo mode)
         self.game_board = None
         self.score_display = None
         self.high_score_table = None
-        self.game_timer = None
+        self.client = ui.context.client
+        self.tick_interval = (game_speed or settings.game_speed) / 1000.0  # Convert to seconds
         self.is_running = False
+        self.is_closed = False
+        self.last_active = time.monotonic()
+        self.ticks = random.randrange(1 << 16)  # random phase, so shed frames spread over batches
+        self.pending_input_time: Optional[float] = None  # applied on a tick that was not drawn yet
+        self.on_activity = on_activity
+        
+        # Spectators watch this game at /watch/<watch_id>; behind the sharding
+        # router the id starts with this worker's name so it is routed here
+        self.watch_id = secrets.token_urlsafe(8)
+        if settings.worker_name:
+            self.watch_id = f'{settings.worker_name}.{self.watch_id}'
+        spectator_hub.open(self.watch_id, self.game_engine.get_game_state())
         
         # Setup the UI
         self._setup_ui()
         
-        # Start the game loop
-        self._start_game_loop()
+        # Start the game loop; a resumed game waits for the player
+        if not self.game_engine.get_game_state().is_paused:
+            self._start_game_loop()
+    
+    @staticmethod
+    def _create_engine(snapshot: Optional[bytes]) -> SnakeGameEngine:
+        """New game engine, or the game resumed from a snapshot, paused"""
+        if snapshot is not None:
+            try:
+                engine = restore_engine(snapshot, score_store=get_score_store(),
+                                        replay_archive=get_replay_archive())
+            except SnapshotError as e:
+                print(f"Error restoring session: {e}")
+            else:
+                state = engine.get_game_state()
+                if state.board_size == settings.board_size:
+                    state.is_paused = not state.is_game_over
+                    return engine
+        return SnakeGameEngine(
+            score_store=get_score_store(),
+            board_size=settings.board_size,
+            replay_archive=get_replay_archive(),
+            sparse_threshold=settings.sparse_board_threshold
+        )
     
     def _setup_ui(self):
         """Setup the main user interface"""
@@ -56,6 +114,7 @@ class SnakeGameApp:
                         on_reset=self._reset_game
                     )
                     KeyboardInstructions()
+                    ui.link('👀 Spectator link', f'/watch/{self.watch_id}', new_tab=True).classes('text-gray-300')
             
             # High scores table
             with ui.row().classes('w-full justify-center mt-6'):
@@ -65,8 +124,30 @@ class SnakeGameApp:
         # Initial display update
         self._update_display()
     
+    @property
+    def is_idle(self) -> bool:
+        """True when the game loop is not running (paused, over or closed)"""
+        return not self.is_running
+    
+    def close(self):
+        """Stop the game loop and ignore further input"""
+        self._stop_game_loop()
+        spectator_hub.close(self.watch_id)
+        if session_snapshots and self.snapshot_key:
+            session_snapshots.save(self.snapshot_key, self.game_engine)
+        self.is_closed = True
+    
+    def _touch(self):
+        """Report user activity to the session owner"""
+        if self.on_activity:
+            self.on_activity()
+    
     def _handle_key_press(self, key: str):
         """Handle keyboard input for game controls"""
+        if self.is_closed:
+            return
+        self._touch()
+        
         # Movement keys
         key_to_direction = {
             'arrowup': Direction.UP,
@@ -80,58 +161,92 @@ class SnakeGameApp:
         }
         
         if key in key_to_direction:
-            self.game_engine.change_direction(key_to_direction[key])
+            self.autopilot = None  # the player takes over
+            self.game_engine.change_direction(key_to_direction[key], time.monotonic())
         elif key == ' ':  # Space for pause
             self._toggle_pause()
         elif key == 'r':  # R for reset
             self._reset_game()
+        elif key == 'p':  # P toggles the autopilot
+            self.autopilot = None if self.autopilot else Autopilot(self.game_engine)
     
     def _start_game_loop(self):
         """Start the main game loop"""
-        if not self.is_running:
+        if not self.is_running and not self.is_closed:
             self.is_running = True
-            self.game_timer = ui.timer(
-                settings.game_speed / 1000.0,  # Convert to seconds
-                self._game_tick
-            )
+            tick_scheduler.register(self, self.tick_interval, self._scheduled_tick)
     
     def _stop_game_loop(self):
         """Stop the main game loop"""
-        if self.game_timer:
-            self.game_timer.cancel()
-            self.game_timer = None
+        tick_scheduler.unregister(self)
         self.is_running = False
     
+    def _scheduled_tick(self):
+        """Game tick invoked by the shared scheduler"""
+        with self.client:
+            self._game_tick()
+    
     def _game_tick(self):
         """Single game loop iteration"""
+        if self.autopilot:
+            self.game_engine.change_direction(self.autopilot.next_direction())
+            # A demo game someone is watching is not an idle session
+            self._touch()
+        
         # Update game state
+        started = time.perf_counter()
         continue_game = self.game_engine.update()
+        updated = time.perf_counter()
         
-        # Update display
-        self._update_display()
+        # Update display; under load the governor sheds some of it, but the
+        # last frame of a game is always drawn
+        self.ticks += 1
+        drawn = self._update_display(self.ticks if continue_game else None)
+        TICK_SECONDS.observe(time.perf_counter() - started)
+        UPDATE_SECONDS.observe(updated - started)
+        
+        # Time from key press to the frame showing its move
+        if self.game_engine.applied_input_time is not None:
+            self.pending_input_time = self.game_engine.applied_input_time
+        if drawn and self.pending_input_time is not None:
+            latency = time.monotonic() - self.pending_input_time
+            self.pending_input_time = None
+            input_latency.record(latency)
+            INPUT_LATENCY_SECONDS.observe(latency)
         
         # Stop loop if game over
         if not continue_game and self.game_engine.get_game_state().is_game_over:
             self._stop_game_loop()
     
-    def _update_display(self):
-        """Update all UI components"""
+    def _update_display(self, tick: Optional[int] = None) -> bool:
+        """Update all UI components; returns whether the board was drawn
+        
+        ``tick`` is the game loop tick being shown, for which the governor
+        may skip the canvas, labels or high score table. Without it (state
+        changes outside the loop) everything is updated.
+        """
         game_state = self.game_engine.get_game_state()
-        high_score = self.game_engine.get_high_score()
-        high_scores = self.game_engine.get_high_scores()
+        drawn = tick is None or tick_governor.render_frame(tick)
         
         # Update components
         if self.game_board:
-            self.game_board.update_display(game_state)
+            if drawn:
+                self.game_board.update_display(game_state)
+            else:
+                self.game_board.skip_frame(game_state)
+        
+        spectator_hub.publish(self.watch_id)
         
-        if self.score_display:
-            self.score_display.update(game_state, high_score)
+        if self.score_display and (tick is None or tick_governor.update_labels(tick)):
+            self.score_display.update(game_state, self.game_engine.get_high_score())
         
-        if self.high_score_table:
-            self.high_score_table.update(high_scores)
+        if self.high_score_table and (tick is None or tick_governor.refresh_high_scores()):
+            self.high_score_table.update(self.game_engine.get_high_scores())
+        return drawn
     
     def _start_game(self):
         """Start or resume the game"""
+        self._touch()
         game_state = self.game_engine.get_game_state()
         
         if game_state.is_game_over:
@@ -143,6 +258,7 @@ class SnakeGameApp:
     
     def _toggle_pause(self):
         """Toggle game pause state"""
+        self._touch()
         self.game_engine.toggle_pause()
         game_state = self.game_engine.get_game_state()
         
@@ -155,45 +271,217 @@ class SnakeGameApp:
     
     def _reset_game(self):
         """Reset the game to initial state"""
+        self._touch()
         self._stop_game_loop()
         self.game_engine.reset_game()
         self._update_display()
         self._start_game_loop()
 
 
-# Global app instance
-snake_app = None
+# Static assets (client-side renderer)
+app.add_static_files('/static', str(Path(__file__).parent / 'static'))
+
+
+# Sheds render work when ticks run long and caps sessions at the measured capacity
+tick_governor = TickGovernor(
+    tick_scheduler,
+    settings.game_speed / 1000.0,
+    high_water=settings.governor_high_water,
+    low_water=settings.governor_low_water,
+    admission_utilization=settings.admission_utilization
+)
+
+
+# Per-client game sessions
+session_manager = SessionManager(
+    max_sessions=settings.max_sessions,
+    idle_timeout=settings.session_idle_timeout,
+    admission=tick_governor.admits
+)
+
+
+# Watched games, broadcast once per tick to all their spectators
+spectator_hub = SpectatorHub(
+    view_size=min(settings.board_size, settings.viewport_size),
+    max_backlog=settings.spectator_max_backlog
+)
+
+
+# Server-side time from a direction key arriving to its frame being sent
+input_latency = LatencyStats()
+
+
+async def _sweep_idle_sessions():
+    """Periodically evict sessions that have gone idle"""
+    while True:
+        await asyncio.sleep(settings.session_sweep_interval)
+        session_manager.evict_idle()
+
+
+# Autopilot games played on the server alongside real players
+bot_pool = BotPool(
+    tick_scheduler,
+    settings.game_speed / 1000.0,
+    board_size=settings.board_size,
+    sparse_threshold=settings.sparse_board_threshold
+)
+
+
+# In-progress games saved in the background and resumed by browser id after a restart
+session_snapshots = (
+    SessionSnapshotStore(settings.session_snapshot_db, max_age=settings.session_snapshot_max_age)
+    if settings.session_snapshot_db else None
+)
+
+
+async def _save_session_snapshots():
+    """Periodically save the games that changed since the last round"""
+    while True:
+        await asyncio.sleep(settings.session_snapshot_interval)
+        session_snapshots.save_changed(
+            (session.snapshot_key, session.game_engine) for session in session_manager if session.snapshot_key
+        )
+
+
+# Replay-backed score submissions, verified off the event loop
+score_verifier = ScoreVerifier(
+    get_score_store(),
+    workers=settings.verify_workers,
+    queue_size=settings.verify_queue_size,
+    sparse_threshold=settings.sparse_board_threshold,
+    replay_archive=get_replay_archive()
+)
+app.include_router(create_scores_router(score_verifier, settings.board_size))
+
+
+# Runtime metrics served at /metrics; engine timing is taken here at the call
+# site so headless engines and replay verification carry no instrumentation
+TICK_SECONDS = registry.histogram('snake_tick_seconds', 'Duration of one session tick (engine update and display)')
+UPDATE_SECONDS = registry.histogram('snake_engine_update_seconds', 'Duration of the engine update within a session tick')
+INPUT_LATENCY_SECONDS = registry.histogram('snake_input_latency_seconds', 'Time from a direction key arriving to its frame being sent')
+registry.gauge('snake_sessions', 'Live game sessions by state',
+               lambda: {state: session_manager.counts()[state] for state in ('active', 'idle')}, label='state')
+registry.gauge('snake_sessions_max', 'Session limit', lambda: session_manager.max_sessions)
+registry.gauge('snake_bots', 'Server-side autopilot games', lambda: len(bot_pool))
+registry.gauge('snake_degradation_level', 'Render work shed under load (0 none, 3 most)', lambda: tick_governor.level)
+registry.gauge('snake_tick_utilization', 'Share of recent wall-clock time spent running ticks',
+               lambda: tick_governor.utilization)
+registry.gauge('snake_spectators', 'Connected spectators', lambda: spectator_hub.counts()['spectators'])
+registry.gauge('snake_verification_pending', 'Score submissions waiting for replay verification',
+               lambda: score_verifier.counts()['pending'])
+
+
+app.on_startup(tick_scheduler.start)
+app.on_startup(_sweep_idle_sessions)
+app.on_startup(score_verifier.start)
+app.on_startup(lambda: bot_pool.spawn(settings.bot_count))
+app.on_shutdown(bot_pool.stop_all)
+app.on_shutdown(session_manager.close_all)
+if session_snapshots:
+    app.on_startup(session_snapshots.load)
+    app.on_startup(_save_session_snapshots)
+    app.on_shutdown(session_snapshots.close)
+app.on_shutdown(tick_scheduler.stop)
+app.on_shutdown(score_verifier.stop)
+app.on_shutdown(lambda: get_score_store().close())
 
 
 @ui.page('/')
-async def index():
+async def index(client: Client):
     """Main game page"""
-    global snake_app
-    
     # Setup page
     ui.add_head_html('''
+        <script src="/static/snake_renderer.js"></script>
         <title>Snake Game - Professional Python Implementation</title>
         <meta name="description" content="Classic Snake game built with Python and NiceGUI">
         <style>
-            body { 
+            body {
                 background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
                 font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
             }
-            .nicegui-content { 
-                padding: 0; 
-                background: transparent; 
+            .nicegui-content {
+                padding: 0;
+                background: transparent;
             }
         </style>
     ''')
     
-    # Initialize the game
-    snake_app = SnakeGameApp()
+    # Initialize the game, resuming this browser's saved game if there is one;
+    # the snapshot is only taken once the session is admitted
+    snapshot_key = app.storage.browser['id'] if session_snapshots else None
+    try:
+        session_manager.create(
+            client.id,
+            lambda: SnakeGameApp(
+                on_activity=lambda: session_manager.touch(client.id),
+                snapshot_key=snapshot_key,
+                snapshot=session_snapshots.take(snapshot_key) if snapshot_key else None
+            )
+        )
+    except SessionLimitError:
+        with ui.column().classes('w-full items-center mt-12'):
+            ui.label('🐍 Server is full').classes('text-3xl font-bold text-white')
+            ui.label('Too many games in progress, please try again shortly.').classes('text-gray-300')
+        return
+    
+    # Tear down the session once the browser is gone for good
+    client.on_disconnect(lambda: session_manager.close(client.id))
 
 
-@ui.page('/health')
+@ui.page('/watch/{watch_id}')
+async def watch(client: Client, watch_id: str):
+    """Read-only spectator view of a running game"""
+    ui.add_head_html('''
+        <script src="/static/snake_renderer.js"></script>
+        <title>Snake Game - Spectating</title>
+        <style>
+            body {
+                background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
+                font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
+            }
+        </style>
+    ''')
+    
+    with ui.column().classes('w-full items-center mt-6'):
+        ui.label('👀 Spectating').classes('text-3xl font-bold text-white')
+        if watch_id not in spectator_hub:
+            ui.label('This game has ended or does not exist.').classes('text-gray-300')
+            return
+        
+        status = ui.label('').classes('text-gray-300')
+        board_pixel_size = spectator_hub.view_size * settings.cell_size
+        with ui.card().classes('p-4 bg-gray-900 border-2 border-gray-700'):
+            canvas = ui.element('canvas').props(
+                f'width={board_pixel_size} height={board_pixel_size}'
+            ).classes('border-2 border-gray-600 rounded-lg')
+    
+    # Every spectator of a game receives the same renderer calls
+    spectator_hub.subscribe(watch_id, client, client_renderer_init_call(canvas, SPECTATOR_BOARD),
+                            on_close=lambda: status.set_text('The game has ended.'))
+    client.on_disconnect(lambda: spectator_hub.unsubscribe(watch_id, client.id))
+
+
+@app.get('/health')
 async def health():
     """Health check endpoint"""
-    return {'status': 'healthy', 'game': 'snake', 'version': '1.0.0'}
+    return {
+        'status': 'healthy',
+        'game': 'snake',
+        'version': '1.0.0',
+        'sessions': session_manager.counts(),
+        'scheduler': tick_scheduler.snapshot(),
+        'governor': tick_governor.snapshot(),
+        'verification': score_verifier.counts(),
+        'spectators': spectator_hub.counts(),
+        'bots': bot_pool.counts(),
+        'input_latency': input_latency.snapshot()
+    }
+
+
+@app.get('/metrics')
+async def metrics():
+    """Prometheus metrics endpoint"""
+    return PlainTextResponse(registry.render(), media_type='text/plain; version=0.0.4')
 
 
 def main():
@@ -206,7 +494,8 @@ def main():
         favicon="🐍",
         dark=True,
         show=False,  # Don't auto-open browser
-        reload=settings.debug
+        reload=settings.debug,
+        storage_secret=settings.storage_secret or (session_snapshots.storage_secret() if session_snapshots else None)
     )
 
 
@@ -0,0 +1,69 @@
+"""
+Bot Players
+Server-side games played by the autopilot on the shared tick scheduler
+"""
+
+from typing import Dict, List
+from core.autopilot import Autopilot
+from core.game_engine import SnakeGameEngine, SPARSE_BOARD_THRESHOLD
+from core.score_store import NullScoreStore
+from app.services.tick_scheduler import TickScheduler
+
+
+class BotSession:
+    """One autopilot game with no UI, restarted whenever it ends"""
+    
+    __slots__ = ('engine', 'autopilot', 'games')
+    
+    def __init__(self, engine: SnakeGameEngine):
+        self.engine = engine
+        self.autopilot = Autopilot(engine)
+        self.games = 0
+    
+    def tick(self):
+        """Play one move, starting a new game after the last one ended"""
+        if self.engine.game_state.is_game_over:
+            self.engine.reset_game()
+            self.games += 1
+        self.autopilot.step()
+
+
+class BotPool:
+    """Bots ticked alongside player sessions, e.g. for load testing or a busy-looking server
+    
+    Bot scores stay off the leaderboard and their replays are not archived.
+    """
+    
+    def __init__(self, scheduler: TickScheduler, period: float, board_size: int = 20,
+                 sparse_threshold: int = SPARSE_BOARD_THRESHOLD):
+        self.scheduler = scheduler
+        self.period = period
+        self.board_size = board_size
+        self.sparse_threshold = sparse_threshold
+        self.bots: List[BotSession] = []
+        self._scores = NullScoreStore()
+    
+    def __len__(self) -> int:
+        return len(self.bots)
+    
+    def spawn(self, count: int):
+        """Start ``count`` more bots"""
+        for _ in range(count):
+            engine = SnakeGameEngine(score_store=self._scores, board_size=self.board_size,
+                                     replay_archive=None, sparse_threshold=self.sparse_threshold)
+            bot = BotSession(engine)
+            self.bots.append(bot)
+            self.scheduler.register(bot, self.period, bot.tick)
+    
+    def stop_all(self):
+        """Stop and forget every bot"""
+        for bot in self.bots:
+            self.scheduler.unregister(bot)
+        self.bots = []
+    
+    def counts(self) -> Dict[str, int]:
+        """Bot and finished game counts"""
+        return {
+            'bots': len(self.bots),
+            'games': sum(bot.games for bot in self.bots),
+        }
\ No newline at end of file
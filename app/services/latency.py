@@ -0,0 +1,47 @@
+"""
+Latency Statistics
+Rolling input-to-frame latency measurements
+"""
+
+from collections import deque
+from typing import Dict, Iterable
+
+
+def percentile(values: Iterable[float], fraction: float) -> float:
+    """Value below which ``fraction`` of ``values`` fall; 0 when there are none"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class LatencyStats:
+    """Latency samples over a rolling window of the most recent inputs"""
+    
+    __slots__ = ('samples', 'count', 'max_seconds')
+    
+    def __init__(self, window: int = 1024):
+        self.samples: deque = deque(maxlen=window)
+        self.count = 0
+        self.max_seconds = 0.0
+    
+    def record(self, seconds: float):
+        """Record one latency sample"""
+        self.samples.append(seconds)
+        self.count += 1
+        self.max_seconds = max(self.max_seconds, seconds)
+    
+    def percentile(self, fraction: float) -> float:
+        """Latency below which ``fraction`` of the recent samples fall"""
+        return percentile(self.samples, fraction)
+    
+    def snapshot(self) -> Dict[str, float]:
+        """Latency statistics for health and metrics endpoints"""
+        recent = len(self.samples)
+        return {
+            'inputs': self.count,
+            'avg_ms': round(sum(self.samples) / recent * 1000, 3) if recent else 0.0,
+            'p50_ms': round(self.percentile(0.5) * 1000, 3),
+            'p95_ms': round(self.percentile(0.95) * 1000, 3),
+            'max_ms': round(self.max_seconds * 1000, 3)
+        }
\ No newline at end of file
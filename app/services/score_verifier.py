@@ -0,0 +1,174 @@
+"""
+Score Verifier
+Verifies submitted scores by re-simulating their replays in a process pool
+"""
+
+import asyncio
+import hashlib
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+from core.replay import Replay, ReplayArchive, ReplayEngine, ReplayError
+from core.score_store import ScoreStore
+from core.game_engine import SPARSE_BOARD_THRESHOLD
+
+
+_replay_engine: Optional[ReplayEngine] = None
+
+
+def verify_replay(data: bytes, claimed_score: int, sparse_threshold: int = SPARSE_BOARD_THRESHOLD) -> bool:
+    """Process pool task: re-simulate a serialized replay and check its score"""
+    global _replay_engine
+    if _replay_engine is None or _replay_engine.sparse_threshold != sparse_threshold:
+        _replay_engine = ReplayEngine(sparse_threshold)
+    try:
+        replay = Replay.from_bytes(data)
+    except ReplayError:
+        return False
+    return _replay_engine.verify(replay, claimed_score)
+
+
+class DuplicateReplayError(Exception):
+    """Raised when a replay was already submitted"""
+
+
+class ScoreSubmission:
+    """A claimed score with the replay that should reproduce it"""
+    
+    __slots__ = ('player', 'score', 'replay', 'digest')
+    
+    def __init__(self, player: str, score: int, replay: Replay):
+        self.player = player
+        self.score = score
+        self.replay = replay
+        # Board size, seed and input log identify a game; also its archive id
+        self.digest = hashlib.sha256(replay.to_bytes()).hexdigest()[:32]
+
+
+class ScoreVerifier:
+    """Bounded verification pipeline in front of the score store
+    
+    Submissions wait in a bounded asyncio queue; ``concurrency`` consumer
+    tasks hand them to a process pool so re-simulation never runs on the
+    event loop. When the queue is full, submit() refuses new work instead of
+    letting a flood of submissions stall gameplay. Only scores whose replay
+    reproduces them are written to the store; with a ``replay_archive`` their
+    replay is archived too and the score row links to it.
+    
+    A replay can be scored once. Its digest is stored as the score's
+    game_id, unique in the shared database, so every worker process and
+    restart sees it: a digest already stored is skipped before
+    verification, and the insert of a verified score is refused if another
+    worker stored it meanwhile. In front of that, submit() refuses at once
+    a digest this process has queued or accepted, among the last
+    ``max_seen``. Rejected replays are forgotten so a corrected claim can
+    be resubmitted.
+    """
+    
+    def __init__(self, score_store: ScoreStore, workers: int = 1, queue_size: int = 100,
+                 sparse_threshold: int = SPARSE_BOARD_THRESHOLD,
+                 replay_archive: Optional[ReplayArchive] = None, max_seen: int = 100_000):
+        self.score_store = score_store
+        self.replay_archive = replay_archive
+        self.max_seen = max_seen
+        self._seen: 'OrderedDict[str, None]' = OrderedDict()
+        self.workers = workers
+        self.queue_size = queue_size
+        self.sparse_threshold = sparse_threshold
+        self._queue: Optional[asyncio.Queue] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tasks: List[asyncio.Task] = []
+        self.accepted = 0
+        self.rejected = 0
+        self.dropped = 0
+        self.duplicates = 0
+    
+    def start(self):
+        """Start the process pool and consumer tasks"""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        # Spawned workers do not inherit the server's threads or event loop
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+        self._tasks = [asyncio.create_task(self._consume()) for _ in range(self.workers)]
+    
+    async def stop(self):
+        """Stop consuming and shut the process pool down"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+    
+    def submit(self, submission: ScoreSubmission) -> bool:
+        """Queue a submission; False when the queue is full
+        
+        Raises DuplicateReplayError for a replay already queued or accepted.
+        """
+        if submission.digest in self._seen:
+            self.duplicates += 1
+            raise DuplicateReplayError(submission.digest)
+        if self._queue is None:
+            self.start()
+        try:
+            self._queue.put_nowait(submission)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        self._seen[submission.digest] = None
+        if len(self._seen) > self.max_seen:
+            self._seen.popitem(last=False)
+        return True
+    
+    async def _consume(self):
+        """Verify queued submissions one at a time"""
+        loop = asyncio.get_running_loop()
+        while True:
+            submission = await self._queue.get()
+            added = False
+            try:
+                # Scored by another worker, or before a restart
+                if await loop.run_in_executor(None, self.score_store.has_game, submission.digest):
+                    self.duplicates += 1
+                    continue
+                valid = await loop.run_in_executor(
+                    self._pool, verify_replay, submission.replay.to_bytes(), submission.score,
+                    self.sparse_threshold
+                )
+                if valid:
+                    added = await loop.run_in_executor(
+                        None, self.score_store.add_unique_score, submission.score, submission.player,
+                        submission.digest
+                    )
+            except Exception as e:
+                print(f"Error verifying score: {e}")
+                valid = False
+            finally:
+                self._queue.task_done()
+            
+            if not valid:
+                self.rejected += 1
+                self._seen.pop(submission.digest, None)
+            elif not added:
+                self.duplicates += 1
+            else:
+                self.accepted += 1
+                if self.replay_archive is not None:
+                    self.replay_archive.save(submission.digest, submission.replay)
+    
+    def counts(self) -> Dict[str, int]:
+        """Pipeline counters"""
+        return {
+            'pending': self._queue.qsize() if self._queue is not None else 0,
+            'queue_size': self.queue_size,
+            'accepted': self.accepted,
+            'rejected': self.rejected,
+            'dropped': self.dropped,
+            'duplicates': self.duplicates
+        }
\ No newline at end of file
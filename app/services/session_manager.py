@@ -0,0 +1,144 @@
+"""
+Session Manager
+Per-client game sessions with a size limit and LRU idle eviction
+"""
+
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, Optional, Protocol
+from core.metrics import registry
+
+
+EVICTED_SESSIONS = registry.counter('snake_sessions_evicted', 'Sessions evicted when idle too long or to make room')
+
+
+class GameSession(Protocol):
+    """Interface the session manager expects from a game session"""
+    last_active: float
+    
+    @property
+    def is_idle(self) -> bool:
+        """True when the session is paused, over, or otherwise not playing"""
+        ...
+    
+    def close(self):
+        """Stop timers and release the session's resources"""
+        ...
+
+
+class SessionLimitError(Exception):
+    """Raised when no session slot can be freed for a new client"""
+
+
+class SessionManager:
+    """Keeps one game session per client id with bounded memory and CPU
+    
+    Sessions are kept in least-recently-used order. When the limit is reached,
+    the least recently active idle (paused or finished) session is evicted;
+    sessions with no activity for ``idle_timeout`` seconds are evicted as well.
+    An optional ``admission`` check refuses new sessions below the limit,
+    e.g. when the process is out of tick capacity.
+    """
+    
+    def __init__(self, max_sessions: int, idle_timeout: float,
+                 admission: Optional[Callable[[], bool]] = None):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.admission = admission
+        self._sessions: 'OrderedDict[str, GameSession]' = OrderedDict()
+        self.evicted_count = 0
+    
+    def __len__(self) -> int:
+        return len(self._sessions)
+    
+    def __contains__(self, client_id: str) -> bool:
+        return client_id in self._sessions
+    
+    def __iter__(self) -> Iterator[GameSession]:
+        return iter(list(self._sessions.values()))
+    
+    def get(self, client_id: str) -> Optional[GameSession]:
+        """Get the session for a client, if any"""
+        return self._sessions.get(client_id)
+    
+    def create(self, client_id: str, factory: Callable[[], GameSession]) -> GameSession:
+        """Create and register a session for a client
+        
+        Raises SessionLimitError when the manager is full and no session
+        can be evicted, or when admission is refused. Nothing is closed or
+        evicted unless the new session is accepted.
+        """
+        if self.admission is not None and not self.admission():
+            raise SessionLimitError("server is at its measured tick capacity")
+        now = time.monotonic()
+        full = client_id not in self._sessions and len(self._sessions) >= self.max_sessions
+        if full and not self._can_evict(now):
+            raise SessionLimitError(f"session limit of {self.max_sessions} reached")
+        
+        self.close(client_id)
+        self.evict_idle(now)
+        if len(self._sessions) >= self.max_sessions:
+            self._evict_lru()
+        
+        session = factory()
+        session.last_active = time.monotonic()
+        self._sessions[client_id] = session
+        return session
+    
+    def touch(self, client_id: str):
+        """Record activity for a client, making it most recently used"""
+        session = self._sessions.get(client_id)
+        if session is not None:
+            session.last_active = time.monotonic()
+            self._sessions.move_to_end(client_id)
+    
+    def close(self, client_id: str):
+        """Close and forget a client's session"""
+        session = self._sessions.pop(client_id, None)
+        if session is not None:
+            session.close()
+    
+    def close_all(self):
+        """Close every session"""
+        for client_id in list(self._sessions):
+            self.close(client_id)
+    
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Evict sessions inactive for longer than the idle timeout"""
+        now = time.monotonic() if now is None else now
+        expired = []
+        for client_id, session in self._sessions.items():
+            if now - session.last_active < self.idle_timeout:
+                break  # LRU order: every later session is more recent
+            expired.append(client_id)
+        for client_id in expired:
+            self.close(client_id)
+        self.evicted_count += len(expired)
+        EVICTED_SESSIONS.inc(len(expired))
+        return len(expired)
+    
+    def _can_evict(self, now: float) -> bool:
+        """Whether evict_idle() or _evict_lru() would free a slot"""
+        return any(session.is_idle or now - session.last_active >= self.idle_timeout
+                   for session in self._sessions.values())
+    
+    def _evict_lru(self) -> bool:
+        """Evict the least recently used idle session"""
+        for client_id, session in self._sessions.items():
+            if session.is_idle:
+                self.close(client_id)
+                self.evicted_count += 1
+                EVICTED_SESSIONS.inc()
+                return True
+        return False
+    
+    def counts(self) -> Dict[str, int]:
+        """Live session counts"""
+        idle = sum(1 for session in self._sessions.values() if session.is_idle)
+        return {
+            'sessions': len(self._sessions),
+            'active': len(self._sessions) - idle,
+            'idle': idle,
+            'max_sessions': self.max_sessions,
+            'evicted': self.evicted_count
+        }
\ No newline at end of file
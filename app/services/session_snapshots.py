@@ -0,0 +1,165 @@
+"""
+Session Snapshots
+Saves in-progress games to SQLite in the background so players can resume them after a restart
+"""
+
+import queue
+import secrets
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from core.game_engine import SnakeGameEngine
+from core.metrics import registry
+from core.snapshot import snapshot_engine
+
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS sessions (
+    key TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    saved_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS settings (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+'''
+
+# Queue sentinel asking the writer thread to exit
+_STOP = object()
+
+# One write: (key, snapshot bytes or None to delete, time saved)
+Write = Tuple[str, Optional[bytes], float]
+
+SAVE_ROUND_SECONDS = registry.histogram('snake_snapshot_round_seconds', 'Event-loop time to encode one round of changed sessions')
+SAVED_SESSIONS = registry.counter('snake_snapshots_written', 'Session snapshots written or deleted')
+RESUMED_SESSIONS = registry.counter('snake_snapshots_resumed', 'Sessions resumed from a snapshot')
+
+
+class SessionSnapshotStore:
+    """Snapshots of in-progress games keyed by browser id
+    
+    save_changed() is called periodically with the live sessions and encodes
+    only the games that moved since their last save; a writer thread upserts
+    each round in one transaction, so the event loop never waits on disk.
+    Finished games are deleted instead. On boot, load() reads every snapshot
+    younger than ``max_age`` in one query, and take() hands a snapshot to the
+    browser that reconnects. A session's change marker is dropped when it
+    starts (take) and when it closes (save), so markers do not outlive it.
+    """
+    
+    def __init__(self, db_path: str, max_age: float = 86400.0):
+        self.db_path = db_path
+        self.max_age = max_age
+        self._saved: Dict[str, Tuple[str, int]] = {}  # key -> (game id, ticks) last queued
+        self._restored: Dict[str, bytes] = {}
+        self._queue: 'queue.Queue' = queue.Queue()
+        self._connection = self._connect()
+        self._connection.executescript(_SCHEMA)
+        self._writer = threading.Thread(target=self._write_loop, name='snapshot-writer', daemon=True)
+        self._writer.start()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection in WAL mode"""
+        connection = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+    
+    def storage_secret(self) -> str:
+        """Secret signing the browser id cookie, created once and kept with the snapshots
+        
+        Browser ids have to survive restarts for their snapshots to be found again.
+        """
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO settings (name, value) VALUES ('storage_secret', ?)",
+                (secrets.token_urlsafe(32),)
+            )
+        return self._connection.execute("SELECT value FROM settings WHERE name = 'storage_secret'").fetchone()[0]
+    
+    def load(self) -> int:
+        """Drop expired snapshots and read the rest into memory; returns how many remain"""
+        with self._connection:
+            self._connection.execute('DELETE FROM sessions WHERE saved_at < ?', (time.time() - self.max_age,))
+        rows = self._connection.execute('SELECT key, data FROM sessions').fetchall()
+        self._restored = dict(rows)
+        return len(self._restored)
+    
+    def take(self, key: str) -> Optional[bytes]:
+        """The snapshot loaded at boot for a browser, handed out once"""
+        self._saved.pop(key, None)  # a new session starts tracking afresh
+        data = self._restored.pop(key, None)
+        if data is not None:
+            RESUMED_SESSIONS.inc()
+        return data
+    
+    def save(self, key: str, engine: SnakeGameEngine):
+        """Queue a closing session's snapshot if it changed, and stop tracking it"""
+        self._queue_writes([self._encode(key, engine, time.time())])
+        self._saved.pop(key, None)
+    
+    def save_changed(self, sessions: Iterable[Tuple[str, SnakeGameEngine]]) -> int:
+        """Queue snapshots of the sessions that changed since their last save
+        
+        Returns the number of sessions queued.
+        """
+        started = time.perf_counter()
+        now = time.time()
+        writes = [self._encode(key, engine, now) for key, engine in sessions]
+        count = self._queue_writes(writes)
+        SAVE_ROUND_SECONDS.observe(time.perf_counter() - started)
+        return count
+    
+    def _encode(self, key: str, engine: SnakeGameEngine, now: float) -> Optional[Write]:
+        """Snapshot write for a changed session, a delete for a finished one, else None"""
+        marker = (engine.game_id, len(engine.replay))
+        if self._saved.get(key) == marker:
+            return None
+        self._saved[key] = marker
+        if engine.game_state.is_game_over:
+            return key, None, now
+        return key, snapshot_engine(engine), now
+    
+    def _queue_writes(self, writes: List[Optional[Write]]) -> int:
+        writes = [write for write in writes if write is not None]
+        if writes:
+            self._queue.put(writes)
+        return len(writes)
+    
+    def _write_loop(self):
+        """Writer thread: apply each queued round in one transaction"""
+        connection = self._connect()
+        while True:
+            writes = self._queue.get()
+            if writes is _STOP:
+                self._queue.task_done()
+                break
+            try:
+                with connection:
+                    connection.executemany(
+                        'INSERT OR REPLACE INTO sessions (key, data, saved_at) VALUES (?, ?, ?)',
+                        [write for write in writes if write[1] is not None]
+                    )
+                    connection.executemany(
+                        'DELETE FROM sessions WHERE key = ?',
+                        [(key,) for key, data, _ in writes if data is None]
+                    )
+                SAVED_SESSIONS.inc(len(writes))
+            except sqlite3.Error as e:
+                print(f"Error saving session snapshots: {e}")
+            finally:
+                self._queue.task_done()
+        connection.close()
+    
+    def flush(self):
+        """Block until every queued snapshot has been written"""
+        self._queue.join()
+    
+    def close(self):
+        """Write pending snapshots and stop the writer thread"""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        self._connection.close()
\ No newline at end of file
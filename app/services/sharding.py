@@ -0,0 +1,301 @@
+"""
+Game Sharding
+Runs several game worker processes behind a sticky TCP router
+"""
+
+import asyncio
+import bisect
+import hashlib
+import json
+import os
+import signal
+import subprocess
+import sys
+import uuid
+from http.cookies import SimpleCookie
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from core.metrics import merge_metrics
+
+
+# Cookie that pins a browser to one worker
+SHARD_COOKIE = 'snake_shard'
+
+# Paths under /_shard/<worker>/ reach that worker with the prefix removed
+SHARD_PREFIX = '/_shard/'
+
+# Largest request/response head the router will parse
+MAX_HEAD_BYTES = 64 * 1024
+
+# Entry point started for each worker
+ENTRY_POINT = Path(__file__).resolve().parents[2] / 'main.py'
+
+
+class HashRing:
+    """Consistent hash ring mapping keys to nodes
+    
+    Each node is placed at ``replicas`` points on the ring, so adding or
+    removing a node only remaps about 1/N of the keys.
+    """
+    
+    def __init__(self, nodes: List[str], replicas: int = 100):
+        self._points: List[int] = []
+        self._nodes: Dict[int, str] = {}
+        for node in nodes:
+            for replica in range(replicas):
+                point = self._hash(f'{node}#{replica}')
+                self._nodes[point] = node
+                bisect.insort(self._points, point)
+    
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], 'big')
+    
+    def get(self, key: str) -> str:
+        """Node responsible for a key"""
+        index = bisect.bisect(self._points, self._hash(key)) % len(self._points)
+        return self._nodes[self._points[index]]
+
+
+class Worker:
+    """A game server subprocess listening on a private port"""
+    
+    def __init__(self, name: str, host: str, port: int):
+        self.name = name
+        self.host = host
+        self.port = port
+        self.process: Optional[subprocess.Popen] = None
+    
+    def start(self):
+        """Start (or restart) the worker process"""
+        env = dict(os.environ, HOST=self.host, PORT=str(self.port), WORKERS='1', DEBUG='false',
+                   WORKER_NAME=self.name)
+        self.process = subprocess.Popen([sys.executable, str(ENTRY_POINT)], env=env, cwd=ENTRY_POINT.parent)
+    
+    @property
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+    
+    def stop(self):
+        """Terminate the worker process"""
+        if self.is_alive:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+class ShardRouter:
+    """Routes every client to a fixed worker by consistent hash of its session id
+    
+    The router works at the TCP level: it parses only the first request head
+    of a connection to find the session cookie (issuing a new one when it is
+    missing) and then splices bytes both ways, so page loads, static files
+    and the websocket of one browser all reach the same worker. GET /health
+    is answered by the router with the health of every worker combined, and
+    GET /metrics with every worker's metrics labelled by worker name.
+    
+    A game lives in one worker, so /watch/<worker>.<token> goes to the
+    worker named in the watch id whatever the viewer's cookie says. That
+    request carries an X-Forwarded-Prefix of /_shard/<worker>, which makes
+    the page load its scripts and open its websocket under that prefix, and
+    requests under it are routed to the worker with the prefix removed.
+    """
+    
+    def __init__(self, workers: List[Worker]):
+        self.workers = {worker.name: worker for worker in workers}
+        self.ring = HashRing(list(self.workers))
+    
+    async def serve(self, host: str, port: int):
+        """Accept client connections until cancelled"""
+        server = await asyncio.start_server(self._handle_client, host, port, limit=MAX_HEAD_BYTES)
+        async with server:
+            await asyncio.gather(server.serve_forever(), self._supervise())
+    
+    async def _supervise(self):
+        """Restart workers that exited"""
+        while True:
+            await asyncio.sleep(5)
+            for worker in self.workers.values():
+                if not worker.is_alive:
+                    print(f"Worker {worker.name} exited, restarting")
+                    worker.start()
+    
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Route one client connection"""
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        
+        method, path, headers = _parse_request_head(head)
+        if method == 'GET' and path.split('?', 1)[0] == '/health':
+            await self._respond_health(writer)
+            return
+        if method == 'GET' and path.split('?', 1)[0] == '/metrics':
+            await self._respond_metrics(writer)
+            return
+        
+        owner, path = self._pinned_route(path)
+        new_session = False
+        if owner is not None:
+            worker = self.workers[owner]
+            head = _rewrite_request_head(head, path, SHARD_PREFIX + owner)
+        else:
+            session_id = SimpleCookie(headers.get('cookie', '')).get(SHARD_COOKIE)
+            new_session = session_id is None
+            session_id = uuid.uuid4().hex if new_session else session_id.value
+            worker = self.workers[self.ring.get(session_id)]
+        
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(
+                worker.host, worker.port, limit=MAX_HEAD_BYTES
+            )
+        except OSError:
+            writer.write(b'HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+            await writer.drain()
+            writer.close()
+            return
+        
+        upstream_writer.write(head)
+        cookie = None
+        if new_session:
+            cookie = f'Set-Cookie: {SHARD_COOKIE}={session_id}; Path=/; HttpOnly; SameSite=Lax\r\n'.encode()
+        await asyncio.gather(
+            _pipe(reader, upstream_writer),
+            _pipe(upstream_reader, writer, inject_header=cookie),
+            return_exceptions=True
+        )
+    
+    def _pinned_route(self, path: str) -> Tuple[Optional[str], str]:
+        """Worker a request must reach regardless of its cookie, and the path to send it
+        
+        None for requests routed by session cookie.
+        """
+        if path.startswith('/watch/'):
+            owner, sep, _ = path[len('/watch/'):].partition('.')
+            if sep and owner in self.workers:
+                return owner, path
+        elif path.startswith(SHARD_PREFIX):
+            owner, _, rest = path[len(SHARD_PREFIX):].partition('/')
+            if owner in self.workers:
+                return owner, '/' + rest
+        return None, path
+    
+    async def _respond_health(self, writer: asyncio.StreamWriter):
+        """Answer /health with the combined health of all workers"""
+        results = await asyncio.gather(*(self._worker_health(worker) for worker in self.workers.values()))
+        workers = dict(zip(self.workers, results))
+        sessions: Dict[str, int] = {}
+        for health in workers.values():
+            for key, value in health.get('sessions', {}).items():
+                sessions[key] = sessions.get(key, 0) + value
+        healthy = all(health.get('status') == 'healthy' for health in workers.values())
+        body = json.dumps({
+            'status': 'healthy' if healthy else 'degraded',
+            'game': 'snake',
+            'workers': workers,
+            'sessions': sessions
+        }).encode()
+        status = b'200 OK' if healthy else b'503 Service Unavailable'
+        writer.write(b'HTTP/1.1 ' + status + b'\r\nContent-Type: application/json\r\n' +
+                     f'Content-Length: {len(body)}\r\nConnection: close\r\n\r\n'.encode() + body)
+        await writer.drain()
+        writer.close()
+    
+    async def _respond_metrics(self, writer: asyncio.StreamWriter):
+        """Answer /metrics with the metrics of all reachable workers"""
+        results = await asyncio.gather(*(self._worker_metrics(worker) for worker in self.workers.values()))
+        texts = {name: text for name, text in zip(self.workers, results) if text is not None}
+        body = merge_metrics(texts).encode()
+        writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: text/plain; version=0.0.4\r\n' +
+                     f'Content-Length: {len(body)}\r\nConnection: close\r\n\r\n'.encode() + body)
+        await writer.drain()
+        writer.close()
+    
+    @staticmethod
+    async def _worker_get(worker: Worker, path: str) -> bytes:
+        """Fetch the body of one GET request to a worker"""
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(worker.host, worker.port), 2)
+        writer.write(f'GET {path} HTTP/1.1\r\nHost: {worker.host}\r\nConnection: close\r\n\r\n'.encode())
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        return response.split(b'\r\n\r\n', 1)[1]
+    
+    async def _worker_health(self, worker: Worker) -> dict:
+        """Fetch one worker's /health"""
+        try:
+            return json.loads(await self._worker_get(worker, '/health'))
+        except (OSError, asyncio.TimeoutError, ValueError, IndexError) as e:
+            return {'status': 'unreachable', 'error': str(e)}
+    
+    async def _worker_metrics(self, worker: Worker) -> Optional[str]:
+        """Fetch one worker's /metrics; None when it is unreachable"""
+        try:
+            return (await self._worker_get(worker, '/metrics')).decode()
+        except (OSError, asyncio.TimeoutError, UnicodeDecodeError, IndexError):
+            return None
+
+
+def _parse_request_head(head: bytes) -> Tuple[str, str, Dict[str, str]]:
+    """Parse method, path and lower-cased headers from a request head"""
+    lines = head.decode('latin-1').split('\r\n')
+    parts = lines[0].split(' ')
+    method, path = (parts[0], parts[1]) if len(parts) >= 2 else ('', '')
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(':')
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return method, path, headers
+
+
+def _rewrite_request_head(head: bytes, path: str, prefix: str) -> bytes:
+    """Replace the path of a request head and set its X-Forwarded-Prefix header"""
+    lines = head[:-4].split(b'\r\n')
+    parts = lines[0].split(b' ')
+    parts[1] = path.encode('latin-1')
+    # Drop a prefix sent by the client; the first header would win
+    lines = [b' '.join(parts)] + [line for line in lines[1:]
+                                  if line.partition(b':')[0].strip().lower() != b'x-forwarded-prefix']
+    lines.append(b'X-Forwarded-Prefix: ' + prefix.encode('latin-1'))
+    return b'\r\n'.join(lines) + b'\r\n\r\n'
+
+
+async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                inject_header: Optional[bytes] = None):
+    """Copy bytes until EOF, optionally adding a header to the first response head"""
+    try:
+        if inject_header is not None:
+            head = await reader.readuntil(b'\r\n\r\n')
+            writer.write(head[:-2] + inject_header + b'\r\n')
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+def run_sharded(host: str, port: int, workers: int, base_port: int):
+    """Start ``workers`` game processes and route clients to them"""
+    pool = [Worker(f'worker-{i}', '127.0.0.1', base_port + i) for i in range(workers)]
+    for worker in pool:
+        worker.start()
+    
+    def stop(*_):
+        raise KeyboardInterrupt
+    signal.signal(signal.SIGTERM, stop)
+    
+    router = ShardRouter(pool)
+    try:
+        asyncio.run(router.serve(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for worker in pool:
+            worker.stop()
\ No newline at end of file
@@ -0,0 +1,215 @@
+"""
+Spectator Hub
+Broadcasts each game's frames to any number of watching clients
+"""
+
+import json
+from typing import Callable, Dict, Hashable, List, Optional
+from nicegui import Client, background_tasks, core
+from core.frames import FrameTracker, Viewport, encode_delta, encode_keyframe
+from models.game_state import GameState
+
+
+# Renderer board name used on every spectator page
+SPECTATOR_BOARD = 'spectator'
+
+# NiceGUI's socket.io namespace
+NAMESPACE = '/'
+
+
+class Spectator:
+    """One watching client and its delivery state"""
+    
+    __slots__ = ('client', 'init_call', 'sid', 'needs_keyframe', 'frames_sent', 'frames_skipped', 'on_close')
+    
+    def __init__(self, client: Client, init_call: str, on_close: Optional[Callable[[], None]] = None):
+        self.client = client
+        self.init_call = init_call
+        self.sid: Optional[str] = None  # socket.io session, once the browser connects
+        self.needs_keyframe = True
+        self.frames_sent = 0
+        self.frames_skipped = 0
+        self.on_close = on_close
+
+
+class SpectatorChannel:
+    """A watched game: its state, frame tracking, spectators and socket.io room"""
+    
+    __slots__ = ('state', 'tracker', 'viewport', 'spectators', 'room', '_keyframe')
+    
+    def __init__(self, state: GameState, view_size: int, room: str):
+        self.state = state
+        self.tracker = FrameTracker()
+        self.viewport = Viewport(view_size)
+        self.spectators: Dict[str, Spectator] = {}
+        self.room = room
+        self._keyframe: Optional[str] = None
+    
+    def invalidate(self):
+        """Drop the cached keyframe after the state changed"""
+        self._keyframe = None
+    
+    def keyframe(self) -> str:
+        """Renderer call drawing the whole board, encoded at most once per frame"""
+        if self._keyframe is None:
+            self._keyframe = _renderer_call(encode_keyframe(self.state, self.viewport.bounds))
+        return self._keyframe
+
+
+def _renderer_call(frame) -> str:
+    """JavaScript applying one frame on a spectator page"""
+    return f"SnakeRenderer.frame('{SPECTATOR_BOARD}',{json.dumps(frame, separators=(',', ':'))})"
+
+
+def _emit(call: str, **target):
+    """Send one renderer call through socket.io; encoded once for a whole room"""
+    background_tasks.create(core.sio.emit('run_javascript', {'code': call}, namespace=NAMESPACE, **target),
+                            name='spectator frame')
+
+
+def _socket_backlog(sid: str) -> int:
+    """Packets waiting in a session's engine.io send queue"""
+    socket = core.sio.eio.sockets.get(core.sio.manager.eio_sid_from_sid(sid, NAMESPACE))
+    return socket.queue.qsize() if socket is not None else 0
+
+
+class SpectatorHub:
+    """Fans game frames out to spectators, encoding and emitting each frame once
+    
+    A game publishes after every tick; the hub diffs the state once per
+    channel, encodes one renderer call and emits it once to the channel's
+    socket.io room, which serializes the packet once for all its members.
+    Per-tick work grows with the number of watched games, not viewers, and
+    games nobody watches cost a dict lookup.
+    
+    A spectator joins the room when its browser connects, after being sent
+    the renderer setup and the current keyframe directly. One whose
+    engine.io send queue, where packets wait on a slow connection, holds
+    ``max_backlog`` packets is left out of room emits instead of buffering
+    more, then resyncs from the channel's cached keyframe once it catches up.
+    """
+    
+    def __init__(self, view_size: int, max_backlog: int = 2):
+        self.view_size = view_size
+        self.max_backlog = max_backlog
+        self._channels: Dict[Hashable, SpectatorChannel] = {}
+        self.frames_encoded = 0
+        self.frames_sent = 0
+        self.frames_skipped = 0
+    
+    def __contains__(self, channel_id: Hashable) -> bool:
+        return channel_id in self._channels
+    
+    def open(self, channel_id: Hashable, state: GameState):
+        """Make a game available for watching"""
+        self._channels[channel_id] = SpectatorChannel(state, self.view_size, f'spectate-{channel_id}')
+    
+    def close(self, channel_id: Hashable):
+        """Stop broadcasting a game and notify its spectators"""
+        channel = self._channels.pop(channel_id, None)
+        if channel is None:
+            return
+        for spectator in channel.spectators.values():
+            if spectator.on_close:
+                spectator.on_close()
+        core.sio.manager.basic_close_room(channel.room, NAMESPACE)
+    
+    def subscribe(self, channel_id: Hashable, client: Client, init_call: str,
+                  on_close: Optional[Callable[[], None]] = None) -> bool:
+        """Start sending a game's frames to a client; False if there is no such game
+        
+        ``init_call`` sets up the page's renderer. It is sent with the first
+        keyframe, ahead of any room frame, each time the browser connects.
+        """
+        channel = self._channels.get(channel_id)
+        if channel is None:
+            return False
+        if not channel.spectators:
+            # Frames were not tracked while nobody watched
+            channel.tracker.invalidate()
+            channel.viewport.follow(channel.state)
+            channel.invalidate()
+        spectator = Spectator(client, init_call, on_close)
+        channel.spectators[client.id] = spectator
+        client.on_connect(lambda: self._join(channel_id, client.id))
+        if client.has_socket_connection:
+            self._join(channel_id, client.id)
+        return True
+    
+    def _join(self, channel_id: Hashable, client_id: str):
+        """Sync a newly connected spectator and add its socket to the channel's room"""
+        channel = self._channels.get(channel_id)
+        spectator = channel.spectators.get(client_id) if channel is not None else None
+        if spectator is None:
+            return
+        # NiceGUI puts each socket in a room named after its client; the newest is the live one
+        sids = [sid for sid, _ in core.sio.manager.get_participants(NAMESPACE, client_id)]
+        if not sids:
+            return
+        spectator.sid = sids[-1]
+        spectator.needs_keyframe = False
+        spectator.frames_sent += 1
+        self.frames_sent += 1
+        # Both calls are queued on the socket before it can receive room frames
+        _emit(f'{spectator.init_call};{channel.keyframe()}', to=spectator.sid)
+        core.sio.manager.basic_enter_room(spectator.sid, NAMESPACE, channel.room)
+    
+    def unsubscribe(self, channel_id: Hashable, client_id: str):
+        """Stop sending a game's frames to a client"""
+        channel = self._channels.get(channel_id)
+        if channel is None:
+            return
+        spectator = channel.spectators.pop(client_id, None)
+        if spectator is not None and spectator.sid:
+            core.sio.manager.basic_leave_room(spectator.sid, NAMESPACE, channel.room)
+    
+    def publish(self, channel_id: Hashable):
+        """Broadcast the current state of a game to its spectators"""
+        channel = self._channels.get(channel_id)
+        if channel is None or not channel.spectators:
+            return
+        
+        moved = channel.viewport.follow(channel.state)
+        delta = channel.tracker.diff(channel.state)
+        if delta is None and not moved:
+            return
+        
+        channel.invalidate()
+        self.frames_encoded += 1
+        if moved or delta.full:
+            call, keyframe = channel.keyframe(), True
+        else:
+            call, keyframe = _renderer_call(encode_delta(delta)), False
+        
+        skipped: List[str] = []
+        resyncing: List[str] = []
+        for spectator in channel.spectators.values():
+            if spectator.sid is None:
+                continue  # not connected yet, so not in the room
+            if _socket_backlog(spectator.sid) >= self.max_backlog:
+                # Deltas only apply on top of the previous frame
+                spectator.needs_keyframe = True
+                spectator.frames_skipped += 1
+                self.frames_skipped += 1
+                skipped.append(spectator.sid)
+                continue
+            if spectator.needs_keyframe and not keyframe:
+                resyncing.append(spectator.sid)
+            spectator.needs_keyframe = False
+            spectator.frames_sent += 1
+            self.frames_sent += 1
+        
+        _emit(call, room=channel.room, skip_sid=skipped + resyncing)
+        for sid in resyncing:
+            _emit(channel.keyframe(), to=sid)
+    
+    def counts(self) -> Dict[str, int]:
+        """Channel, spectator and frame counts for monitoring"""
+        return {
+            'channels': len(self._channels),
+            'watched': sum(1 for channel in self._channels.values() if channel.spectators),
+            'spectators': sum(len(channel.spectators) for channel in self._channels.values()),
+            'frames_encoded': self.frames_encoded,
+            'frames_sent': self.frames_sent,
+            'frames_skipped': self.frames_skipped,
+        }
\ No newline at end of file
@@ -0,0 +1,133 @@
+"""
+Tick Governor
+Sheds render work under overload so game ticks stay on time, and gates new sessions on measured capacity
+"""
+
+import time
+from typing import Dict, Optional
+from core.metrics import registry
+from app.services.tick_scheduler import TickScheduler
+
+
+# Degradation levels, each adding to the ones before it
+NORMAL = 0
+SKIP_FRAMES = 1        # draw the canvas every ``frame_interval`` ticks
+DROP_HIGH_SCORES = 2   # stop refreshing the high score table
+COALESCE_LABELS = 3    # update score labels every ``label_interval`` ticks
+MAX_LEVEL = COALESCE_LABELS
+
+LEVEL_NAMES = ('normal', 'skip_frames', 'drop_high_scores', 'coalesce_labels')
+
+ESCALATIONS = registry.counter('snake_degradation_escalations', 'Times render work was cut back a level under load')
+RECOVERIES = registry.counter('snake_degradation_recoveries', 'Times render work was restored a level after load dropped')
+REFUSED_SESSIONS = registry.counter('snake_sessions_refused', 'New sessions refused at the measured tick capacity')
+
+
+class TickGovernor:
+    """Adapts per-session render work to how much of each tick period the scheduler uses
+    
+    Every scheduler batch reports its duration and lateness. Utilization is
+    the scheduler's busy time as a fraction of wall-clock time over its
+    last one to two seconds, so every tick counts the same whichever batch
+    it ran in; the process counts as overloaded when it passes
+    ``high_water`` or batches start more than half a period late. While overloaded the governor steps
+    up one level at most every ``escalate_after`` seconds, and steps back
+    down one level per ``relax_after`` seconds once utilization is below
+    ``low_water``. Game logic always ticks; only drawing is skipped, so games
+    keep their speed and frames simply arrive less often.
+    
+    New sessions are admitted while the scheduled sessions stay under the
+    per-core capacity measured from the average tick cost, scaled by
+    ``admission_utilization``, and refused when the governor is at its last
+    level and still overloaded.
+    """
+    
+    # Weight of the newest batch in the smoothed lateness
+    SMOOTHING = 0.2
+    
+    def __init__(self, scheduler: TickScheduler, period: float, high_water: float = 0.6,
+                 low_water: float = 0.3, admission_utilization: float = 0.8,
+                 escalate_after: float = 1.0, relax_after: float = 5.0,
+                 frame_interval: int = 2, label_interval: int = 4):
+        self.scheduler = scheduler
+        self.period = period
+        self.high_water = high_water
+        self.low_water = low_water
+        self.admission_utilization = admission_utilization
+        self.escalate_after = escalate_after
+        self.relax_after = relax_after
+        self.frame_interval = frame_interval
+        self.label_interval = label_interval
+        self.level = NORMAL
+        self.utilization = 0.0
+        self.lateness = 0.0
+        self.overloaded = False
+        self.refused = 0
+        self._changed_at = time.monotonic()
+        self._calm_since: Optional[float] = None  # below the low-water mark since
+        scheduler.batch_listeners.append(self.record_batch)
+    
+    def record_batch(self, size: int, duration: float, lateness: float):
+        """Scheduler listener: update utilization and move between levels"""
+        self.utilization = self.scheduler.stats.utilization
+        self.lateness += self.SMOOTHING * (lateness - self.lateness)
+        self.overloaded = self.utilization > self.high_water or self.lateness > self.period / 2
+        
+        now = time.monotonic()
+        if self.overloaded:
+            self._calm_since = None
+            if self.level < MAX_LEVEL and now - self._changed_at >= self.escalate_after:
+                self._change_level(self.level + 1, now)
+                ESCALATIONS.inc()
+        elif self.utilization < self.low_water and self.lateness < self.period / 4:
+            if self._calm_since is None:
+                self._calm_since = now
+            if self.level > NORMAL and now - max(self._calm_since, self._changed_at) >= self.relax_after:
+                self._change_level(self.level - 1, now)
+                RECOVERIES.inc()
+        else:
+            self._calm_since = None
+    
+    def _change_level(self, level: int, now: float):
+        """Move to a level and restart the timers"""
+        self.level = level
+        self._changed_at = now
+    
+    def render_frame(self, tick: int) -> bool:
+        """Whether a session should draw the canvas on its ``tick``-th tick"""
+        return self.level < SKIP_FRAMES or tick % self.frame_interval == 0
+    
+    def refresh_high_scores(self) -> bool:
+        """Whether high score tables should be refreshed at all"""
+        return self.level < DROP_HIGH_SCORES
+    
+    def update_labels(self, tick: int) -> bool:
+        """Whether a session should update its score labels on its ``tick``-th tick"""
+        return self.level < COALESCE_LABELS or tick % self.label_interval == 0
+    
+    def capacity(self) -> float:
+        """Sessions one core can tick at the measured average tick cost, within the admission target"""
+        return self.scheduler.sessions_per_core(self.period) * self.admission_utilization
+    
+    def admits(self) -> bool:
+        """Whether a new session can start; counts refusals"""
+        if not self.admission_utilization:
+            return True
+        if len(self.scheduler) < self.capacity() and not (self.level == MAX_LEVEL and self.overloaded):
+            return True
+        self.refused += 1
+        REFUSED_SESSIONS.inc()
+        return False
+    
+    def snapshot(self) -> Dict[str, object]:
+        """Governor state for health and metrics endpoints"""
+        capacity = self.capacity()
+        return {
+            'level': self.level,
+            'mode': LEVEL_NAMES[self.level],
+            'utilization': round(self.utilization, 3),
+            'lateness_ms': round(self.lateness * 1000, 3),
+            'overloaded': self.overloaded,
+            'capacity': round(capacity) if self.admission_utilization and capacity != float('inf') else None,
+            'refused': self.refused
+        }
\ No newline at end of file
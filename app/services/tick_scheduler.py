@@ -0,0 +1,245 @@
+"""
+Tick Scheduler
+A single asyncio task that advances every active game session
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Callable, Dict, Hashable, List, Optional
+from core.metrics import registry
+
+
+BATCH_SECONDS = registry.histogram('snake_scheduler_batch_seconds', 'Time to run one batch of due session ticks')
+LATENESS_SECONDS = registry.histogram('snake_tick_lateness_seconds', 'How late a tick batch started versus its scheduled time')
+MISSED_TICKS = registry.counter('snake_ticks_missed', 'Session ticks skipped because the session fell a whole period behind')
+
+
+class _Entry:
+    """A registered session callback and its place on the tick grid"""
+    
+    __slots__ = ('key', 'period', 'callback', 'next_due', 'active')
+    
+    def __init__(self, key: Hashable, period: float, callback: Callable[[], None], next_due: float):
+        self.key = key
+        self.period = period
+        self.callback = callback
+        self.next_due = next_due
+        self.active = True
+
+
+class TickStats:
+    """Timing statistics for scheduler batches
+    
+    ``avg_tick_seconds`` and ``utilization`` are totals over the last one to
+    two ``WINDOW`` seconds of wall-clock time (busy time over ticks, and
+    busy time over elapsed time), not averages of per-batch figures, so a
+    small batch of sessions on another period weighs only as much as the
+    ticks it runs.
+    """
+    
+    __slots__ = ('batches', 'ticks', 'missed_ticks', 'last_batch_seconds',
+                 'avg_batch_seconds', 'max_batch_seconds', 'avg_tick_seconds', 'utilization',
+                 'last_lateness_seconds', 'max_lateness_seconds',
+                 '_window_start', '_window_busy', '_window_ticks',
+                 '_previous_start', '_previous_busy', '_previous_ticks')
+    
+    # Weight of the newest batch in the average batch duration
+    SMOOTHING = 0.05
+    
+    # Seconds of wall-clock time each accounting window covers
+    WINDOW = 1.0
+    
+    def __init__(self):
+        self.batches = 0
+        self.ticks = 0
+        self.missed_ticks = 0
+        self.last_batch_seconds = 0.0
+        self.avg_batch_seconds = 0.0
+        self.max_batch_seconds = 0.0
+        self.avg_tick_seconds = 0.0
+        self.utilization = 0.0
+        self.last_lateness_seconds = 0.0
+        self.max_lateness_seconds = 0.0
+        self._window_start = self._previous_start = time.monotonic()
+        self._window_busy = self._previous_busy = 0.0
+        self._window_ticks = self._previous_ticks = 0
+    
+    def record_batch(self, size: int, duration: float, lateness: float, now: Optional[float] = None):
+        """Record one batch of ``size`` ticks that took ``duration`` seconds, ending at ``now``"""
+        now = time.monotonic() if now is None else now
+        alpha = self.SMOOTHING if self.batches else 1.0
+        self.batches += 1
+        self.ticks += size
+        self.last_batch_seconds = duration
+        self.avg_batch_seconds += alpha * (duration - self.avg_batch_seconds)
+        self.max_batch_seconds = max(self.max_batch_seconds, duration)
+        self.last_lateness_seconds = lateness
+        self.max_lateness_seconds = max(self.max_lateness_seconds, lateness)
+        
+        # Start a new window once the current one is full; after an idle gap
+        # the finished window no longer describes the present and is dropped
+        if now - self._window_start >= self.WINDOW:
+            if now - self._window_start < 2 * self.WINDOW:
+                self._previous_start = self._window_start
+                self._previous_busy, self._previous_ticks = self._window_busy, self._window_ticks
+            else:
+                self._previous_start = now - self.WINDOW
+                self._previous_busy, self._previous_ticks = 0.0, 0
+            self._window_start = now
+            self._window_busy, self._window_ticks = 0.0, 0
+        self._window_busy += duration
+        self._window_ticks += size
+        
+        busy = self._previous_busy + self._window_busy
+        self.avg_tick_seconds = busy / (self._previous_ticks + self._window_ticks)
+        self.utilization = busy / max(now - self._previous_start, self.WINDOW)
+
+
+class TickScheduler:
+    """Drives many sessions from one task on a fixed-timestep clock
+    
+    Every session ticks on an absolute grid (epoch + k * period) shared by
+    all sessions with the same period, so they run together in one batch and
+    wakeup delays do not accumulate into drift. A session that falls more
+    than a whole period behind skips the missed slots instead of bursting.
+    Paused or finished sessions are simply unregistered and cost nothing.
+    """
+    
+    def __init__(self):
+        self._epoch = time.monotonic()
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._heap: List[tuple] = []
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.stats = TickStats()
+        self.batch_listeners: List[Callable[[int, float, float], None]] = []  # (size, duration, lateness)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+    
+    def register(self, key: Hashable, period: float, callback: Callable[[], None]):
+        """Tick ``callback`` every ``period`` seconds until unregistered"""
+        self.unregister(key)
+        now = time.monotonic()
+        slots = int((now - self._epoch) // period) + 1
+        entry = _Entry(key, period, callback, self._epoch + slots * period)
+        self._entries[key] = entry
+        heapq.heappush(self._heap, (entry.next_due, next(self._sequence), entry))
+        self.start()
+        if self._wakeup is not None:
+            self._wakeup.set()
+    
+    def unregister(self, key: Hashable):
+        """Stop ticking a session"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            entry.active = False  # lazily dropped from the heap
+    
+    def start(self):
+        """Start the scheduler task on the running event loop"""
+        if self._task is None or self._task.done():
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return  # started by the first register() inside the loop
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+    
+    async def stop(self):
+        """Stop the scheduler task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def sessions_per_core(self, period: float) -> float:
+        """Estimate how many sessions at ``period`` one core can sustain"""
+        if self.stats.avg_tick_seconds <= 0:
+            return float('inf')
+        return period / self.stats.avg_tick_seconds
+    
+    async def _run(self):
+        """Scheduler main loop"""
+        heap = self._heap
+        while True:
+            # Drop entries that were unregistered while queued
+            while heap and not heap[0][2].active:
+                heapq.heappop(heap)
+            
+            self._wakeup.clear()
+            delay = heap[0][0] - time.monotonic() if heap else None
+            if delay is None or delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            self._run_batch(time.monotonic())
+    
+    def _run_batch(self, now: float):
+        """Tick every session that is due"""
+        heap = self._heap
+        due = []
+        while heap and heap[0][0] <= now:
+            _, _, entry = heapq.heappop(heap)
+            if entry.active:
+                due.append(entry)
+        if not due:
+            return
+        
+        lateness = now - due[0].next_due
+        started = time.perf_counter()
+        for entry in due:
+            try:
+                entry.callback()
+            except Exception as e:
+                print(f"Error in game tick: {e}")
+        duration = time.perf_counter() - started
+        self.stats.record_batch(len(due), duration, lateness)
+        BATCH_SECONDS.observe(duration)
+        LATENESS_SECONDS.observe(lateness)
+        for listener in self.batch_listeners:
+            listener(len(due), duration, lateness)
+        
+        # Reschedule on each session's grid, skipping slots already missed
+        now = time.monotonic()
+        for entry in due:
+            if not entry.active:
+                continue
+            entry.next_due += entry.period
+            if entry.next_due <= now:
+                missed = int((now - entry.next_due) // entry.period) + 1
+                entry.next_due += missed * entry.period
+                self.stats.missed_ticks += missed
+                MISSED_TICKS.inc(missed)
+            heapq.heappush(heap, (entry.next_due, next(self._sequence), entry))
+    
+    def snapshot(self) -> Dict[str, float]:
+        """Scheduler statistics for health and metrics endpoints"""
+        stats = self.stats
+        return {
+            'scheduled_sessions': len(self._entries),
+            'batches': stats.batches,
+            'ticks': stats.ticks,
+            'missed_ticks': stats.missed_ticks,
+            'last_batch_ms': round(stats.last_batch_seconds * 1000, 3),
+            'avg_batch_ms': round(stats.avg_batch_seconds * 1000, 3),
+            'max_batch_ms': round(stats.max_batch_seconds * 1000, 3),
+            'avg_tick_us': round(stats.avg_tick_seconds * 1e6, 2),
+            'utilization': round(stats.utilization, 3),
+            'max_lateness_ms': round(stats.max_lateness_seconds * 1000, 3)
+        }
+
+
+# Process-wide scheduler shared by all sessions
+tick_scheduler = TickScheduler()
\ No newline at end of file
@@ -0,0 +1,178 @@
+// Snake Game - client-side canvas renderer
+// Applies compact frame messages produced by core/frames.py:
+//   keyframe: [0, boardSize, flags, score, food, originX, originY, viewSize, ...snakeCells]  (head first)
+//   delta:    [1, head, neck, removedTail, food, score]          (-1 = unchanged)
+(function () {
+  const KEYFRAME = 0;
+  const FLAG_GAME_OVER = 1;
+  const FLAG_PAUSED = 2;
+  const FLAG_WON = 4;
+
+  const configs = {};
+  const boards = {};
+
+  // Viewport coordinates of a board cell, or null when it is off screen
+  function cellXY(board, cell) {
+    const x = (cell % board.size) - board.originX;
+    const y = Math.floor(cell / board.size) - board.originY;
+    if (x < 0 || y < 0 || x >= board.view || y >= board.view) return null;
+    return [x, y];
+  }
+
+  function drawBackground(board) {
+    const { ctx, config } = board;
+    const pixels = board.view * config.cellSize;
+    ctx.fillStyle = config.backgroundColor;
+    ctx.fillRect(0, 0, pixels, pixels);
+    ctx.strokeStyle = config.borderColor;
+    ctx.lineWidth = 1;
+    ctx.beginPath();
+    for (let i = 0; i <= board.view; i++) {
+      const pos = i * config.cellSize;
+      ctx.moveTo(pos, 0);
+      ctx.lineTo(pos, pixels);
+      ctx.moveTo(0, pos);
+      ctx.lineTo(pixels, pos);
+    }
+    ctx.stroke();
+  }
+
+  function eraseCell(board, cell) {
+    const xy = cellXY(board, cell);
+    if (!xy) return;
+    const { ctx, config } = board;
+    const [x, y] = xy;
+    const size = config.cellSize;
+    ctx.fillStyle = config.backgroundColor;
+    ctx.fillRect(x * size, y * size, size, size);
+    ctx.strokeStyle = config.borderColor;
+    ctx.lineWidth = 1;
+    ctx.strokeRect(x * size, y * size, size, size);
+  }
+
+  function drawSegment(board, cell, color) {
+    const xy = cellXY(board, cell);
+    if (!xy) return;
+    const { ctx, config } = board;
+    const [x, y] = xy;
+    const size = config.cellSize - 2;
+    ctx.fillStyle = color;
+    ctx.fillRect(x * config.cellSize + 1, y * config.cellSize + 1, size, size);
+    ctx.strokeStyle = "#ffffff";
+    ctx.lineWidth = 1;
+    ctx.strokeRect(x * config.cellSize + 1, y * config.cellSize + 1, size, size);
+  }
+
+  function drawFood(board, cell) {
+    const xy = cellXY(board, cell);
+    if (!xy) return;
+    const { ctx, config } = board;
+    const [x, y] = xy;
+    const size = config.cellSize - 4;
+    const radius = Math.floor(size / 2) - 2;
+    ctx.fillStyle = config.foodColor;
+    ctx.beginPath();
+    ctx.arc(x * config.cellSize + 2 + Math.floor(size / 2), y * config.cellSize + 2 + Math.floor(size / 2), radius, 0, 2 * Math.PI);
+    ctx.fill();
+  }
+
+  function drawOverlay(board, alpha, title, color, hint) {
+    const { ctx, config } = board;
+    const pixels = board.view * config.cellSize;
+    ctx.fillStyle = `rgba(0, 0, 0, ${alpha})`;
+    ctx.fillRect(0, 0, pixels, pixels);
+    ctx.textAlign = "center";
+    ctx.fillStyle = color;
+    ctx.font = "24px sans-serif";
+    ctx.fillText(title, pixels / 2, pixels / 2 - 20);
+    ctx.fillStyle = "#ffffff";
+    ctx.font = "16px sans-serif";
+    ctx.fillText(hint, pixels / 2, pixels / 2 + 10);
+  }
+
+  function applyKeyframe(board, frame) {
+    const [, size, flags, , food, originX, originY, view] = frame;
+    Object.assign(board, { size, originX, originY, view });
+    drawBackground(board);
+    if (food >= 0) drawFood(board, food);
+    for (let i = frame.length - 1; i >= 8; i--) {
+      drawSegment(board, frame[i], i === 8 ? board.config.snakeHeadColor : board.config.snakeColor);
+    }
+    if (flags & FLAG_WON) drawOverlay(board, 0.7, "YOU WIN!", "#44ff44", "Press R to play again");
+    else if (flags & FLAG_GAME_OVER) drawOverlay(board, 0.7, "GAME OVER", "#ff4444", "Press R to restart");
+    else if (flags & FLAG_PAUSED) drawOverlay(board, 0.5, "PAUSED", "#ffff44", "Press SPACE to continue");
+    board.ready = true;
+  }
+
+  function applyDelta(board, frame) {
+    const [, head, neck, removedTail, food] = frame;
+    if (removedTail >= 0) eraseCell(board, removedTail);
+    if (food >= 0) drawFood(board, food);
+    if (neck >= 0) drawSegment(board, neck, board.config.snakeColor);
+    if (head >= 0) drawSegment(board, head, board.config.snakeHeadColor);
+  }
+
+  // Server-built primitives from app/components/draw_canvas.py ("full" and "dirty" modes)
+  function drawPrimitive(ctx, canvas, p) {
+    const a = p.args;
+    if (p.kind === "clear") {
+      ctx.clearRect(0, 0, canvas.width, canvas.height);
+      return;
+    }
+    ctx.beginPath();
+    if (p.kind === "rect") ctx.rect(a[0], a[1], a[2], a[3]);
+    else if (p.kind === "circle") ctx.arc(a[0], a[1], a[2], 0, 2 * Math.PI);
+    else if (p.kind === "line") {
+      ctx.moveTo(a[0], a[1]);
+      ctx.lineTo(a[2], a[3]);
+    } else if (p.kind === "text") {
+      ctx.font = `${p.font_size || 16}px sans-serif`;
+      ctx.textAlign = { middle: "center", start: "left", end: "right" }[p.text_anchor] || "left";
+      if (p.fill_color) {
+        ctx.fillStyle = p.fill_color;
+        ctx.fillText(a[0], a[1], a[2]);
+      }
+      return;
+    }
+    if (p.fill_color && p.kind !== "line") {
+      ctx.fillStyle = p.fill_color;
+      ctx.fill();
+    }
+    if (p.stroke_color) {
+      ctx.strokeStyle = p.stroke_color;
+      ctx.lineWidth = p.stroke_width || 1;
+      ctx.stroke();
+    }
+  }
+
+  window.SnakeRenderer = {
+    draw(elementId, primitives) {
+      const canvas = document.getElementById(elementId);
+      if (!canvas) return;
+      const ctx = canvas.getContext("2d");
+      for (const p of primitives) drawPrimitive(ctx, canvas, p);
+    },
+
+
+    // Boards are addressed by name, which defaults to the canvas element id;
+    // spectator pages use a fixed name so every viewer gets the same message
+    init(elementId, config, name) {
+      const key = name || elementId;
+      configs[key] = { elementId, config };
+      delete boards[key];
+    },
+
+    frame(name, frame) {
+      let board = boards[name];
+      if (!board) {
+        // The canvas may mount after init() arrives
+        const entry = configs[name];
+        const canvas = entry && document.getElementById(entry.elementId);
+        if (!canvas) return;
+        board = boards[name] = { ctx: canvas.getContext("2d"), config: entry.config, size: 0, originX: 0, originY: 0, view: 0, ready: false };
+      }
+      if (frame[0] === KEYFRAME) applyKeyframe(board, frame);
+      else if (board.ready) applyDelta(board, frame);
+    },
+  };
+})();
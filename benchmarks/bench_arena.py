@@ -0,0 +1,76 @@
+"""
+Arena Benchmark
+Tick time of ArenaEngine as the number of players grows
+
+Run with ``python -m benchmarks.bench_arena``.
+"""
+
+import argparse
+import random
+import statistics
+from typing import Dict, List
+from core.arena import ArenaEngine, ArenaFullError
+from models.game_state import Direction
+from benchmarks.common import Metric, metric
+
+
+def run_arena(players: int, board_size: int, ticks: int, seed: int = 0) -> Dict[str, float]:
+    """Run one arena with ``players`` wandering bots; returns tick timings"""
+    arena = ArenaEngine(board_size=board_size, food_count=players, seed=seed)
+    rng = random.Random(seed)
+    directions = list(Direction)
+    for player in range(players):
+        arena.add_player(player)
+    
+    durations: List[float] = []
+    deaths = 0
+    for _ in range(ticks):
+        # Bots turn at random now and then; dead ones respawn
+        for snake in list(arena):
+            if not snake.alive:
+                try:
+                    arena.add_player(snake.player_id)
+                except ArenaFullError:
+                    pass
+            elif rng.random() < 0.1:
+                arena.change_direction(snake.player_id, rng.choice(directions))
+        deaths += len(arena.tick())
+        durations.append(arena.last_tick_seconds)
+    
+    durations.sort()
+    return {
+        'players': players,
+        'board_size': board_size,
+        'mean_tick_ms': statistics.fmean(durations) * 1000,
+        'p99_tick_ms': durations[int(len(durations) * 0.99)] * 1000,
+        'max_tick_ms': durations[-1] * 1000,
+        'deaths_per_tick': deaths / ticks,
+    }
+
+
+def run(quick: bool = False) -> Dict[str, Metric]:
+    """Run the arena benchmarks for the suite"""
+    results: Dict[str, Metric] = {}
+    for players in (100, 500):
+        result = run_arena(players, 200, 100 if quick else 500)
+        results[f'arena.p{players}.mean_tick_ms'] = metric(result['mean_tick_ms'], 'ms', False)
+        results[f'arena.p{players}.p99_tick_ms'] = metric(result['p99_tick_ms'], 'ms', False)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--players', type=int, nargs='+', default=[10, 100, 500, 1000])
+    parser.add_argument('--board-size', type=int, default=200)
+    parser.add_argument('--ticks', type=int, default=500)
+    args = parser.parse_args()
+    
+    print(f"{'players':>8} {'mean ms':>9} {'p99 ms':>9} {'max ms':>9} {'deaths/tick':>12}")
+    for players in args.players:
+        result = run_arena(players, args.board_size, args.ticks)
+        print(f"{result['players']:>8} {result['mean_tick_ms']:>9.3f} {result['p99_tick_ms']:>9.3f} "
+              f"{result['max_tick_ms']:>9.3f} {result['deaths_per_tick']:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
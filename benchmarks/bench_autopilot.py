@@ -0,0 +1,95 @@
+"""
+Autopilot Benchmarks
+Per-move cost of the autopilot and how many bots one core can run
+
+Run with ``python -m benchmarks.bench_autopilot``.
+"""
+
+import argparse
+import time
+from typing import Dict, Optional
+from core.autopilot import Autopilot
+from core.game_engine import SnakeGameEngine
+from core.score_store import NullScoreStore
+from benchmarks.common import Metric, metric
+
+
+# Milliseconds between moves, as settings.game_speed
+GAME_SPEED_MS = 150
+
+
+class CountingScoreStore(NullScoreStore):
+    """Score store counting what reaches it; autopilot games must add nothing"""
+    
+    def __init__(self):
+        self.added = 0
+    
+    def add_score(self, score: int, player: str = "Player", game_id: Optional[str] = None):
+        self.added += 1
+
+
+class RebuildingAutopilot(Autopilot):
+    """Autopilot recomputing its distance field every tick, for comparison"""
+    
+    def _sync(self, blocked):
+        return self._rebuild(blocked)
+
+
+def bench_bots(board_size: int, ticks: int, autopilot_class=Autopilot, seed: int = 0) -> Dict[str, float]:
+    """Play autopilot games back to back for ``ticks`` moves; returns per-move cost and play quality
+    
+    Raises RuntimeError if an autopilot game's score reached the score store.
+    """
+    scores = CountingScoreStore()
+    games = 0
+    food = 0
+    elapsed = 0.0
+    played = 0
+    while played < ticks:
+        engine = SnakeGameEngine(score_store=scores, board_size=board_size, seed=seed + games, replay_archive=None)
+        autopilot = autopilot_class(engine)
+        start = time.perf_counter()
+        while played < ticks:
+            played += 1
+            if not autopilot.step():
+                break
+        elapsed += time.perf_counter() - start
+        games += 1
+        food += engine.game_state.score // 10
+    if scores.added:
+        raise RuntimeError(f"{scores.added} autopilot scores reached the score store")
+    return {
+        'tick_us': elapsed / played * 1e6,
+        'food_per_game': food / games,
+        'bots_per_core': (GAME_SPEED_MS / 1000) / (elapsed / played),
+    }
+
+
+def run(quick: bool = False) -> Dict[str, Metric]:
+    """Run the autopilot benchmarks for the suite"""
+    ticks = 5000 if quick else 30000
+    results: Dict[str, Metric] = {}
+    for board_size in (20, 40):
+        result = bench_bots(board_size, ticks)
+        results[f'autopilot.b{board_size}.tick_us'] = metric(result['tick_us'], 'us', False)
+        results[f'autopilot.b{board_size}.bots_per_core'] = metric(result['bots_per_core'], 'bots', True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure autopilot move cost and bots per core')
+    parser.add_argument('--ticks', type=int, default=30000, help='moves per measurement')
+    args = parser.parse_args()
+    
+    print(f"{'board':>6} {'field':>12} {'us/move':>9} {'bots/core':>10} {'food/game':>10}")
+    for board_size in (20, 40, 100, 1000):
+        for name, autopilot_class in (('incremental', Autopilot), ('rebuild', RebuildingAutopilot)):
+            if name == 'rebuild' and board_size > 40:
+                continue  # too slow to be worth waiting for; sparse boards use no field at all
+            result = bench_bots(board_size, args.ticks, autopilot_class)
+            print(f"{board_size:>6} {name:>12} {result['tick_us']:>9.1f} {result['bots_per_core']:>10.0f} "
+                  f"{result['food_per_game']:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
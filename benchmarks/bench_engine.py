@@ -0,0 +1,92 @@
+"""
+Engine Benchmarks
+SnakeGameEngine.update() throughput, food spawning and memory per session
+"""
+
+import gc
+import tracemalloc
+from typing import Dict
+from core.frames import FrameTracker
+from core.game_engine import SnakeGameEngine
+from core.score_store import NullScoreStore
+from benchmarks.common import Metric, best_rate, cycle_directions, make_engine, metric
+
+
+# (board size, snake length) pairs for update throughput
+UPDATE_CASES = [(20, 3), (20, 200), (50, 1250), (200, 20000), (1000, 1000)]
+
+# Share of the board covered by the snake when spawning food
+SPAWN_FILL = [0.5, 0.99]
+
+
+def bench_update(board_size: int, length: int, ticks: int) -> float:
+    """Updates per second for one snake steered along a collision-free tour
+    
+    The snake still eats, but is trimmed back to ``length`` so a long run
+    measures that length instead of filling the board.
+    """
+    directions = cycle_directions(board_size)
+    
+    def run(engine):
+        state = engine.game_state
+        body = state.body
+        update = engine.update
+        for _ in range(ticks):
+            state.direction = directions[body.head]
+            update()
+            if len(body) > length:
+                body.pop_tail()
+        return ticks
+    
+    return best_rate(run, setup=lambda: make_engine(board_size, length))
+
+
+def bench_spawn(board_size: int, fill: float, sparse: bool, spawns: int) -> float:
+    """Food spawns per second with ``fill`` of the board covered by the snake"""
+    engine = make_engine(board_size, int(board_size * board_size * fill), sparse=sparse)
+    spawn = engine._spawn_food
+    
+    def run():
+        for _ in range(spawns):
+            spawn()
+        return spawns
+    
+    return best_rate(run)
+
+
+def bench_session_memory(board_size: int, sessions: int) -> float:
+    """Bytes allocated per headless session (engine plus frame tracker)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [
+        (SnakeGameEngine(score_store=NullScoreStore(), board_size=board_size, seed=seed,
+                         replay_archive=None), FrameTracker())
+        for seed in range(sessions)
+    ]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / sessions
+
+
+def run(quick: bool = False) -> Dict[str, Metric]:
+    """Run the engine benchmarks"""
+    scale = 10 if quick else 1
+    results: Dict[str, Metric] = {}
+    
+    for board_size, length in UPDATE_CASES:
+        rate = bench_update(board_size, length, 100_000 // scale)
+        results[f'engine.update.b{board_size}.len{length}'] = metric(rate, 'updates/s', True)
+    
+    for fill in SPAWN_FILL:
+        for sparse in (False, True):
+            mode = 'sparse' if sparse else 'dense'
+            rate = bench_spawn(50, fill, sparse, 20_000 // scale)
+            results[f'engine.spawn_food.b50.fill{int(fill * 100)}.{mode}'] = metric(rate, 'spawns/s', True)
+    
+    for board_size in (20, 1000):
+        size = bench_session_memory(board_size, 200 // scale)
+        results[f'engine.memory_per_session.b{board_size}'] = metric(size / 1024, 'KiB', False)
+    
+    return results
\ No newline at end of file
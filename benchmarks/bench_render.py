@@ -0,0 +1,143 @@
+"""
+Render Benchmarks
+Draw primitives and serialized bytes per frame for each GameBoard render mode
+"""
+
+import asyncio
+import json
+import random
+import re
+from typing import Dict, List
+from nicegui import Client, core
+from nicegui.page import page
+from app.components.draw_canvas import DrawCommand
+from app.components.game_board import GameBoard
+from models.game_state import Direction
+from benchmarks.common import Metric, make_engine, metric
+
+
+# Primitive list of a SnakeRenderer.draw() call
+_DRAW_CALL = re.compile(r"SnakeRenderer\.draw\('c\d+',(.*)\)$")
+
+
+class _RecordingClient:
+    """Stand-in client recording run_javascript() calls"""
+    
+    def __init__(self):
+        self.calls: List[str] = []
+    
+    def run_javascript(self, code: str):
+        self.calls.append(code)
+
+
+class RecordingCanvas:
+    """Stand-in for DrawCanvas recording the primitives a GameBoard sends, without NiceGUI"""
+    
+    id = 0
+    
+    def __init__(self):
+        self.primitives: List[DrawCommand] = []
+        self.sent: List[dict] = []
+        self.client = _RecordingClient()
+    
+    def _record(self, kind: str, *args) -> DrawCommand:
+        primitive = DrawCommand(kind, args)
+        self.primitives.append(primitive)
+        return primitive
+    
+    def rect(self, *args):
+        return self._record('rect', *args)
+    
+    def line(self, *args):
+        return self._record('line', *args)
+    
+    def circle(self, *args):
+        return self._record('circle', *args)
+    
+    def text(self, *args):
+        return self._record('text', *args)
+    
+    def clear(self):
+        self._record('clear')
+    
+    def flush(self) -> int:
+        """Serialize the queued primitives as DrawCanvas.flush() would"""
+        if not self.primitives:
+            return 0
+        primitives = [primitive.data for primitive in self.primitives]
+        self.primitives = []
+        self.sent.extend(primitives)
+        return len(json.dumps(primitives, separators=(',', ':')))
+    
+    def take(self) -> List[dict]:
+        """Primitives flushed since the last take()"""
+        sent = self.sent
+        self.sent = []
+        return sent
+
+
+class RecordingBoard(GameBoard):
+    """GameBoard drawing onto recording canvases instead of NiceGUI elements"""
+    
+    def _setup_board(self):
+        self.canvas = RecordingCanvas()
+        if self.render_mode == 'dirty':
+            self.background_canvas = RecordingCanvas()
+            self._draw_background(self.background_canvas)
+            self.background_canvas.flush()
+
+
+def _take_calls(client: Client) -> List[str]:
+    """JavaScript queued for the browser since the last call"""
+    calls = [message[2]['code'] for message in client.outbox.messages if message[1] == 'run_javascript']
+    client.outbox.messages.clear()
+    return calls
+
+
+async def _bench_frames(render_mode: str, frames: int, seed: int) -> Dict[str, float]:
+    core.loop = asyncio.get_running_loop()
+    client = Client(page('/'), request=None)
+    with client:
+        board = GameBoard(render_mode=render_mode)
+    engine = make_engine(20, seed=seed)
+    rng = random.Random(seed)
+    directions = list(Direction)
+    primitives = 0
+    sent = 0
+    await asyncio.sleep(0)
+    _take_calls(client)  # setup: renderer init, static layer, focus
+    for _ in range(frames):
+        if rng.random() < 0.2:
+            engine.change_direction(rng.choice(directions))
+        if not engine.update() and engine.game_state.is_game_over:
+            engine.reset_game()
+        with client:
+            board.update_display(engine.game_state)
+        await asyncio.sleep(0)  # let run_javascript() queue its message
+        for call in _take_calls(client):
+            sent += len(call)
+            draw = _DRAW_CALL.match(call)
+            if draw:
+                primitives += len(json.loads(draw.group(1)))
+    client.remove_all_elements()
+    return {'primitives': primitives / frames, 'bytes': sent / frames}
+
+
+def bench_frames(render_mode: str, frames: int, seed: int = 0) -> Dict[str, float]:
+    """Average draw primitives and bytes per frame over a randomly steered game
+    
+    Builds a real GameBoard on an offline NiceGUI client and measures the
+    messages it queues for the browser.
+    """
+    return asyncio.run(_bench_frames(render_mode, frames, seed))
+
+
+def run(quick: bool = False) -> Dict[str, Metric]:
+    """Run the render benchmarks"""
+    frames = 500 if quick else 5000
+    results: Dict[str, Metric] = {}
+    for render_mode in ('full', 'dirty', 'client'):
+        frame = bench_frames(render_mode, frames)
+        results[f'render.{render_mode}.primitives_per_frame'] = metric(frame['primitives'], 'primitives', False)
+        results[f'render.{render_mode}.bytes_per_frame'] = metric(frame['bytes'], 'bytes', False)
+    return results
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""
+RL Environment Benchmarks
+Game steps per second per core of SnakeVecEnv, with and without observations
+
+Run with ``python -m benchmarks.bench_rl_env``.
+"""
+
+import argparse
+from typing import Dict
+import numpy as np
+from core.batch_env import BatchSnakeEnv
+from core.rl_env import FEATURES, PLANES, SnakeVecEnv
+from benchmarks.common import Metric, best_rate, metric
+
+
+def bench_env(num_games: int, board_size: int, observation: str, steps: int, seed: int = 0) -> float:
+    """Game steps per second under random actions; ``observation`` '' steps BatchSnakeEnv alone"""
+    # Actions are drawn up front so the policy's cost is not measured
+    actions = np.random.default_rng(seed).integers(0, 4, (steps, num_games), dtype=np.int8)
+    
+    def setup():
+        if observation:
+            return SnakeVecEnv(num_games, board_size, observation=observation, seed=seed)
+        return BatchSnakeEnv(num_games, board_size, seed=seed)
+    
+    def play(env) -> int:
+        if observation:
+            for step_actions in actions:
+                env.step(step_actions)
+        else:
+            # Bare batch environment, resetting finished games like SnakeVecEnv does
+            for step_actions in actions:
+                done = env.step(step_actions)
+                env.reset(done)
+        return steps * num_games
+    
+    return best_rate(play, setup=setup)
+
+
+def run(quick: bool = False) -> Dict[str, Metric]:
+    """Run the RL environment benchmarks for the suite"""
+    steps = 100 if quick else 500
+    results: Dict[str, Metric] = {}
+    for name, observation in (('batch', ''), ('planes', PLANES), ('features', FEATURES)):
+        rate = bench_env(1024, 20, observation, steps)
+        results[f'rl.g1024.{name}.steps_per_s'] = metric(rate, 'steps/s', True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure SnakeVecEnv game steps per second')
+    parser.add_argument('--games', type=int, nargs='+', default=[64, 256, 1024, 4096])
+    parser.add_argument('--board-size', type=int, default=20)
+    parser.add_argument('--steps', type=int, default=500)
+    args = parser.parse_args()
+    
+    print(f"{'games':>6} {'batch steps/s':>14} {'planes steps/s':>15} {'features steps/s':>17}")
+    for games in args.games:
+        rates = [bench_env(games, args.board_size, observation, args.steps)
+                 for observation in ('', PLANES, FEATURES)]
+        print(f"{games:>6} {rates[0]:>14,.0f} {rates[1]:>15,.0f} {rates[2]:>17,.0f}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
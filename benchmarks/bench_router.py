@@ -0,0 +1,124 @@
+"""
+Router Benchmark
+Request latency through the sharding router, and where it sends spectators
+
+Run with ``python -m benchmarks.bench_router``. Stand-in workers answer
+every request with their name and the request they received, so the run
+also checks that /watch/<id> reaches the worker named in the id and that
+the spectator page's prefixed requests follow it.
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import statistics
+import time
+from typing import Dict, List, Optional, Tuple
+from app.services.sharding import SHARD_COOKIE, SHARD_PREFIX, ShardRouter, Worker, _parse_request_head
+from benchmarks.common import Metric, metric
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+async def _serve_stand_in(worker: Worker) -> asyncio.AbstractServer:
+    """Listen on the worker's port, answering with the worker name, path and forwarded prefix"""
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        head = await reader.readuntil(b'\r\n\r\n')
+        _method, path, headers = _parse_request_head(head)
+        body = json.dumps({
+            'worker': worker.name,
+            'path': path,
+            'prefix': headers.get('x-forwarded-prefix')
+        }).encode()
+        writer.write(f'HTTP/1.1 200 OK\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n'.encode() + body)
+        await writer.drain()
+        writer.close()
+    return await asyncio.start_server(handle, worker.host, worker.port)
+
+
+async def _get(port: int, path: str, cookie: Optional[str] = None) -> Tuple[dict, Optional[str]]:
+    """GET through the router; returns the stand-in's answer and the shard cookie it set"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    headers = f'Cookie: {SHARD_COOKIE}={cookie}\r\n' if cookie else ''
+    writer.write(f'GET {path} HTTP/1.1\r\nHost: localhost\r\n{headers}Connection: close\r\n\r\n'.encode())
+    response = await reader.read()
+    writer.close()
+    head, body = response.split(b'\r\n\r\n', 1)
+    issued = None
+    for line in head.decode('latin-1').split('\r\n'):
+        if line.startswith('Set-Cookie: '):
+            issued = line.split('=', 1)[1].split(';', 1)[0]
+    return json.loads(body), issued
+
+
+def _expect(answer: dict, worker: str, path: str, prefix: Optional[str]):
+    if (answer['worker'], answer['path'], answer['prefix']) != (worker, path, prefix):
+        raise RuntimeError(f"routed to {answer}, expected {worker} {path} with prefix {prefix}")
+
+
+async def _measure(workers: int, requests: int) -> Dict[str, float]:
+    """Check spectator routing, then time cookie-routed and spectator requests"""
+    pool = [Worker(f'worker-{i}', '127.0.0.1', _free_port()) for i in range(workers)]
+    stand_ins = [await _serve_stand_in(worker) for worker in pool]
+    router = ShardRouter(pool)
+    port = _free_port()
+    server = await asyncio.start_server(router._handle_client, '127.0.0.1', port)
+    try:
+        # Whatever worker the viewer's own cookie picks, the game's worker serves the watch page
+        for worker in pool:
+            prefix = SHARD_PREFIX + worker.name
+            for viewer in range(workers * 4):
+                answer, _ = await _get(port, f'/watch/{worker.name}.token', cookie=f'viewer{viewer}')
+                _expect(answer, worker.name, f'/watch/{worker.name}.token', prefix)
+            answer, _ = await _get(port, f'{prefix}/_nicegui_ws/socket.io/?EIO=4', cookie='viewer0')
+            _expect(answer, worker.name, '/_nicegui_ws/socket.io/?EIO=4', prefix)
+        
+        # A player keeps the worker their first request was given
+        answer, cookie = await _get(port, '/')
+        if cookie is None:
+            raise RuntimeError("router did not issue a shard cookie")
+        again, _ = await _get(port, '/', cookie=cookie)
+        _expect(again, answer['worker'], '/', None)
+        
+        timings: Dict[str, List[float]] = {'cookie': [], 'watch': []}
+        for index in range(requests):
+            start = time.perf_counter()
+            await _get(port, '/', cookie=cookie)
+            timings['cookie'].append(time.perf_counter() - start)
+            start = time.perf_counter()
+            await _get(port, f'/watch/{pool[index % workers].name}.token', cookie=cookie)
+            timings['watch'].append(time.perf_counter() - start)
+        return {name: statistics.median(values) * 1000 for name, values in timings.items()}
+    finally:
+        server.close()
+        for stand_in in stand_ins:
+            stand_in.close()
+
+
+def run(quick: bool = False) -> Dict[str, Metric]:
+    """Run the router benchmarks for the suite"""
+    result = asyncio.run(_measure(4, 100 if quick else 500))
+    return {
+        'router.cookie.request_ms': metric(result['cookie'], 'ms', False),
+        'router.watch.request_ms': metric(result['watch'], 'ms', False),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure request latency through the sharding router')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+    
+    result = asyncio.run(_measure(args.workers, args.requests))
+    for name, value in result.items():
+        print(f"{name:<8} {value:>8.3f} ms median")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""
+Session Benchmarks
+Sustainable game sessions per core at the default game speed
+
+Counts server-side game work only (engine update plus building draw calls
+or frame messages); NiceGUI element serialization and websocket sends are
+not included, so these are upper bounds.
+"""
+
+import random
+import time
+from typing import Dict
+from core.frames import FrameTracker, encode_frame
+from models.game_state import Direction
+from benchmarks.bench_render import RecordingBoard
+from benchmarks.common import Metric, make_engine, metric
+
+
+# Milliseconds between moves, as settings.game_speed
+GAME_SPEED_MS = 150
+
+
+def bench_session_tick(render_mode: str, sessions: int, ticks: int, seed: int = 0) -> float:
+    """Average seconds of server work for one session tick (update plus render)"""
+    rng = random.Random(seed)
+    directions = list(Direction)
+    games = []
+    for index in range(sessions):
+        engine = make_engine(20, seed=seed + index)
+        games.append((engine, RecordingBoard(render_mode=render_mode)))
+    
+    elapsed = 0.0
+    for _ in range(ticks):
+        # Inputs arrive between ticks and are not part of the tick cost
+        for engine, _board in games:
+            if rng.random() < 0.2:
+                engine.change_direction(rng.choice(directions))
+        
+        start = time.perf_counter()
+        for engine, board in games:
+            if not engine.update() and engine.game_state.is_game_over:
+                engine.reset_game()
+            board.update_display(engine.game_state)
+        elapsed += time.perf_counter() - start
+        
+        for _engine, board in games:
+            board.canvas.take()
+            board.canvas.client.calls.clear()
+    
+    return elapsed / (sessions * ticks)
+
+
+def bench_headless_tick(sessions: int, ticks: int, seed: int = 0) -> float:
+    """Average seconds per session tick for engine update plus frame encoding only"""
+    rng = random.Random(seed)
+    directions = list(Direction)
+    games = [(make_engine(20, seed=seed + index), FrameTracker()) for index in range(sessions)]
+    
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for engine, tracker in games:
+            if rng.random() < 0.2:
+                engine.change_direction(rng.choice(directions))
+            if not engine.update() and engine.game_state.is_game_over:
+                engine.reset_game()
+            delta = tracker.diff(engine.game_state)
+            if delta is not None:
+                encode_frame(delta, engine.game_state)
+    return (time.perf_counter() - start) / (sessions * ticks)
+
+
+def run(quick: bool = False) -> Dict[str, Metric]:
+    """Run the session capacity benchmarks"""
+    sessions, ticks = (50, 20) if quick else (200, 50)
+    period = GAME_SPEED_MS / 1000
+    results: Dict[str, Metric] = {}
+    for render_mode in ('full', 'dirty', 'client'):
+        per_tick = bench_session_tick(render_mode, sessions, ticks)
+        results[f'sessions.{render_mode}.tick_us'] = metric(per_tick * 1e6, 'us', False)
+        results[f'sessions.{render_mode}.per_core'] = metric(period / per_tick, 'sessions', True)
+    
+    per_tick = bench_headless_tick(sessions, ticks)
+    results['sessions.headless.per_core'] = metric(period / per_tick, 'sessions', True)
+    return results
\ No newline at end of file
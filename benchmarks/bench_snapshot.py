@@ -0,0 +1,98 @@
+"""
+Snapshot Benchmarks
+Time to save and restore thousands of live sessions
+
+Run with ``python -m benchmarks.bench_snapshot``.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Dict
+from app.services.session_snapshots import SessionSnapshotStore
+from core.score_store import NullScoreStore
+from core.snapshot import restore_engine
+from models.game_state import Direction
+from benchmarks.common import Metric, make_engine, metric
+
+
+def bench_snapshots(sessions: int, ticks: int = 30, seed: int = 0) -> Dict[str, float]:
+    """Save ``sessions`` games mid-play, then load and restore them all"""
+    rng = random.Random(seed)
+    directions = list(Direction)
+    games = []
+    for index in range(sessions):
+        engine = make_engine(20, seed=seed + index)
+        for _ in range(ticks):
+            if rng.random() < 0.2:
+                engine.change_direction(rng.choice(directions))
+            engine.update()
+        games.append((f'browser-{index}', engine))
+    live = [(key, engine) for key, engine in games if not engine.game_state.is_game_over]
+    
+    with tempfile.TemporaryDirectory() as directory:
+        store = SessionSnapshotStore(os.path.join(directory, 'sessions.db'))
+        start = time.perf_counter()
+        store.save_changed(games)
+        encoded = time.perf_counter()
+        store.flush()
+        written = time.perf_counter()
+        
+        # A second round with nothing changed should cost next to nothing
+        store.save_changed(games)
+        unchanged = time.perf_counter() - written
+        store.close()
+        
+        store = SessionSnapshotStore(os.path.join(directory, 'sessions.db'))
+        start_load = time.perf_counter()
+        store.load()
+        loaded = time.perf_counter()
+        snapshots = [store.take(key) for key, _ in live]
+        store.close()
+    
+    scores = NullScoreStore()
+    start_restore = time.perf_counter()
+    for data in snapshots:
+        restore_engine(data, score_store=scores, replay_archive=None)
+    restored = time.perf_counter()
+    
+    return {
+        'save_ms': (encoded - start) * 1000,
+        'write_ms': (written - encoded) * 1000,
+        'unchanged_ms': unchanged * 1000,
+        'load_ms': (loaded - start_load) * 1000,
+        'restore_ms': (restored - start_restore) * 1000,
+        'bytes_per_session': sum(len(data) for data in snapshots) / max(len(snapshots), 1),
+    }
+
+
+def run(quick: bool = False) -> Dict[str, Metric]:
+    """Run the snapshot benchmarks for the suite (quick or not: one round takes seconds)"""
+    sessions = 5000
+    result = bench_snapshots(sessions)
+    return {
+        f'snapshot.s{sessions}.save_ms': metric(result['save_ms'], 'ms', False),
+        f'snapshot.s{sessions}.write_ms': metric(result['write_ms'], 'ms', False),
+        f'snapshot.s{sessions}.load_ms': metric(result['load_ms'], 'ms', False),
+        f'snapshot.s{sessions}.restore_ms': metric(result['restore_ms'], 'ms', False),
+        'snapshot.bytes_per_session': metric(result['bytes_per_session'], 'bytes', False),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure session snapshot save and restore times')
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1000, 5000])
+    args = parser.parse_args()
+    
+    print(f"{'sessions':>9} {'save ms':>9} {'write ms':>9} {'unchanged':>10} {'load ms':>9} "
+          f"{'restore ms':>11} {'bytes':>7}")
+    for sessions in args.sessions:
+        result = bench_snapshots(sessions)
+        print(f"{sessions:>9} {result['save_ms']:>9.1f} {result['write_ms']:>9.1f} {result['unchanged_ms']:>10.2f} "
+              f"{result['load_ms']:>9.1f} {result['restore_ms']:>11.1f} {result['bytes_per_session']:>7.0f}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
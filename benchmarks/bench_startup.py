@@ -0,0 +1,135 @@
+"""
+Startup Benchmarks
+Cold-start time of the web server and of the headless engine, each in a fresh process
+
+Run with ``python -m benchmarks.bench_startup``.
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, List
+from benchmarks.common import Metric, metric
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Cold-start budgets in milliseconds; the suite fails when a run exceeds them
+WEB_READY_BUDGET_MS = 2000
+HEADLESS_BUDGET_MS = 500
+
+# Modules the headless path must not load
+UI_MODULES = ('nicegui', 'pydantic_settings', 'app.config')
+
+# Imports the engine and plays one tick with its defaults, then reports what it loaded
+HEADLESS_SCRIPT = f"""
+import json, sys, time
+start = time.perf_counter()
+from core.game_engine import SnakeGameEngine
+imported = time.perf_counter()
+SnakeGameEngine(seed=0).update()
+print(json.dumps({{
+    'import_ms': (imported - start) * 1000,
+    'loaded': [name for name in {UI_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+
+def _environment(**extra: str) -> Dict[str, str]:
+    """Child environment importing from the repository; children run from an
+    empty directory, so no .env or data files are read"""
+    return dict(os.environ, PYTHONPATH=str(ROOT), **extra)
+
+
+def measure_headless() -> Dict[str, object]:
+    """Wall time of a fresh interpreter importing the engine and playing one tick"""
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, '-c', HEADLESS_SCRIPT], cwd=workdir, env=_environment(),
+            capture_output=True, text=True, check=True
+        ).stdout
+        elapsed = time.perf_counter() - start
+        written = sorted(os.listdir(workdir))
+    result = json.loads(output)
+    result['written'] = written
+    result['cold_ms'] = elapsed * 1000
+    return result
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def measure_web(timeout: float = 30.0) -> float:
+    """Milliseconds from starting main.py until /health answers"""
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as workdir:
+        env = _environment(HOST='127.0.0.1', PORT=str(port), WORKERS='1')
+        start = time.perf_counter()
+        server = subprocess.Popen([sys.executable, str(ROOT / 'main.py')], cwd=workdir, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            while time.perf_counter() - start < timeout:
+                if server.poll() is not None:
+                    raise RuntimeError(f"main.py exited with status {server.returncode}")
+                try:
+                    with urllib.request.urlopen(f'http://127.0.0.1:{port}/health', timeout=1):
+                        return (time.perf_counter() - start) * 1000
+                except (urllib.error.URLError, ConnectionError):
+                    time.sleep(0.01)
+            raise RuntimeError(f"main.py did not answer within {timeout:.0f}s")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def run(quick: bool = False) -> Dict[str, Metric]:
+    """Run the startup benchmarks for the suite (best of several cold starts)"""
+    repeats = 2 if quick else 5
+    headless: List[Dict[str, object]] = [measure_headless() for _ in range(repeats)]
+    loaded = headless[0]['loaded']
+    if loaded:
+        raise RuntimeError(f"headless engine import loaded {', '.join(loaded)}")
+    written = headless[0]['written']
+    if written:
+        raise RuntimeError(f"headless engine wrote {', '.join(written)}")
+    web = min(measure_web() for _ in range(repeats))
+    return {
+        'startup.headless.import_ms': metric(min(run['import_ms'] for run in headless), 'ms', False),
+        'startup.headless.cold_ms': metric(min(run['cold_ms'] for run in headless), 'ms', False,
+                                           budget=HEADLESS_BUDGET_MS),
+        'startup.web.ready_ms': metric(web, 'ms', False, budget=WEB_READY_BUDGET_MS),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure cold-start times')
+    parser.add_argument('--quick', action='store_true', help='fewer repeats')
+    args = parser.parse_args()
+    
+    results = run(quick=args.quick)
+    over = False
+    for name, result in results.items():
+        budget = result.get('budget')
+        note = ''
+        if budget is not None:
+            note = f"  (budget {budget} ms{', EXCEEDED' if result['value'] > budget else ''})"
+            over = over or result['value'] > budget
+        print(f"{name:<28} {result['value']:>8.1f} ms{note}")
+    if over:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
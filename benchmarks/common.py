@@ -0,0 +1,91 @@
+"""
+Benchmark Helpers
+Shared timing, result and board-setup utilities
+"""
+
+import time
+from typing import Callable, Dict, List, Optional
+from core.game_engine import SnakeGameEngine
+from core.score_store import NullScoreStore
+from models.game_state import Direction
+
+
+# One benchmark measurement: {'value': float, 'unit': str, 'higher_is_better': bool},
+# plus an absolute 'budget' for metrics that have one
+Metric = Dict[str, object]
+
+
+def metric(value: float, unit: str, higher_is_better: bool, budget: Optional[float] = None) -> Metric:
+    """Build a result entry"""
+    result = {'value': round(value, 4), 'unit': unit, 'higher_is_better': higher_is_better}
+    if budget is not None:
+        result['budget'] = budget
+    return result
+
+
+def best_rate(run: Callable[..., int], repeats: int = 3,
+              setup: Optional[Callable[[], object]] = None) -> float:
+    """Best operations per second over ``repeats`` runs
+    
+    ``run`` returns its operation count; when ``setup`` is given, its result
+    is passed to ``run`` and its time is not counted.
+    """
+    best = 0.0
+    for _ in range(repeats):
+        args = (setup(),) if setup else ()
+        start = time.perf_counter()
+        ops = run(*args)
+        best = max(best, ops / (time.perf_counter() - start))
+    return best
+
+
+def hamiltonian_cycle(size: int) -> List[int]:
+    """Packed cells of a closed tour visiting every cell of an even-sized board
+    
+    Rows are swept in a serpentine over columns 1..size-1 and the tour
+    returns to the start up column 0.
+    """
+    cycle = []
+    for y in range(size):
+        xs = range(1, size) if y % 2 == 0 else range(size - 1, 0, -1)
+        cycle.extend(y * size + x for x in xs)
+    cycle.extend(y * size for y in range(size - 1, -1, -1))
+    return cycle
+
+
+def cycle_directions(size: int) -> List[Optional[Direction]]:
+    """Direction from every cell to its successor on the Hamiltonian cycle"""
+    cycle = hamiltonian_cycle(size)
+    directions: List[Optional[Direction]] = [None] * (size * size)
+    for index, cell in enumerate(cycle):
+        following = cycle[(index + 1) % len(cycle)]
+        step = following - cell
+        if step == 1:
+            directions[cell] = Direction.RIGHT
+        elif step == -1:
+            directions[cell] = Direction.LEFT
+        elif step == size:
+            directions[cell] = Direction.DOWN
+        else:
+            directions[cell] = Direction.UP
+    return directions
+
+
+def make_engine(board_size: int, length: int = 3, seed: int = 0,
+                sparse: Optional[bool] = None) -> SnakeGameEngine:
+    """Headless engine whose snake of ``length`` cells lies on the Hamiltonian cycle
+    
+    Steering along the cycle (see cycle_directions) never collides, so the
+    snake keeps moving for as long as a benchmark needs.
+    """
+    engine = SnakeGameEngine(score_store=NullScoreStore(), board_size=board_size,
+                             seed=seed, replay_archive=None, sparse=sparse)
+    state = engine.game_state
+    body = state.body
+    body.clear()
+    cycle = hamiltonian_cycle(board_size)
+    for cell in cycle[:length]:
+        body.push_head(cell)
+    state.direction = cycle_directions(board_size)[body.head]
+    engine._spawn_food()
+    return engine
\ No newline at end of file
@@ -0,0 +1,357 @@
+"""
+Load Generator
+Ramps up simulated players and records a capacity curve
+
+Stand-in mode (the default) runs N game sessions in this process, exactly
+as the server would tick them, with scripted key presses arriving between
+ticks. ``--architecture timer`` gives every session its own loop like one
+``ui.timer`` per page; ``--architecture scheduler`` drives all sessions from
+the shared TickScheduler. Draw calls go to recording canvases and their
+serialized size stands in for websocket traffic.
+    
+    python -m benchmarks.loadgen --architecture timer --sessions 100 200 400 800
+    python -m benchmarks.loadgen --architecture scheduler --output capacity.json
+
+URL mode opens real NiceGUI clients against a running server (page load
+plus socket.io connection, needs aiohttp), sends scripted key presses to
+each game canvas and counts the bytes pushed to every client. Pass the
+server's pid to sample its CPU and RSS:
+    
+    python -m benchmarks.loadgen --url http://localhost:8000 --server-pid 1234
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import resource
+import sys
+import time
+import uuid
+from typing import Dict, List, Optional
+from app.services.latency import percentile
+from app.services.tick_scheduler import TickScheduler
+from models.game_state import Direction
+from benchmarks.bench_render import RecordingBoard
+from benchmarks.common import make_engine
+
+
+# Keys a scripted player presses, as sent by the game canvas
+SCRIPT_KEYS = ['arrowup', 'arrowright', 'arrowdown', 'arrowleft', 'w', 'd', 's', 'a']
+
+# Ticks between restarts sent by URL-mode clients
+RESTART_TICKS = 40
+
+KEY_DIRECTIONS = {
+    'arrowup': Direction.UP, 'w': Direction.UP,
+    'arrowdown': Direction.DOWN, 's': Direction.DOWN,
+    'arrowleft': Direction.LEFT, 'a': Direction.LEFT,
+    'arrowright': Direction.RIGHT, 'd': Direction.RIGHT,
+}
+
+
+class KeyScript:
+    """Seeded key presses, one every few ticks on average"""
+    
+    __slots__ = ('rng', 'mean_gap', 'next_time')
+    
+    def __init__(self, seed: int, mean_gap: float):
+        self.rng = random.Random(seed)
+        self.mean_gap = mean_gap
+        self.next_time = time.monotonic() + self.rng.expovariate(1 / mean_gap)
+    
+    def due(self, now: float) -> Optional[str]:
+        """The next key if it is due, scheduling the one after"""
+        if now < self.next_time:
+            return None
+        self.next_time = now + self.rng.expovariate(1 / self.mean_gap)
+        return self.rng.choice(SCRIPT_KEYS)
+
+
+class ProcessSampler:
+    """CPU share and resident memory of a process, from /proc when available"""
+    
+    def __init__(self, pid: Optional[int] = None):
+        self.pid = pid
+        self._cpu = self._cpu_seconds()
+        self._wall = time.monotonic()
+    
+    def _cpu_seconds(self) -> float:
+        if self.pid is None:
+            return time.process_time()
+        with open(f'/proc/{self.pid}/stat') as stat:
+            fields = stat.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    
+    def rss_mb(self) -> float:
+        """Current resident set size in MiB"""
+        try:
+            with open(f"/proc/{self.pid or 'self'}/statm") as statm:
+                pages = int(statm.read().split()[1])
+            return pages * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+        except OSError:
+            # Peak rather than current RSS (KiB on Linux)
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    
+    def cpu_percent(self) -> float:
+        """CPU used since the previous call, as a percentage of one core"""
+        cpu, wall = self._cpu_seconds(), time.monotonic()
+        share = (cpu - self._cpu) / max(wall - self._wall, 1e-9)
+        self._cpu, self._wall = cpu, wall
+        return share * 100
+
+
+class StandInSession:
+    """One simulated player: engine, board and key script, ticked like SnakeGameApp"""
+    
+    def __init__(self, index: int, render_mode: str, interval: float, stats: 'StepStats'):
+        self.engine = make_engine(20, seed=index)
+        self.board = RecordingBoard(render_mode=render_mode)
+        self.script = KeyScript(index, mean_gap=interval * 4)
+        self.interval = interval
+        self.stats = stats
+    
+    def press_due_key(self, now: float):
+        key = self.script.due(now)
+        if key is not None:
+            self.engine.change_direction(KEY_DIRECTIONS[key], now)
+    
+    def tick(self):
+        engine = self.engine
+        if not engine.update() and engine.game_state.is_game_over:
+            engine.reset_game()
+        self.board.update_display(engine.game_state)
+        
+        canvas = self.board.canvas
+        recorded = canvas.take()
+        if recorded:
+            self.stats.bytes += len(json.dumps(recorded, separators=(',', ':')))
+        for call in canvas.client.calls:
+            self.stats.bytes += len(call)
+        canvas.client.calls.clear()
+        self.stats.ticks += 1
+
+
+class StepStats:
+    """Measurements for one step of the ramp"""
+    
+    def __init__(self):
+        self.ticks = 0
+        self.missed_ticks = 0  # tick slots that passed without a tick
+        self.bytes = 0
+        self.lateness: List[float] = []
+
+
+async def _timer_loop(session: StandInSession, stop: asyncio.Event):
+    """Per-session loop with ui.timer's timing: callback, then sleep for the rest"""
+    previous = time.monotonic()
+    while not stop.is_set():
+        start = time.monotonic()
+        lateness = max(start - previous - session.interval, 0.0)
+        session.stats.lateness.append(lateness)
+        # ui.timer never skips, it drifts: count the slots the drift swallowed
+        session.stats.missed_ticks += int(lateness // session.interval)
+        previous = start
+        session.tick()
+        await asyncio.sleep(session.interval - (time.monotonic() - start))
+
+
+async def _input_loop(sessions: List[StandInSession], interval: float, stop: asyncio.Event):
+    """Deliver due key presses between ticks, as websocket events would arrive"""
+    while not stop.is_set():
+        now = time.monotonic()
+        for session in sessions:
+            session.press_due_key(now)
+        await asyncio.sleep(interval / 3)
+
+
+async def run_stand_in_step(count: int, architecture: str, render_mode: str,
+                            interval: float, duration: float) -> Dict[str, float]:
+    """Run ``count`` sessions for ``duration`` seconds and measure them"""
+    stats = StepStats()
+    sessions = [StandInSession(index, render_mode, interval, stats) for index in range(count)]
+    stop = asyncio.Event()
+    tasks = [asyncio.create_task(_input_loop(sessions, interval, stop))]
+    
+    scheduler = None
+    if architecture == 'timer':
+        tasks += [asyncio.create_task(_timer_loop(session, stop)) for session in sessions]
+    else:
+        scheduler = TickScheduler()
+        # The scheduler's own lateness, as /health reports it; every tick in a batch shares it
+        scheduler.batch_listeners.append(lambda size, _, lateness: stats.lateness.extend([lateness] * size))
+        for session in sessions:
+            scheduler.register(session, interval, session.tick)
+    
+    sampler = ProcessSampler()
+    await asyncio.sleep(duration)
+    cpu = sampler.cpu_percent()
+    stop.set()
+    if scheduler is not None:
+        await scheduler.stop()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    if scheduler is not None:
+        stats.missed_ticks = scheduler.stats.missed_ticks
+    
+    slots = stats.ticks + stats.missed_ticks
+    return {
+        'sessions': count,
+        'tick_rate': stats.ticks / slots if slots else 0.0,
+        'missed_ticks': stats.missed_ticks,
+        'jitter_p50_ms': percentile(stats.lateness, 0.5) * 1000,
+        'jitter_p99_ms': percentile(stats.lateness, 0.99) * 1000,
+        'jitter_max_ms': max(stats.lateness, default=0.0) * 1000,
+        'bytes_per_s': stats.bytes / duration,
+        'cpu_percent': cpu,
+        'rss_mb': sampler.rss_mb(),
+    }
+
+
+def _page_client(html: str) -> Dict[str, str]:
+    """Client id and game canvas keydown listener from a NiceGUI page"""
+    client_id = re.search(r"'client_id': '([^']+)'", html).group(1)
+    elements = json.loads(re.search(r'parseElements\(String\.raw`(.*?)`\)', html, re.S).group(1))
+    for element_id, element in elements.items():
+        for listener in element.get('events', []):
+            if listener['type'] == 'keydown':
+                return {'client_id': client_id, 'element_id': element_id,
+                        'listener_id': listener['listener_id']}
+    return {'client_id': client_id, 'element_id': '', 'listener_id': ''}
+
+
+async def _url_client(url: str, index: int, interval: float, stats: StepStats, stop: asyncio.Event):
+    """One real browser-like client: load the page, connect, press keys"""
+    import aiohttp
+    import socketio
+    
+    async with aiohttp.ClientSession() as http:
+        async with http.get(url) as response:
+            page = _page_client(await response.text())
+    
+    sio = socketio.AsyncClient(reconnection=False)
+    
+    @sio.on('*')
+    async def count_bytes(_event, data=None):
+        stats.bytes += len(json.dumps(data, separators=(',', ':')))
+    
+    await sio.connect(f"{url}?client_id={page['client_id']}",
+                      socketio_path='/_nicegui_ws/socket.io', transports=['websocket'])
+    await sio.emit('handshake', {'client_id': page['client_id'], 'tab_id': uuid.uuid4().hex})
+    script = KeyScript(index, mean_gap=interval * 4)
+    next_restart = time.monotonic() + interval * RESTART_TICKS
+    try:
+        while not stop.is_set():
+            now = time.monotonic()
+            key = script.due(now)
+            if now >= next_restart:
+                # The client cannot see game over; restart now and then to keep playing
+                key, next_restart = 'r', now + interval * RESTART_TICKS
+            if key is not None and page['listener_id']:
+                await sio.emit('event', {
+                    'id': int(page['element_id']),
+                    'client_id': page['client_id'],
+                    'listener_id': page['listener_id'],
+                    'args': [json.dumps({'key': key})],
+                })
+            await asyncio.sleep(interval / 3)
+    finally:
+        await sio.disconnect()
+
+
+async def run_url_step(url: str, count: int, interval: float, duration: float,
+                       server_pid: Optional[int], clients: List[asyncio.Task],
+                       stats: StepStats, stop: asyncio.Event) -> Dict[str, float]:
+    """Add clients up to ``count`` and measure the server for ``duration`` seconds"""
+    import aiohttp
+    
+    while len(clients) < count:
+        clients.append(asyncio.create_task(_url_client(url, len(clients), interval, stats, stop)))
+    await asyncio.sleep(min(duration, 2.0))  # let new clients connect
+    
+    sampler = ProcessSampler(server_pid) if server_pid else None
+    stats.bytes = 0
+    await asyncio.sleep(duration)
+    
+    async with aiohttp.ClientSession() as http:
+        async with http.get(f'{url}/health') as response:
+            health = await response.json()
+    scheduler = health.get('scheduler', {})
+    failed = sum(1 for client in clients if client.done() and client.exception())
+    return {
+        'sessions': count,
+        'failed_clients': failed,
+        'batch_avg_ms': scheduler.get('avg_batch_ms', 0.0),
+        'lateness_max_ms': scheduler.get('max_lateness_ms', 0.0),
+        'input_latency_p95_ms': health.get('input_latency', {}).get('p95_ms', 0.0),
+        'bytes_per_s': stats.bytes / duration,
+        'cpu_percent': sampler.cpu_percent() if sampler else float('nan'),
+        'rss_mb': sampler.rss_mb() if sampler else float('nan'),
+    }
+
+
+async def ramp(args) -> List[Dict[str, float]]:
+    """Run every step of the ramp and print the capacity curve as it goes"""
+    interval = args.game_speed / 1000
+    curve = []
+    stats, stop, clients = StepStats(), asyncio.Event(), []
+    for count in args.sessions:
+        if args.url:
+            step = await run_url_step(args.url.rstrip('/'), count, interval, args.duration,
+                                      args.server_pid, clients, stats, stop)
+        else:
+            step = await run_stand_in_step(count, args.architecture, args.render_mode,
+                                           interval, args.duration)
+        curve.append(step)
+        print('  '.join(f'{key}={value:.4g}' if isinstance(value, float) else f'{key}={value}'
+                        for key, value in step.items()), flush=True)
+        
+        # Past capacity once ticks go missing, slip by half a period or the core is busy
+        if (step.get('tick_rate', 1.0) < 0.9 or step.get('jitter_p99_ms', 0.0) > interval * 500 or
+                step['cpu_percent'] > 90):
+            if not args.url:
+                print(f'Capacity reached below {count} sessions', flush=True)
+            if not args.keep_going:
+                break
+    
+    stop.set()
+    await asyncio.gather(*clients, return_exceptions=True)
+    return curve
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ramp up simulated players and record a capacity curve')
+    parser.add_argument('--sessions', type=int, nargs='+', default=[50, 100, 200, 400, 800, 1600],
+                        help='session counts to step through')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per step')
+    parser.add_argument('--architecture', choices=['timer', 'scheduler'], default='timer',
+                        help='stand-in tick driver: one ui.timer-style loop per session, or the shared scheduler')
+    parser.add_argument('--render-mode', choices=['full', 'dirty', 'client'], default='dirty')
+    parser.add_argument('--game-speed', type=int, default=150, help='milliseconds between moves')
+    parser.add_argument('--url', help='load a running server instead of the in-process stand-in')
+    parser.add_argument('--server-pid', type=int, help='server process to sample CPU and RSS from (URL mode)')
+    parser.add_argument('--keep-going', action='store_true', help='continue the ramp past capacity')
+    parser.add_argument('--output', help='write the capacity curve as JSON')
+    args = parser.parse_args()
+    
+    if args.url:
+        try:
+            import aiohttp  # noqa: F401
+        except ImportError:
+            sys.exit('URL mode needs aiohttp: pip install aiohttp')
+    
+    curve = asyncio.run(ramp(args))
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({'architecture': 'url' if args.url else args.architecture,
+                       'render_mode': args.render_mode,
+                       'game_speed': args.game_speed,
+                       'curve': curve}, output, indent=2)
+            output.write('\n')
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
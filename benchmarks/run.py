@@ -0,0 +1,121 @@
+"""
+Benchmark Runner
+Runs the benchmark suite, writes JSON results and compares them with a baseline
+    
+    python -m benchmarks.run                    # full run, compare with baseline.json
+    python -m benchmarks.run --quick            # fewer iterations, for a smoke check
+    python -m benchmarks.run --save-baseline    # record this run as the new baseline
+
+Exits with status 1 when any metric is worse than the baseline by more
+than the tolerance, or outside its absolute budget.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+from benchmarks import (bench_arena, bench_autopilot, bench_engine, bench_render, bench_rl_env,
+                        bench_router, bench_sessions, bench_snapshot, bench_startup)
+from benchmarks.common import Metric
+
+
+SUITES = {
+    'engine': bench_engine,
+    'render': bench_render,
+    'sessions': bench_sessions,
+    'arena': bench_arena,
+    'startup': bench_startup,
+    'snapshot': bench_snapshot,
+    'autopilot': bench_autopilot,
+    'rl_env': bench_rl_env,
+    'router': bench_router,
+}
+
+BASELINE = Path(__file__).parent / 'baseline.json'
+
+
+def run_suites(names: List[str], quick: bool) -> Dict[str, Metric]:
+    """Run the named suites and merge their results"""
+    results: Dict[str, Metric] = {}
+    for name in names:
+        start = time.perf_counter()
+        results.update(SUITES[name].run(quick=quick))
+        print(f"{name}: done in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    return results
+
+
+def compare(results: Dict[str, Metric], baseline: Dict[str, Metric], tolerance: float) -> List[str]:
+    """Print a comparison table; returns the names of regressed metrics"""
+    regressions = []
+    print(f"{'metric':<44} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, result in results.items():
+        value = result['value']
+        budget = result.get('budget')
+        if budget is not None and (value < budget if result['higher_is_better'] else value > budget):
+            regressions.append(name)
+            print(f"{name:<44} {'budget':>12} {value:>12.4g} {'OVER':>8}  (budget {budget:g})")
+            continue
+        
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"{name:<44} {'-':>12} {value:>12.4g} {'new':>8}")
+            continue
+        
+        base = reference['value']
+        change = (value - base) / base if base else 0.0
+        worse = -change if result['higher_is_better'] else change
+        flag = ''
+        if worse > tolerance:
+            regressions.append(name)
+            flag = '  REGRESSED'
+        print(f"{name:<44} {base:>12.4g} {value:>12.4g} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the Snake game benchmark suite')
+    parser.add_argument('suites', nargs='*', metavar='suite',
+                        help=f"suites to run: {', '.join(SUITES)} (default: all)")
+    parser.add_argument('--quick', action='store_true', help='fewer iterations')
+    parser.add_argument('--output', type=Path, help='write results as JSON')
+    parser.add_argument('--baseline', type=Path, default=BASELINE, help='baseline JSON to compare with')
+    parser.add_argument('--save-baseline', action='store_true', help='write results to the baseline file')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed relative slowdown before a metric counts as regressed')
+    args = parser.parse_args()
+    unknown = set(args.suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(sorted(unknown))}")
+    
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'quick': args.quick,
+        'results': run_suites(args.suites or list(SUITES), args.quick),
+    }
+    
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + '\n')
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + '\n')
+        print(f"Baseline written to {args.baseline}")
+        return
+    
+    baseline = {}
+    if args.baseline.exists():
+        stored = json.loads(args.baseline.read_text())
+        baseline = stored['results']
+        if stored.get('quick') != args.quick:
+            print("Note: comparing runs of different lengths; expect more noise", file=sys.stderr)
+    regressions = compare(report['results'], baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed by more than {args.tolerance:.0%} or exceeded their budget")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,199 @@
+"""
+Arena Engine
+Many snakes and many food items on one shared board
+"""
+
+import random
+import time
+from collections import deque
+from typing import Dict, Hashable, Iterator, List, Optional, Set, Tuple
+from models.game_state import Direction, DIRECTION_DELTAS, OPPOSITE_DIRECTIONS
+
+
+class ArenaFullError(Exception):
+    """Raised when no free spawn location can be found for a new snake"""
+
+
+class ArenaSnake:
+    """One player's snake in an arena, as packed cell ids (head first)"""
+    
+    __slots__ = ('player_id', 'cells', 'direction', 'next_direction', 'score', 'moves', 'alive')
+    
+    def __init__(self, player_id: Hashable, cells: List[int], direction: Direction):
+        self.player_id = player_id
+        self.cells: deque = deque(cells)
+        self.direction = direction  # direction of the last move made
+        self.next_direction = direction
+        self.score = 0
+        self.moves = 0
+        self.alive = True
+    
+    def __len__(self) -> int:
+        return len(self.cells)
+    
+    @property
+    def head(self) -> int:
+        """Cell id of the snake head"""
+        return self.cells[0]
+
+
+class ArenaEngine:
+    """Simultaneous-move snake arena
+    
+    Every snake follows SnakeGameEngine.update() rules, with all snakes
+    moving at once: a new head that leaves the board or lands on any body
+    cell as it was before the tick (tails included) dies, and snakes whose
+    heads land on the same cell all die. Eating scores 10 and grows the
+    snake by one; eaten food is replaced so ``food_count`` items stay on
+    the board.
+    
+    All snakes share one bytearray occupancy grid, so a tick costs
+    O(live snakes) plus O(length) for each snake that dies, independent of
+    how many other snakes are on the board.
+    """
+    
+    # Length of a newly spawned snake
+    SPAWN_LENGTH = 3
+    
+    # Random tries when looking for a spawn location or a food cell
+    MAX_TRIES = 64
+    
+    def __init__(self, board_size: int = 100, food_count: int = 50, seed: Optional[int] = None):
+        self.board_size = board_size
+        self.food_count = food_count
+        self.rng = random.Random(seed)
+        self.grid = bytearray(board_size * board_size)
+        self.food: Set[int] = set()
+        self.snakes: Dict[Hashable, ArenaSnake] = {}
+        self.ticks = 0
+        self.last_tick_seconds = 0.0
+        self.max_tick_seconds = 0.0
+        self._replenish_food()
+    
+    def __len__(self) -> int:
+        return len(self.snakes)
+    
+    def __iter__(self) -> Iterator[ArenaSnake]:
+        return iter(self.snakes.values())
+    
+    def unpack(self, cell: int) -> Tuple[int, int]:
+        """Unpack a cell id into (x, y) board coordinates"""
+        y, x = divmod(cell, self.board_size)
+        return x, y
+    
+    def add_player(self, player_id: Hashable) -> ArenaSnake:
+        """Spawn a snake for a player, replacing any previous one"""
+        self.remove_player(player_id)
+        
+        size = self.board_size
+        length = self.SPAWN_LENGTH
+        directions = list(Direction)
+        for _ in range(self.MAX_TRIES):
+            direction = self.rng.choice(directions)
+            dx, dy = DIRECTION_DELTAS[direction]
+            # Leave room for the body behind the head and one free cell ahead
+            x = self.rng.randrange(size)
+            y = self.rng.randrange(size)
+            cells = [(x - i * dx, y - i * dy) for i in range(-1, length)]
+            if not all(0 <= cx < size and 0 <= cy < size for cx, cy in cells):
+                continue
+            cells = [cy * size + cx for cx, cy in cells]
+            if any(self.grid[cell] or cell in self.food for cell in cells):
+                continue
+            
+            snake = ArenaSnake(player_id, cells[1:], direction)
+            for cell in snake.cells:
+                self.grid[cell] = 1
+            self.snakes[player_id] = snake
+            return snake
+        
+        raise ArenaFullError("no free spawn location in the arena")
+    
+    def remove_player(self, player_id: Hashable):
+        """Remove a player's snake from the board"""
+        snake = self.snakes.pop(player_id, None)
+        if snake is not None and snake.alive:
+            self._clear(snake)
+    
+    def change_direction(self, player_id: Hashable, direction: Direction):
+        """Queue a player's direction for the next tick (no 180-degree turns)"""
+        snake = self.snakes.get(player_id)
+        if snake is None or not snake.alive:
+            return
+        
+        # Compare with the last move made, not the last key pressed
+        if direction != OPPOSITE_DIRECTIONS[snake.direction]:
+            snake.next_direction = direction
+    
+    def tick(self) -> List[ArenaSnake]:
+        """Move every live snake one cell; returns the snakes that died"""
+        start = time.perf_counter()
+        size = self.board_size
+        grid = self.grid
+        food = self.food
+        died: List[ArenaSnake] = []
+        moves: List[Tuple[ArenaSnake, int]] = []
+        heads: Dict[int, int] = {}
+        
+        # Collisions are checked against the board as it was before the tick
+        for snake in self.snakes.values():
+            if not snake.alive:
+                continue
+            direction = snake.next_direction
+            dx, dy = DIRECTION_DELTAS[direction]
+            y, x = divmod(snake.cells[0], size)
+            x += dx
+            y += dy
+            if x < 0 or x >= size or y < 0 or y >= size:
+                died.append(snake)
+                continue
+            cell = y * size + x
+            if grid[cell]:
+                died.append(snake)
+                continue
+            snake.direction = direction
+            moves.append((snake, cell))
+            heads[cell] = heads.get(cell, 0) + 1
+        
+        for snake, cell in moves:
+            # Head-to-head collisions kill every snake involved
+            if heads[cell] > 1:
+                died.append(snake)
+                continue
+            snake.cells.appendleft(cell)
+            grid[cell] = 1
+            snake.moves += 1
+            if cell in food:
+                food.discard(cell)
+                snake.score += 10
+            else:
+                grid[snake.cells.pop()] = 0
+        
+        for snake in died:
+            snake.alive = False
+            self._clear(snake)
+        
+        self._replenish_food()
+        
+        self.ticks += 1
+        self.last_tick_seconds = time.perf_counter() - start
+        self.max_tick_seconds = max(self.max_tick_seconds, self.last_tick_seconds)
+        return died
+    
+    def _clear(self, snake: ArenaSnake):
+        """Free the cells covered by a snake"""
+        for cell in snake.cells:
+            self.grid[cell] = 0
+    
+    def _replenish_food(self):
+        """Top the board back up to ``food_count`` food items"""
+        cell_count = self.board_size * self.board_size
+        while len(self.food) < self.food_count:
+            for _ in range(self.MAX_TRIES):
+                cell = self.rng.randrange(cell_count)
+                if not self.grid[cell] and cell not in self.food:
+                    self.food.add(cell)
+                    break
+            else:
+                # Board too crowded for more food this tick
+                return
\ No newline at end of file
@@ -0,0 +1,260 @@
+"""
+Autopilot
+Computer player steering a SnakeGameEngine, for demo mode and server-side bots
+"""
+
+from array import array
+from collections import deque
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple
+from models.game_state import Direction
+from core.game_engine import SnakeGameEngine
+
+
+# Distance of cells the target cannot be reached from
+UNREACHABLE = 1 << 30
+
+Neighbours = Tuple[Tuple[int, Direction], ...]
+
+
+@lru_cache(maxsize=8)
+def neighbour_table(size: int) -> List[Neighbours]:
+    """(cell, direction) of the in-board neighbours of every cell, shared by all boards of a size"""
+    table = []
+    for cell in range(size * size):
+        table.append(_neighbours(cell, size))
+    return table
+
+
+@lru_cache(maxsize=8)
+def _cell_table(size: int) -> List[Tuple[int, ...]]:
+    """Neighbour cells only, for flood fills"""
+    return [tuple(cell for cell, _ in neighbours) for neighbours in neighbour_table(size)]
+
+
+def _neighbours(cell: int, size: int) -> Neighbours:
+    y, x = divmod(cell, size)
+    neighbours = []
+    if y > 0:
+        neighbours.append((cell - size, Direction.UP))
+    if y < size - 1:
+        neighbours.append((cell + size, Direction.DOWN))
+    if x > 0:
+        neighbours.append((cell - 1, Direction.LEFT))
+    if x < size - 1:
+        neighbours.append((cell + 1, Direction.RIGHT))
+    return tuple(neighbours)
+
+
+class DistanceField:
+    """BFS distances from every free cell to a target cell
+    
+    build() runs one BFS from the target. After that the snake's moves are
+    applied incrementally: block() marks the new head cell, and unblock()
+    relaxes a freed tail cell from its neighbours and propagates the shorter
+    distances it opens up. Blocking does not raise the distances of cells
+    that used to route through the blocked cell, so values behind the snake
+    may be optimistic; callers rebuild when following the field stops
+    making progress.
+    """
+    
+    __slots__ = ('size', 'target', 'distances', 'neighbours', '_empty')
+    
+    def __init__(self, size: int):
+        self.size = size
+        self.target = -1
+        self._empty = array('i', [UNREACHABLE]) * (size * size)
+        self.distances = array('i', self._empty)
+        self.neighbours = neighbour_table(size)
+    
+    def build(self, target: int, blocked: Callable[[int], int]):
+        """Distances to ``target`` over the cells ``blocked`` reports free"""
+        distances = self.distances
+        distances[:] = self._empty
+        neighbours = self.neighbours
+        self.target = target
+        distances[target] = 0
+        frontier = [target]
+        distance = 0
+        while frontier:
+            distance += 1
+            reached = []
+            for cell in frontier:
+                for neighbour, _ in neighbours[cell]:
+                    if distances[neighbour] == UNREACHABLE and not blocked(neighbour):
+                        distances[neighbour] = distance
+                        reached.append(neighbour)
+            frontier = reached
+    
+    def block(self, cell: int):
+        """Mark a cell as occupied"""
+        self.distances[cell] = UNREACHABLE
+    
+    def unblock(self, cell: int, blocked: Callable[[int], int]):
+        """Mark a cell as free again and propagate the shorter paths through it"""
+        distances = self.distances
+        neighbours = self.neighbours
+        best = min(distances[neighbour] for neighbour, _ in neighbours[cell])
+        if best == UNREACHABLE:
+            return
+        distances[cell] = best + 1
+        pending = deque((cell,))
+        while pending:
+            current = pending.popleft()
+            distance = distances[current] + 1
+            for neighbour, _ in neighbours[current]:
+                if distances[neighbour] > distance and not blocked(neighbour):
+                    distances[neighbour] = distance
+                    pending.append(neighbour)
+
+
+class Autopilot:
+    """Chooses moves for one engine: shortest path to the food, never into a trap
+    
+    On dense boards moves follow a DistanceField from the food that is kept
+    up to date incrementally as the head and tail move; it is rebuilt only
+    when the food or game changes or when following it stops making
+    progress. On sparse (very large) boards, where a field would cost a
+    full board of memory, candidate moves are ranked by Manhattan distance
+    to the food instead.
+    
+    Every candidate move must keep the snake's tail reachable from the new
+    head (or leave at least as many free cells as the snake is long); when
+    no food-ward move is safe the snake chases its tail.
+    
+    Taking over an engine drops its queued player input, so each move is
+    applied on the very next tick instead of behind stale key presses.
+    """
+    
+    def __init__(self, engine: SnakeGameEngine):
+        self.engine = engine
+        engine.input_queue.clear()
+        self.rebuilds = 0
+        self._field: Optional[DistanceField] = None
+        self._game_id = ''
+        self._moves = -1
+        self._head = -1
+        self._tail = -1
+        self._expected = UNREACHABLE  # distance of the cell moved to, when it was chosen
+        self._built_at = 0  # move count at the last rebuild
+    
+    def step(self) -> bool:
+        """Choose a direction and advance the game one tick"""
+        self.engine.change_direction(self.next_direction())
+        return self.engine.update()
+    
+    def next_direction(self) -> Direction:
+        """Direction for the next tick; marks the game as autoplayed"""
+        self.engine.autoplayed = True
+        state = self.engine.game_state
+        body = state.body
+        size = state.board_size
+        blocked = body.grid.__getitem__ if body.grid is not None else body.__contains__
+        head = body.head
+        neighbours = neighbour_table(size)[head] if body.grid is not None else _neighbours(head, size)
+        moves = [(cell, direction) for cell, direction in neighbours if not blocked(cell)]
+        if not moves:
+            return state.direction
+        
+        if body.grid is not None:
+            distances = self._sync(blocked)
+            ranked = sorted(moves, key=lambda move: distances[move[0]])
+            best = distances[ranked[0][0]]
+            if (best >= self._expected if self._expected != UNREACHABLE
+                    else best == UNREACHABLE and state.moves - self._built_at >= size):
+                # No progress along the field, or the food has been cut off for
+                # a while: the field may be stale, rebuild it
+                distances = self._rebuild(blocked)
+                ranked = sorted(moves, key=lambda move: distances[move[0]])
+            reachable = [move for move in ranked if distances[move[0]] != UNREACHABLE]
+        else:
+            food_y, food_x = divmod(state.food_cell, size)
+            reachable = sorted(moves, key=lambda move: abs(move[0] // size - food_y) + abs(move[0] % size - food_x))
+            distances = None
+        
+        for cell, direction in reachable:
+            if self._is_safe(cell, blocked):
+                self._expected = distances[cell] if distances is not None else UNREACHABLE
+                return direction
+        
+        # No safe way to the food: follow the tail until one opens up
+        self._expected = UNREACHABLE
+        for cell, direction in moves:
+            if self._is_safe(cell, blocked):
+                return direction
+        return moves[0][1]
+    
+    def _sync(self, blocked: Callable[[int], int]) -> array:
+        """Bring the distance field up to date with the last tick"""
+        engine = self.engine
+        state = engine.game_state
+        body = state.body
+        if (self._field is None or engine.game_id != self._game_id or state.food_cell != self._field.target
+                or state.moves != self._moves + 1):
+            return self._rebuild(blocked)
+        
+        head, tail = body.head, body.tail
+        if head != self._head:
+            self._field.block(head)
+        if tail != self._tail and not blocked(self._tail):
+            self._field.unblock(self._tail, blocked)
+        self._head, self._tail = head, tail
+        self._moves = state.moves
+        return self._field.distances
+    
+    def _rebuild(self, blocked: Callable[[int], int]) -> array:
+        """Recompute the distance field from scratch"""
+        engine = self.engine
+        state = engine.game_state
+        if self._field is None or self._field.size != state.board_size:
+            self._field = DistanceField(state.board_size)
+        self._field.build(state.food_cell, blocked)
+        self.rebuilds += 1
+        self._game_id = engine.game_id
+        self._moves = self._built_at = state.moves
+        self._head, self._tail = state.body.head, state.body.tail
+        self._expected = UNREACHABLE
+        return self._field.distances
+    
+    def _is_safe(self, start: int, blocked: Callable[[int], int]) -> bool:
+        """Whether moving to ``start`` keeps the tail reachable
+        
+        Flood-fills from the new head, treating the tail cell (which moves
+        away on the same tick) as free; stops as soon as the tail is found or
+        more cells than the snake's length are reachable.
+        """
+        state = self.engine.game_state
+        body = state.body
+        size = state.board_size
+        tail = body.tail
+        budget = len(body)
+        pending = [start]
+        if body.grid is not None:
+            # Dense boards: one bytearray marks cells occupied or already visited
+            table = _cell_table(size)
+            marks = bytearray(body.grid)
+            marks[start] = 1
+            while pending:
+                for neighbour in table[pending.pop()]:
+                    if neighbour == tail:
+                        return True
+                    if not marks[neighbour]:
+                        marks[neighbour] = 1
+                        budget -= 1
+                        if budget < 0:
+                            return True
+                        pending.append(neighbour)
+            return False
+        
+        seen = {start}
+        while pending:
+            for neighbour, _ in _neighbours(pending.pop(), size):
+                if neighbour == tail:
+                    return True
+                if neighbour not in seen and not blocked(neighbour):
+                    seen.add(neighbour)
+                    budget -= 1
+                    if budget < 0:
+                        return True
+                    pending.append(neighbour)
+        return False
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""
+Batch Snake Environment
+Headless, NumPy-vectorized stepping of many games at once
+"""
+
+from typing import List, Optional
+import numpy as np
+
+
+# Direction indices follow models.game_state.Direction order
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+DIRECTION_DX = np.array([0, 0, -1, 1], dtype=np.int32)
+DIRECTION_DY = np.array([-1, 1, 0, 0], dtype=np.int32)
+OPPOSITE = np.array([DOWN, UP, RIGHT, LEFT], dtype=np.int8)
+
+# Action value meaning "keep the current direction"
+NO_ACTION = -1
+
+
+class BatchSnakeEnv:
+    """K independent snake games stored as NumPy arrays
+    
+    Every game follows SnakeGameEngine.update() rules: 180-degree turns are
+    ignored, hitting a wall or any body cell (tail included) ends the game,
+    food is worth 10 points and grows the snake by one, and filling the
+    board wins. Cells are packed as y * board_size + x. Bodies are ring
+    buffers of board_size**2 cells with head/tail pointers, so a step is a
+    fixed number of vectorized operations over all games; only games that
+    ate pay O(board_size**2) to pick a new food cell.
+    """
+    
+    def __init__(self, num_games: int, board_size: int = 20, seed: Optional[int] = None):
+        self.num_games = num_games
+        self.board_size = board_size
+        self.cell_count = board_size * board_size
+        self.rng = np.random.default_rng(seed)
+        
+        k, cells = num_games, self.cell_count
+        self.body = np.zeros((k, cells), dtype=np.int32)
+        self.occupancy = np.zeros((k, cells), dtype=np.uint8)
+        self.head_ptr = np.zeros(k, dtype=np.int32)
+        self.tail_ptr = np.zeros(k, dtype=np.int32)
+        self.head = np.zeros(k, dtype=np.int32)
+        self.length = np.zeros(k, dtype=np.int32)
+        self.food = np.full(k, -1, dtype=np.int32)
+        self.direction = np.full(k, RIGHT, dtype=np.int8)
+        self.score = np.zeros(k, dtype=np.int32)
+        self.steps = np.zeros(k, dtype=np.int32)
+        self.alive = np.zeros(k, dtype=bool)
+        self.won = np.zeros(k, dtype=bool)
+        
+        # Per-step outcomes, overwritten by every step()
+        self.ate = np.zeros(k, dtype=bool)
+        self.died = np.zeros(k, dtype=bool)
+        
+        self._rows = np.arange(k)
+        self.reset()
+    
+    def reset(self, mask: Optional[np.ndarray] = None):
+        """Reset all games, or only those selected by a boolean mask"""
+        games = self._rows if mask is None else np.flatnonzero(mask)
+        if games.size == 0:
+            return
+        
+        center = self.board_size // 2
+        start = center * self.board_size + np.array([center - 2, center - 1, center], dtype=np.int32)
+        self.occupancy[games] = 0
+        self.body[games, :3] = start
+        self.occupancy[games[:, None], start[None, :]] = 1
+        self.tail_ptr[games] = 0
+        self.head_ptr[games] = 2
+        self.head[games] = start[-1]
+        self.length[games] = 3
+        self.direction[games] = RIGHT
+        self.score[games] = 0
+        self.steps[games] = 0
+        self.alive[games] = True
+        self.won[games] = False
+        self._spawn_food(games)
+    
+    def step(self, actions: Optional[np.ndarray] = None) -> np.ndarray:
+        """Advance every live game by one tick
+        
+        ``actions`` holds one direction index per game (UP, DOWN, LEFT,
+        RIGHT, or NO_ACTION). Returns a boolean mask of the games that ended
+        on this step; finished games stay frozen until reset().
+        """
+        self.ate[:] = False
+        self.died[:] = False
+        games = np.flatnonzero(self.alive)
+        if games.size == 0:
+            return self.died.copy()
+        
+        # Direction changes, ignoring 180-degree turns
+        direction = self.direction[games]
+        if actions is not None:
+            wanted = np.asarray(actions)[games]
+            turn = (wanted >= 0) & (wanted != OPPOSITE[direction])
+            direction = np.where(turn, wanted, direction).astype(np.int8)
+            self.direction[games] = direction
+        
+        # New head position and wall collisions
+        size = self.board_size
+        head_y, head_x = np.divmod(self.head[games], size)
+        x = head_x + DIRECTION_DX[direction]
+        y = head_y + DIRECTION_DY[direction]
+        wall = (x < 0) | (x >= size) | (y < 0) | (y >= size)
+        cell = np.where(wall, 0, y * size + x)
+        
+        # Self collisions (tail included, as in update())
+        dead = wall | (self.occupancy[games, cell] == 1)
+        if dead.any():
+            dead_games = games[dead]
+            self.alive[dead_games] = False
+            self.died[dead_games] = True
+            games = games[~dead]
+            cell = cell[~dead]
+        
+        # Move: push the new head
+        cells = self.cell_count
+        head_ptr = (self.head_ptr[games] + 1) % cells
+        self.head_ptr[games] = head_ptr
+        self.body[games, head_ptr] = cell
+        self.occupancy[games, cell] = 1
+        self.head[games] = cell
+        self.steps[games] += 1
+        
+        # Eat, or drop the tail
+        eating = cell == self.food[games]
+        movers = games[~eating]
+        tail_ptr = self.tail_ptr[movers]
+        self.occupancy[movers, self.body[movers, tail_ptr]] = 0
+        self.tail_ptr[movers] = (tail_ptr + 1) % cells
+        
+        eaters = games[eating]
+        if eaters.size:
+            self.ate[eaters] = True
+            self.score[eaters] += 10
+            self.length[eaters] += 1
+            self._spawn_food(eaters)
+        
+        return self.died | (self.won & self.ate)
+    
+    def _spawn_food(self, games: np.ndarray):
+        """Place food on a uniformly random free cell for each given game"""
+        free_count = self.cell_count - self.length[games]
+        full = free_count == 0
+        if full.any():
+            # Snake covers the whole board
+            winners = games[full]
+            self.food[winners] = -1
+            self.won[winners] = True
+            self.alive[winners] = False
+            games = games[~full]
+            free_count = free_count[~full]
+            if games.size == 0:
+                return
+        
+        # Index of the j-th free cell in each row
+        pick = (self.rng.random(games.size) * free_count).astype(np.int32)
+        free_rank = np.cumsum(self.occupancy[games] == 0, axis=1)
+        self.food[games] = np.argmax(free_rank > pick[:, None], axis=1)
+    
+    def snake_cells(self, game: int) -> List[int]:
+        """Snake cells of one game, head first"""
+        length = int(self.length[game])
+        ptrs = (self.head_ptr[game] - np.arange(length)) % self.cell_count
+        return self.body[game, ptrs].tolist()
\ No newline at end of file
@@ -0,0 +1,176 @@
+"""
+Frame Deltas
+Tracks what changed on the board between two rendered frames
+"""
+
+from typing import List, Optional, Tuple
+from models.game_state import GameState
+
+
+class FrameDelta:
+    """Changes between two consecutive frames
+    
+    A full frame means the whole board must be redrawn. Otherwise at most
+    four cells changed: the new head, the previous head (now a body
+    segment), the removed tail cell and the new food cell; -1 marks a cell
+    that did not change.
+    """
+    
+    __slots__ = ('full', 'head', 'neck', 'removed_tail', 'food', 'score')
+    
+    def __init__(self, full: bool, head: int = -1, neck: int = -1,
+                 removed_tail: int = -1, food: int = -1, score: int = 0):
+        self.full = full
+        self.head = head
+        self.neck = neck
+        self.removed_tail = removed_tail
+        self.food = food
+        self.score = score
+
+
+class FrameTracker:
+    """Remembers the last rendered frame and diffs new states against it in O(1)"""
+    
+    __slots__ = ('_head', '_tail', '_length', '_food', '_moves', '_flags', '_board_size')
+    
+    def __init__(self):
+        self.invalidate()
+    
+    def invalidate(self):
+        """Forget the last frame so the next diff is a full frame"""
+        self._head = -1
+        self._tail = -1
+        self._length = 0
+        self._food = -1
+        self._moves = -1
+        self._flags = None
+        self._board_size = 0
+    
+    def diff(self, state: GameState) -> Optional[FrameDelta]:
+        """Diff a state against the last frame and remember it
+        
+        Returns None when nothing visible changed.
+        """
+        cells = state.body.cells
+        head = cells[0] if cells else -1
+        tail = cells[-1] if cells else -1
+        length = len(cells)
+        flags = (state.is_game_over, state.is_paused, state.is_won)
+        
+        delta = None
+        if flags != self._flags or state.board_size != self._board_size:
+            delta = FrameDelta(True, score=state.score)
+        elif state.moves == self._moves + 1 and length >= 2 and cells[1] == self._head:
+            grew = length == self._length + 1
+            if grew or length == self._length:
+                delta = FrameDelta(
+                    False,
+                    head=head,
+                    neck=self._head,
+                    removed_tail=-1 if grew else self._tail,
+                    food=state.food_cell if state.food_cell != self._food else -1,
+                    score=state.score
+                )
+            else:
+                delta = FrameDelta(True, score=state.score)
+        elif (state.moves != self._moves or head != self._head or
+              length != self._length or state.food_cell != self._food):
+            delta = FrameDelta(True, score=state.score)
+        
+        self._head = head
+        self._tail = tail
+        self._length = length
+        self._food = state.food_cell
+        self._moves = state.moves
+        self._flags = flags
+        self._board_size = state.board_size
+        return delta
+
+
+class Viewport:
+    """Square window of ``size`` cells that follows the snake head
+    
+    The window re-centers on the head when it comes within a quarter of the
+    window of an edge, clamped to the board, so it moves in occasional
+    jumps rather than on every tick.
+    """
+    
+    __slots__ = ('size', 'origin_x', 'origin_y')
+    
+    def __init__(self, size: int):
+        self.size = size
+        self.origin_x = 0
+        self.origin_y = 0
+    
+    @property
+    def bounds(self) -> Tuple[int, int, int]:
+        """(origin_x, origin_y, size), as taken by encode_keyframe"""
+        return self.origin_x, self.origin_y, self.size
+    
+    def follow(self, state: GameState) -> bool:
+        """Re-center on the head if it is near an edge; True if the window moved"""
+        board_size = state.board_size
+        view = self.size
+        if view >= board_size or not state.body.cells:
+            return False
+        
+        head_x, head_y = state.body.unpack(state.body.head)
+        margin = view // 4
+        origin_x, origin_y = self.origin_x, self.origin_y
+        if not origin_x + margin <= head_x < origin_x + view - margin:
+            origin_x = min(max(head_x - view // 2, 0), board_size - view)
+        if not origin_y + margin <= head_y < origin_y + view - margin:
+            origin_y = min(max(head_y - view // 2, 0), board_size - view)
+        
+        moved = (origin_x, origin_y) != (self.origin_x, self.origin_y)
+        self.origin_x, self.origin_y = origin_x, origin_y
+        return moved
+    
+    def to_view(self, cell_x: int, cell_y: int) -> Optional[Tuple[int, int]]:
+        """Board cell to window cell coordinates, or None when outside the window"""
+        x = cell_x - self.origin_x
+        y = cell_y - self.origin_y
+        if 0 <= x < self.size and 0 <= y < self.size:
+            return x, y
+        return None
+
+
+# Compact frame message kinds
+KEYFRAME = 0
+DELTA = 1
+
+# Keyframe flag bits
+FLAG_GAME_OVER = 1
+FLAG_PAUSED = 2
+FLAG_WON = 4
+
+
+def state_flags(state: GameState) -> int:
+    """Pack the overlay-relevant state flags into an int"""
+    return ((FLAG_GAME_OVER if state.is_game_over else 0) |
+            (FLAG_PAUSED if state.is_paused else 0) |
+            (FLAG_WON if state.is_won else 0))
+
+
+def encode_keyframe(state: GameState, viewport: Optional[Tuple[int, int, int]] = None) -> List[int]:
+    """Encode the whole board
+    
+    Layout: [KEYFRAME, board_size, flags, score, food, origin_x, origin_y,
+    view_size, *snake cells]; the viewport defaults to the whole board.
+    """
+    origin_x, origin_y, view_size = viewport or (0, 0, state.board_size)
+    return [KEYFRAME, state.board_size, state_flags(state), state.score, state.food_cell,
+            origin_x, origin_y, view_size, *state.body.cells]
+
+
+def encode_delta(delta: FrameDelta) -> List[int]:
+    """Encode a cell delta: [DELTA, head, neck, removed_tail, food, score]"""
+    return [DELTA, delta.head, delta.neck, delta.removed_tail, delta.food, delta.score]
+
+
+def encode_frame(delta: FrameDelta, state: GameState,
+                 viewport: Optional[Tuple[int, int, int]] = None) -> List[int]:
+    """Encode a frame as a short int array for a client-side renderer"""
+    if delta.full:
+        return encode_keyframe(state, viewport)
+    return encode_delta(delta)
\ No newline at end of file
@@ -4,52 +4,102 @@ Core game logic and mechanics
 """
 
 import random
+import secrets
+import uuid
+from collections import deque
 from typing import Optional, Tuple
-from models.game_state import GameState, Position, Direction, HighScores
-from app.config import settings
+from models.game_state import GameState, Direction, HighScores, DIRECTION_DELTAS, OPPOSITE_DIRECTIONS
+from core.score_store import NullScoreStore, ScoreStore
+from core.replay import Replay, ReplayArchive
+
+
+# Boards wider than this use hashed occupancy, unless the engine is given
+# ``sparse`` or its own ``sparse_threshold``
+SPARSE_BOARD_THRESHOLD = 100
 
 
 class SnakeGameEngine:
-    """Snake game logic engine"""
+    """Snake game logic engine
+    
+    Every game is deterministic given its RNG seed and the direction moved on
+    each tick; both are recorded in ``replay`` so the game can be re-simulated.
+    
+    The engine reads no application settings: the UI passes board size,
+    occupancy mode, score store and replay archive explicitly, so headless
+    users import it without loading configuration. By default scores are
+    discarded and replays are not archived, and nothing is written to disk.
     
-    def __init__(self):
-        self.game_state = GameState(board_size=settings.board_size)
-        self.high_scores = HighScores.load_from_file(settings.high_score_file)
+    Direction changes are queued and applied one per tick, so quick presses
+    between two ticks are all kept; each is checked against the direction
+    the previous queued press (or the last move) leaves the snake in.
+    """
+    
+    # Direction changes kept for upcoming ticks
+    INPUT_QUEUE_SIZE = 3
+    
+    def __init__(self, score_store: Optional[ScoreStore] = None,
+                 board_size: int = 20,
+                 seed: Optional[int] = None,
+                 replay_archive: Optional[ReplayArchive] = None,
+                 sparse: Optional[bool] = None,
+                 sparse_threshold: int = SPARSE_BOARD_THRESHOLD):
+        if sparse is None:
+            sparse = board_size > sparse_threshold
+        self.game_state = GameState(board_size=board_size, sparse=sparse)
+        self.score_store = score_store if score_store is not None else NullScoreStore()
+        self.replay_archive = replay_archive
+        self.rng = random.Random()
+        self.game_id = ''
+        self.replay: Optional[Replay] = None
+        self.input_queue: deque = deque()
+        self.applied_input_time: Optional[float] = None  # timestamp of the input the last update applied
+        self.autoplayed = False  # the autopilot moved in this game; its score is not recorded
+        self._next_seed = seed
         self.reset_game()
     
-    def reset_game(self):
+    def reset_game(self, seed: Optional[int] = None):
         """Reset the game to initial state"""
+        if seed is None:
+            seed = self._next_seed if self._next_seed is not None else secrets.randbits(64)
+        self._next_seed = None
+        self.rng.seed(seed)
+        self.game_id = uuid.uuid4().hex
+        self.replay = Replay(self.game_state.board_size, seed)
+        self.input_queue.clear()
+        self.applied_input_time = None
+        self.autoplayed = False
         self.game_state.reset()
         self._spawn_food()
     
     def _spawn_food(self):
-        """Spawn food at a random empty position"""
-        while True:
-            food_pos = Position(
-                x=random.randint(0, self.game_state.board_size - 1),
-                y=random.randint(0, self.game_state.board_size - 1)
-            )
-            
-            # Ensure food doesn't spawn on snake
-            if food_pos not in self.game_state.snake:
-                self.game_state.food = food_pos
-                break
+        """Spawn food on a random empty cell, or win when none is left"""
+        cell = self.game_state.body.free.choice(self.rng)
+        if cell is None:
+            # Snake covers the whole board
+            self.game_state.food_cell = -1
+            self.game_state.is_won = True
+            self._game_over()
+            return
+        
+        self.game_state.food_cell = cell
     
-    def change_direction(self, new_direction: Direction):
-        """Change snake direction (prevent 180-degree turns)"""
+    def change_direction(self, new_direction: Direction, timestamp: Optional[float] = None):
+        """Queue a direction change for an upcoming tick (prevent 180-degree turns)
+        
+        ``timestamp`` is when the input arrived; it is handed back in
+        ``applied_input_time`` on the tick that applies it.
+        """
         if self.game_state.is_game_over or self.game_state.is_paused:
             return
         
-        # Prevent reverse direction
-        opposite_directions = {
-            Direction.UP: Direction.DOWN,
-            Direction.DOWN: Direction.UP,
-            Direction.LEFT: Direction.RIGHT,
-            Direction.RIGHT: Direction.LEFT
-        }
+        queue = self.input_queue
+        current = queue[-1][0] if queue else self.game_state.direction
         
-        if new_direction != opposite_directions.get(self.game_state.direction):
-            self.game_state.direction = new_direction
+        # Drop repeats, reverse turns and input beyond the queue size
+        if new_direction == current or new_direction == OPPOSITE_DIRECTIONS[current]:
+            return
+        if len(queue) < self.INPUT_QUEUE_SIZE:
+            queue.append((new_direction, timestamp))
     
     def toggle_pause(self):
         """Toggle game pause state"""
@@ -58,57 +108,65 @@ class SnakeGameEngine:
     
     def update(self) -> bool:
         """Update game state - returns True if game continues"""
+        self.applied_input_time = None
         if self.game_state.is_game_over or self.game_state.is_paused:
             return False
         
+        state = self.game_state
+        body = state.body
+        size = state.board_size
+        
+        # Apply the next queued direction change, if any
+        if self.input_queue:
+            state.direction, self.applied_input_time = self.input_queue.popleft()
+        self.replay.record(state.direction)
+        
         # Calculate new head position
-        head = self.game_state.snake[0]
-        new_head = self._get_next_position(head, self.game_state.direction)
+        dx, dy = DIRECTION_DELTAS[state.direction]
+        head_y, head_x = divmod(body.head, size)
+        x = head_x + dx
+        y = head_y + dy
         
         # Check wall collision
-        if (new_head.x < 0 or new_head.x >= self.game_state.board_size or
-            new_head.y < 0 or new_head.y >= self.game_state.board_size):
+        if x < 0 or x >= size or y < 0 or y >= size:
             self._game_over()
             return False
         
-        # Check self collision
-        if new_head in self.game_state.snake:
+        # Check self collision (O(1) occupancy lookup, tail included)
+        new_head = y * size + x
+        if new_head in body:
             self._game_over()
             return False
         
         # Move snake
-        self.game_state.snake.insert(0, new_head)
+        body.push_head(new_head)
+        state.moves += 1
         
         # Check food collision
-        if new_head == self.game_state.food:
-            self.game_state.score += 10
+        if new_head == state.food_cell:
+            state.score += 10
             self._spawn_food()
+            if state.is_won:
+                return False
         else:
             # Remove tail if no food eaten
-            self.game_state.snake.pop()
+            body.pop_tail()
         
         return True
     
-    def _get_next_position(self, current: Position, direction: Direction) -> Position:
-        """Calculate next position based on direction"""
-        direction_map = {
-            Direction.UP: (0, -1),
-            Direction.DOWN: (0, 1),
-            Direction.LEFT: (-1, 0),
-            Direction.RIGHT: (1, 0)
-        }
-        
-        dx, dy = direction_map[direction]
-        return Position(x=current.x + dx, y=current.y + dy)
-    
     def _game_over(self):
         """Handle game over"""
         self.game_state.is_game_over = True
         
-        # Check if it's a high score
-        if self.game_state.score > 0:
-            self.high_scores.add_score(self.game_state.score)
-            self.high_scores.save_to_file(settings.high_score_file)
+        # Check if it's a high score, linking it to the replay when one is kept;
+        # games the autopilot played any part of stay off the leaderboard
+        if self.game_state.score > 0 and not self.autoplayed:
+            game_id = self.game_id if self.replay_archive is not None else None
+            self.score_store.add_score(self.game_state.score, game_id=game_id)
+        
+        # Keep the replay for auditing and spectating
+        if self.replay_archive is not None:
+            self.replay_archive.save(self.game_id, self.replay)
     
     def get_game_state(self) -> GameState:
         """Get current game state"""
@@ -116,8 +174,8 @@ class SnakeGameEngine:
     
     def get_high_score(self) -> int:
         """Get the current high score"""
-        return self.high_scores.get_high_score()
+        return self.score_store.get_high_score()
     
     def get_high_scores(self) -> HighScores:
         """Get all high scores"""
-        return self.high_scores
\ No newline at end of file
+        return self.score_store.get_high_scores()
\ No newline at end of file
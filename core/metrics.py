@@ -0,0 +1,176 @@
+"""
+Metrics
+Low-overhead counters, gauges and histograms with Prometheus text output
+"""
+
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+
+# Bucket upper bounds for durations in seconds, from 10 µs to 1 s
+TIME_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001,
+                0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Bucket upper bounds for small counts, such as draw primitives per frame
+COUNT_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048)
+
+GaugeValue = Union[float, Dict[str, float]]
+
+
+class Counter:
+    """Monotonically increasing count"""
+    
+    __slots__ = ('name', 'help', 'value')
+    
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.help = description
+        self.value = 0
+    
+    def inc(self, amount: float = 1):
+        """Add to the count"""
+        self.value += amount
+    
+    def render(self) -> List[str]:
+        return [f'{self.name}_total {_format(self.value)}']
+
+
+class Gauge:
+    """Value that goes up and down, set directly or read from a function at scrape time
+    
+    A function may return a dict of label value -> value, rendered with the
+    gauge's ``label`` name, e.g. sessions by state.
+    """
+    
+    __slots__ = ('name', 'help', 'value', 'function', 'label')
+    
+    def __init__(self, name: str, description: str,
+                 function: Optional[Callable[[], GaugeValue]] = None, label: str = ''):
+        self.name = name
+        self.help = description
+        self.value = 0.0
+        self.function = function
+        self.label = label
+    
+    def set(self, value: float):
+        """Set the current value"""
+        self.value = value
+    
+    def render(self) -> List[str]:
+        value = self.function() if self.function else self.value
+        if isinstance(value, dict):
+            return [f'{self.name}{{{self.label}="{key}"}} {_format(item)}' for key, item in value.items()]
+        return [f'{self.name} {_format(value)}']
+
+
+class Histogram:
+    """Distribution of observed values over fixed buckets
+    
+    observe() is a binary search and three additions; buckets are made
+    cumulative only when rendered.
+    """
+    
+    __slots__ = ('name', 'help', 'bounds', 'counts', 'sum', 'count')
+    
+    def __init__(self, name: str, description: str, buckets: Sequence[float] = TIME_BUCKETS):
+        self.name = name
+        self.help = description
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float):
+        """Record one value"""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+    
+    def render(self) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{_format(bound)}"}} {cumulative}')
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {self.count}')
+        lines.append(f'{self.name}_sum {_format(self.sum)}')
+        lines.append(f'{self.name}_count {self.count}')
+        return lines
+
+
+_TYPES = {Counter: 'counter', Gauge: 'gauge', Histogram: 'histogram'}
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in the Prometheus text format"""
+    
+    def __init__(self):
+        self._metrics: Dict[str, Union[Counter, Gauge, Histogram]] = {}
+    
+    def _register(self, metric):
+        # Re-registering a name returns the existing metric
+        return self._metrics.setdefault(metric.name, metric)
+    
+    def counter(self, name: str, description: str) -> Counter:
+        """Get or create a counter"""
+        return self._register(Counter(name, description))
+    
+    def gauge(self, name: str, description: str,
+              function: Optional[Callable[[], GaugeValue]] = None, label: str = '') -> Gauge:
+        """Get or create a gauge"""
+        return self._register(Gauge(name, description, function, label))
+    
+    def histogram(self, name: str, description: str, buckets: Sequence[float] = TIME_BUCKETS) -> Histogram:
+        """Get or create a histogram"""
+        return self._register(Histogram(name, description, buckets))
+    
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {_TYPES[type(metric)]}')
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+def merge_metrics(texts: Dict[str, str], label: str = 'worker') -> str:
+    """Combine several processes' metrics, tagging every sample with its source
+    
+    Samples of one metric stay together under a single HELP/TYPE header, as
+    the text format requires.
+    """
+    headers: Dict[str, List[str]] = {}
+    samples: Dict[str, List[str]] = {}
+    for source, text in texts.items():
+        family = ''
+        for line in text.splitlines():
+            if line.startswith('# '):
+                family = line.split(' ', 3)[2]
+                headers.setdefault(family, [])
+                if line not in headers[family]:
+                    headers[family].append(line)
+            elif line:
+                name, _, rest = line.partition(' ')
+                if '{' in name:
+                    name = name.replace('{', f'{{{label}="{source}",', 1)
+                else:
+                    name = f'{name}{{{label}="{source}"}}'
+                samples.setdefault(family, []).append(f'{name} {rest}')
+    
+    lines = []
+    for family, header in headers.items():
+        lines.extend(header)
+        lines.extend(samples.get(family, []))
+    return '\n'.join(lines) + '\n'
+
+
+def _format(value: float) -> str:
+    """Format a sample value the way Prometheus clients do"""
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+# Process-wide registry served at /metrics
+registry = MetricsRegistry()
\ No newline at end of file
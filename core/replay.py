@@ -0,0 +1,186 @@
+"""
+Game Replays
+Compact deterministic input logs and a headless replay engine
+"""
+
+import os
+import queue
+import struct
+import threading
+from typing import Iterable, Iterator, List, Optional, Tuple
+from models.game_state import Direction, GameState
+
+
+# One input byte per tick: the direction the snake moved in
+DIRECTIONS: List[Direction] = list(Direction)
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+# File header: magic, format version, board size, RNG seed
+REPLAY_MAGIC = b'SNKR'
+REPLAY_VERSION = 1
+_HEADER = struct.Struct('<4sBHQ')
+
+
+class ReplayError(ValueError):
+    """Raised for malformed replay data"""
+
+
+class Replay:
+    """RNG seed plus one direction byte per tick of a single game"""
+    
+    __slots__ = ('board_size', 'seed', 'inputs')
+    
+    def __init__(self, board_size: int, seed: int, inputs: Iterable[int] = ()):
+        self.board_size = board_size
+        self.seed = seed
+        self.inputs = bytearray(inputs)
+    
+    def __len__(self) -> int:
+        return len(self.inputs)
+    
+    def record(self, direction: Direction):
+        """Append the direction moved on one tick"""
+        self.inputs.append(DIRECTION_CODES[direction])
+    
+    def header(self) -> bytes:
+        """Binary file header"""
+        return _HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.board_size, self.seed)
+    
+    def to_bytes(self) -> bytes:
+        """Serialize as header followed by the input bytes"""
+        return self.header() + bytes(self.inputs)
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Replay':
+        """Parse a serialized replay"""
+        if len(data) < _HEADER.size:
+            raise ReplayError("replay is shorter than its header")
+        magic, version, board_size, seed = _HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC:
+            raise ReplayError("not a replay file")
+        if version != REPLAY_VERSION:
+            raise ReplayError(f"unsupported replay version {version}")
+        inputs = data[_HEADER.size:]
+        if any(code >= len(DIRECTIONS) for code in set(inputs)):
+            raise ReplayError("invalid direction code in replay")
+        return cls(board_size, seed, inputs)
+    
+    @classmethod
+    def load(cls, path: str) -> 'Replay':
+        """Read a replay file"""
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayArchive:
+    """Writes finished games' replays to ``<directory>/<game_id>.snkr`` in the background"""
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._queue: 'queue.Queue' = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name='replay-writer', daemon=True)
+        self._writer.start()
+    
+    def path(self, game_id: str) -> str:
+        """File path of a game's replay"""
+        return os.path.join(self.directory, f'{game_id}.snkr')
+    
+    def save(self, game_id: str, replay: Replay):
+        """Queue a replay for writing"""
+        self._queue.put((game_id, replay.to_bytes()))
+    
+    def flush(self):
+        """Block until every queued replay has been written"""
+        self._queue.join()
+    
+    def _write_loop(self):
+        """Writer thread: append each queued replay to its file"""
+        while True:
+            game_id, data = self._queue.get()
+            try:
+                with open(self.path(game_id), 'ab') as f:
+                    f.write(data)
+            except OSError as e:
+                print(f"Error saving replay: {e}")
+            finally:
+                self._queue.task_done()
+
+
+class ReplayEngine:
+    """Re-simulates replays headlessly with the SnakeGameEngine rules, at full speed
+    
+    ``sparse_threshold`` must match the one the games were played with, since
+    sparse boards place food differently.
+    """
+    
+    def __init__(self, sparse_threshold: Optional[int] = None):
+        # Imported here so that reading replay files does not pull in the engine
+        from core.game_engine import SnakeGameEngine, SPARSE_BOARD_THRESHOLD
+        from core.score_store import NullScoreStore
+        self._engine_class = SnakeGameEngine
+        self._scores = NullScoreStore()
+        self.sparse_threshold = SPARSE_BOARD_THRESHOLD if sparse_threshold is None else sparse_threshold
+    
+    def _engine(self, replay: Replay):
+        return self._engine_class(
+            score_store=self._scores,
+            board_size=replay.board_size,
+            seed=replay.seed,
+            replay_archive=None,
+            sparse_threshold=self.sparse_threshold
+        )
+    
+    def stream(self, replay: Replay) -> Iterator[GameState]:
+        """Yield the game state after every tick, e.g. for spectating"""
+        engine = self._engine(replay)
+        state = engine.game_state
+        yield state
+        for code in replay.inputs:
+            if state.is_game_over:
+                return
+            engine.change_direction(DIRECTIONS[code])
+            engine.update()
+            yield state
+    
+    def simulate(self, replay: Replay) -> Tuple[GameState, int]:
+        """Play a replay to the end; returns the final state and the ticks consumed"""
+        engine = self._engine(replay)
+        state = engine.game_state
+        change_direction = engine.change_direction
+        update = engine.update
+        ticks = 0
+        for code in replay.inputs:
+            if state.is_game_over:
+                break
+            direction = DIRECTIONS[code]
+            if direction is not state.direction:
+                change_direction(direction)
+            update()
+            ticks += 1
+        return state, ticks
+    
+    def verify(self, replay: Replay, claimed_score: int) -> bool:
+        """True if the replay is a complete game that scores ``claimed_score``"""
+        state, ticks = self.simulate(replay)
+        return state.is_game_over and ticks == len(replay.inputs) and state.score == claimed_score
+    
+    def verify_many(self, submissions: Iterable[Tuple[Replay, int]]) -> List[bool]:
+        """Verify many (replay, claimed score) pairs"""
+        return [self.verify(replay, score) for replay, score in submissions]
+
+
+_archive: Optional[ReplayArchive] = None
+_archive_lock = threading.Lock()
+
+
+def get_replay_archive() -> Optional[ReplayArchive]:
+    """The process-wide replay archive, or None when replay saving is disabled"""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            from app.config import settings
+            if not settings.replay_dir:
+                return None
+            _archive = ReplayArchive(settings.replay_dir)
+        return _archive
\ No newline at end of file
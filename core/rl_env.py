@@ -0,0 +1,210 @@
+"""
+Reinforcement-Learning Environment
+Gym-style batched environment over BatchSnakeEnv with preallocated observations
+"""
+
+from typing import Dict, Optional, Tuple
+import numpy as np
+from core.batch_env import BatchSnakeEnv, DIRECTION_DX, DIRECTION_DY
+
+
+# Observation layouts
+PLANES = 'planes'
+FEATURES = 'features'
+
+# Board planes: snake body (head included), head, food
+BODY_PLANE, HEAD_PLANE, FOOD_PLANE = 0, 1, 2
+PLANE_COUNT = 3
+
+# Feature vector: danger in each direction, current direction one-hot,
+# food offset from the head (divided by board size), snake length / cells
+FEATURE_COUNT = 11
+
+# Actions are absolute directions: UP, DOWN, LEFT, RIGHT
+ACTION_COUNT = 4
+
+Step = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict[str, np.ndarray]]
+
+
+class SnakeVecEnv:
+    """Many games behind a Gym-style reset()/step() API, for training agents
+    
+    Games follow SnakeGameEngine.update() rules via BatchSnakeEnv. The
+    observation, reward and done arrays are allocated once and overwritten
+    by every call, so callers must copy anything they keep (a replay
+    buffer usually copies anyway). Observations are either board planes,
+    shape (num_games, 3, size, size), or feature vectors, shape
+    (num_games, 11). Planes are updated incrementally: each step only
+    touches the cells of the old tail, the new head and the food.
+    
+    Episodes end when the snake dies or fills the board (terminated), or
+    after ``max_idle_steps`` steps without food (truncated; defaults to the
+    number of cells, 0 disables). With ``auto_reset`` finished games are
+    reset within the same step: the returned observation is the first one
+    of the new episode, and info['final_observation'], info['final_score']
+    and info['final_steps'] hold the last state of the finished one for the
+    rows that are done. Without it, finished games (truncated ones
+    included) stay frozen until reset(mask=...), and each is reported done
+    only on the step it finished.
+    
+    No Gym dependency: the API mirrors gymnasium's vector environments
+    (``obs, reward, terminated, truncated, info``) closely enough to wrap.
+    """
+    
+    def __init__(self, num_games: int, board_size: int = 20, observation: str = PLANES,
+                 seed: Optional[int] = None, auto_reset: bool = True,
+                 max_idle_steps: Optional[int] = None, dtype=np.float32,
+                 reward_food: float = 1.0, reward_death: float = -1.0, reward_step: float = 0.0):
+        if observation not in (PLANES, FEATURES):
+            raise ValueError(f"observation must be '{PLANES}' or '{FEATURES}', got {observation!r}")
+        self.env = BatchSnakeEnv(num_games, board_size, seed=seed)
+        self.num_games = num_games
+        self.board_size = board_size
+        self.observation = observation
+        self.auto_reset = auto_reset
+        self.max_idle_steps = board_size * board_size if max_idle_steps is None else max_idle_steps
+        self.reward_food = reward_food
+        self.reward_death = reward_death
+        self.reward_step = reward_step
+        
+        k, cells = num_games, board_size * board_size
+        if observation == PLANES:
+            self.observation_shape: Tuple[int, ...] = (PLANE_COUNT, board_size, board_size)
+        else:
+            self.observation_shape = (FEATURE_COUNT,)
+        self.action_count = ACTION_COUNT
+        self.observations = np.zeros((k,) + self.observation_shape, dtype=dtype)
+        self.rewards = np.zeros(k, dtype=np.float32)
+        self.terminated = np.zeros(k, dtype=bool)
+        self.truncated = np.zeros(k, dtype=bool)
+        self.info: Dict[str, np.ndarray] = {
+            'final_observation': np.zeros_like(self.observations),
+            'final_score': np.zeros(k, dtype=np.int32),
+            'final_steps': np.zeros(k, dtype=np.int32),
+        }
+        
+        self._rows = np.arange(k)
+        self._done = np.zeros(k, dtype=bool)
+        self._idle = np.zeros(k, dtype=np.int32)
+        # Flat (game, plane, cell) view of the planes, and the cells last marked
+        self._cells = self.observations.reshape(k, -1, cells) if observation == PLANES else None
+        self._last_head = np.zeros(k, dtype=np.int32)
+        self._last_food = np.zeros(k, dtype=np.int32)
+        self._write_observations(self._rows)
+    
+    def reset(self, seed: Optional[int] = None, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Start a new episode in every game, or only those selected by a boolean mask
+        
+        ``seed`` reseeds the food placement, so a seed and the same actions
+        replay the same episodes.
+        """
+        if seed is not None:
+            self.env.rng = np.random.default_rng(seed)
+        games = self._rows if mask is None else np.flatnonzero(mask)
+        self.env.reset(mask)
+        self._idle[games] = 0
+        self._write_observations(games)
+        return self.observations
+    
+    def step(self, actions: np.ndarray) -> Step:
+        """Advance every game by one tick with one action per game
+        
+        Returns ``(observations, rewards, terminated, truncated, info)``;
+        every array is one of the buffers owned by the environment.
+        """
+        env = self.env
+        rows = self._rows
+        old_tail = env.body[rows, env.tail_ptr] if self._cells is not None else None
+        np.copyto(self.terminated, env.step(actions))
+        
+        rewards = self.rewards
+        np.multiply(env.ate, self.reward_food, out=rewards)
+        np.add(rewards, self.reward_death, out=rewards, where=env.died)
+        if self.reward_step:
+            rewards += self.reward_step
+        
+        # Truncate live games that have gone too long without food
+        idle = self._idle
+        idle += 1
+        np.copyto(idle, 0, where=env.ate)
+        if self.max_idle_steps:
+            np.greater_equal(idle, self.max_idle_steps, out=self.truncated)
+            np.logical_and(self.truncated, env.alive, out=self.truncated)
+            if not self.auto_reset:
+                # Stop truncated games where they are, as finished ones are
+                env.alive[self.truncated] = False
+        np.logical_or(self.terminated, self.truncated, out=self._done)
+        
+        if self._cells is not None:
+            self._update_planes(old_tail)
+        else:
+            self._write_features(rows)
+        
+        if self.auto_reset and self._done.any():
+            games = np.flatnonzero(self._done)
+            self.info['final_observation'][games] = self.observations[games]
+            self.info['final_score'][games] = env.score[games]
+            self.info['final_steps'][games] = env.steps[games]
+            env.reset(self._done)
+            idle[games] = 0
+            self._write_observations(games)
+        return self.observations, rewards, self.terminated, self.truncated, self.info
+    
+    def _write_observations(self, games: np.ndarray):
+        """Rewrite the observations of the given games from scratch"""
+        if self._cells is None:
+            self._write_features(games)
+            return
+        env = self.env
+        cells = self._cells
+        cells[games] = 0
+        cells[games, BODY_PLANE] = env.occupancy[games]
+        cells[games, HEAD_PLANE, env.head[games]] = 1
+        food = env.food[games]
+        cells[games, FOOD_PLANE, food] = food >= 0
+        self._last_head[games] = env.head[games]
+        self._last_food[games] = food
+    
+    def _update_planes(self, old_tail: np.ndarray):
+        """Apply one tick to the planes: only the old tail, head and food cells change"""
+        env = self.env
+        rows = self._rows
+        cells = self._cells
+        body = cells[:, BODY_PLANE]
+        body[rows, old_tail] = env.occupancy[rows, old_tail]
+        body[rows, env.head] = 1
+        
+        head = cells[:, HEAD_PLANE]
+        head[rows, self._last_head] = 0
+        head[rows, env.head] = 1
+        np.copyto(self._last_head, env.head)
+        
+        # A full board has no food (-1): clear the marker and write nothing
+        food = cells[:, FOOD_PLANE]
+        food[rows, self._last_food] = 0
+        food[rows, env.food] = env.food >= 0
+        np.copyto(self._last_food, env.food)
+    
+    def _write_features(self, games: np.ndarray):
+        """Compute the feature vectors of the given games"""
+        env = self.env
+        size = self.board_size
+        features = self.observations
+        # Every game (each step) goes through slices instead of gathers and scatters
+        selected = slice(None) if games is self._rows else games
+        head_y, head_x = np.divmod(env.head[selected], size)
+        for direction in range(ACTION_COUNT):
+            x = head_x + DIRECTION_DX[direction]
+            y = head_y + DIRECTION_DY[direction]
+            wall = (x < 0) | (x >= size) | (y < 0) | (y >= size)
+            cell = np.where(wall, 0, y * size + x)
+            features[selected, direction] = wall | (env.occupancy[games, cell] == 1)
+        
+        features[selected, 4:8] = 0
+        features[games, 4 + env.direction[selected].astype(np.intp)] = 1
+        food = env.food[selected]
+        food_y, food_x = np.divmod(food, size)
+        has_food = food >= 0
+        features[selected, 8] = np.where(has_food, (food_x - head_x) / size, 0)
+        features[selected, 9] = np.where(has_food, (food_y - head_y) / size, 0)
+        features[selected, 10] = env.length[selected] / (size * size)
\ No newline at end of file
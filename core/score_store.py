@@ -0,0 +1,312 @@
+"""
+Score Store
+Shared high-score storage backed by SQLite with write-behind
+"""
+
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional, Tuple
+from models.game_state import HighScore, HighScores
+from core.metrics import registry
+
+
+# fsync policy -> SQLite synchronous pragma
+FSYNC_POLICIES = {
+    'off': 'OFF',        # leave flushing to the OS
+    'normal': 'NORMAL',  # fsync at WAL checkpoints; safe against app crashes
+    'full': 'FULL',      # fsync every committed batch
+}
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    score INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    player TEXT NOT NULL,
+    game_id TEXT  -- replay file <game_id>.snkr in the replay archive, if kept
+);
+CREATE INDEX IF NOT EXISTS idx_scores_score ON scores (score DESC, id ASC);
+'''
+
+# Queue sentinels asking the writer thread to exit, or to reload the cache
+_STOP = object()
+_REFRESH = object()
+
+Row = Tuple[int, str, str, Optional[str]]
+
+ADD_SECONDS = registry.histogram('snake_score_add_seconds', 'Time add_score() takes on the caller, before the background write')
+SAVE_SECONDS = registry.histogram('snake_score_save_seconds', 'Time from add_score() until the score is committed to the database')
+WRITE_ERRORS = registry.counter('snake_score_write_errors', 'Failed score batch inserts, retried or not')
+DROPPED_SCORES = registry.counter('snake_scores_dropped', 'Scores dropped after every write attempt failed')
+
+
+class ScoreStore:
+    """Process-wide high-score store
+    
+    Scores live in an SQLite database in WAL mode, so several processes can
+    share one file. add_score() only updates the in-memory top-N cache and
+    queues the row; a background writer thread inserts queued rows in
+    batches, so the event loop never waits on disk. The cache is refreshed
+    from the database every ``cache_ttl`` seconds to pick up scores written
+    by other processes; the reload also runs on the writer thread, between
+    batches, so it sees every row exactly once: either committed or still
+    pending. A batch that fails is retried ``write_attempts`` times, then
+    dropped and counted in snake_scores_dropped_total.
+    
+    game_id is unique across every process sharing the file: background
+    rows that repeat one are ignored, and add_unique_score() inserts right
+    away and reports whether the id was new, for callers that must reject
+    duplicates (verified submissions).
+    """
+    
+    def __init__(self, db_path: str, top_n: int = 10, fsync: str = 'normal',
+                 cache_ttl: float = 5.0, batch_size: int = 100,
+                 legacy_json: Optional[str] = None, write_attempts: int = 3):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"unknown fsync policy {fsync!r}, expected one of {sorted(FSYNC_POLICIES)}")
+        self.db_path = db_path
+        self.top_n = top_n
+        self.fsync = fsync
+        self.cache_ttl = cache_ttl
+        self.batch_size = batch_size
+        self.write_attempts = write_attempts
+        
+        self._lock = threading.Lock()
+        self._pending: List[Row] = []
+        self._queue: 'queue.Queue' = queue.Queue()
+        self._reader = self._connect()
+        self._reader_lock = threading.Lock()  # the reader is also used from executor threads
+        self._reader.executescript(_SCHEMA)
+        self._upgrade_schema()
+        if legacy_json:
+            self._migrate_json(legacy_json)
+        
+        self._cache = HighScores()
+        self._refreshed_at = 0.0
+        self._refresh_queued = False
+        self.refresh()
+        
+        self._writer = threading.Thread(target=self._write_loop, name='score-writer', daemon=True)
+        self._writer.start()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with WAL journaling and the fsync policy"""
+        connection = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute(f'PRAGMA synchronous={FSYNC_POLICIES[self.fsync]}')
+        return connection
+    
+    def _upgrade_schema(self):
+        """Add the game_id column to databases created before it existed, and its unique index"""
+        columns = [column[1] for column in self._reader.execute('PRAGMA table_info(scores)')]
+        with self._reader:
+            if 'game_id' not in columns:
+                self._reader.execute('ALTER TABLE scores ADD COLUMN game_id TEXT')
+            self._reader.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_scores_game_id ON scores (game_id)')
+    
+    def _migrate_json(self, filename: str):
+        """Import a legacy high_scores.json into an empty database
+        
+        Processes starting together may race here: the emptiness check and
+        the import share one write transaction, so only the first imports,
+        and a file another process already renamed counts as migrated.
+        """
+        if not os.path.exists(filename):
+            return
+        
+        legacy = HighScores.load_from_file(filename)
+        self._reader.execute('BEGIN IMMEDIATE')
+        try:
+            if not self._reader.execute('SELECT 1 FROM scores LIMIT 1').fetchone():
+                self._reader.executemany(
+                    'INSERT OR IGNORE INTO scores (score, date, player, game_id) VALUES (?, ?, ?, ?)',
+                    [(entry.score, entry.date, entry.player, entry.game_id) for entry in legacy.scores]
+                )
+            self._reader.commit()
+        except BaseException:
+            self._reader.rollback()
+            raise
+        try:
+            os.replace(filename, filename + '.migrated')
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Error renaming migrated high scores file: {e}")
+    
+    def add_score(self, score: int, player: str = "Player", game_id: Optional[str] = None):
+        """Record a score, linked to its replay by ``game_id``; the database write happens in the background"""
+        started = time.perf_counter()
+        row = (score, datetime.now().strftime("%Y-%m-%d %H:%M"), player, game_id)
+        with self._lock:
+            self._pending.append(row)
+            self._cache.add_score(score, player, game_id)
+        self._queue.put((row, started))
+        ADD_SECONDS.observe(time.perf_counter() - started)
+    
+    def has_game(self, game_id: str) -> bool:
+        """Whether a score with this game_id is stored; blocks on SQLite, so call it off the event loop"""
+        with self._reader_lock:
+            return self._reader.execute('SELECT 1 FROM scores WHERE game_id = ?', (game_id,)).fetchone() is not None
+    
+    def add_unique_score(self, score: int, player: str, game_id: str) -> bool:
+        """Insert a score now unless its game_id is already stored; returns whether it was added
+        
+        Blocks on SQLite, so call it off the event loop.
+        """
+        started = time.perf_counter()
+        row = (score, datetime.now().strftime("%Y-%m-%d %H:%M"), player, game_id)
+        try:
+            with self._reader_lock, self._reader:
+                self._reader.execute('INSERT INTO scores (score, date, player, game_id) VALUES (?, ?, ?, ?)', row)
+        except sqlite3.IntegrityError:
+            return False
+        with self._lock:
+            self._cache.add_score(score, player, game_id)
+        SAVE_SECONDS.observe(time.perf_counter() - started)
+        return True
+    
+    def get_high_scores(self) -> HighScores:
+        """Top-N scores from the in-memory cache; a stale cache is reloaded in the background"""
+        if time.monotonic() - self._refreshed_at > self.cache_ttl and not self._refresh_queued:
+            self._refresh_queued = True
+            self._queue.put(_REFRESH)
+        return self._cache
+    
+    def get_high_score(self) -> int:
+        """The highest score"""
+        return self.get_high_scores().get_high_score()
+    
+    def refresh(self, connection: Optional[sqlite3.Connection] = None):
+        """Reload the top-N cache from the database plus unwritten scores
+        
+        Blocks on SQLite: outside of start-up it only runs on the writer
+        thread, where no batch can commit between the read and the
+        ``_pending`` snapshot.
+        """
+        rows = (connection or self._reader).execute(
+            'SELECT score, date, player, game_id FROM scores ORDER BY score DESC, id ASC LIMIT ?',
+            (self.top_n,)
+        ).fetchall()
+        with self._lock:
+            rows = sorted(rows + self._pending, key=lambda row: row[0], reverse=True)
+            self._cache.replace_scores([
+                HighScore(score=score, date=date, player=player, game_id=game_id)
+                for score, date, player, game_id in rows[:self.top_n]
+            ])
+        self._refreshed_at = time.monotonic()
+        self._refresh_queued = False
+    
+    def _write_loop(self):
+        """Writer thread: insert queued rows in batches"""
+        connection = self._connect()
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = _STOP in batch
+            refreshing = _REFRESH in batch
+            scores = [item for item in batch if item is not _STOP and item is not _REFRESH]
+            if scores and self._write_batch(connection, [row for row, _ in scores]):
+                committed = time.perf_counter()
+                for _, queued in scores:
+                    SAVE_SECONDS.observe(committed - queued)
+            if refreshing:
+                try:
+                    self.refresh(connection)
+                except sqlite3.Error:
+                    # Keep serving the old cache; the next stale read asks again
+                    self._refresh_queued = False
+            for _ in batch:
+                self._queue.task_done()
+        connection.close()
+    
+    def _write_batch(self, connection: sqlite3.Connection, batch: List[Row]) -> bool:
+        """Insert one batch of rows in a single transaction, retrying failures
+        
+        Rows leave ``_pending`` either way: once committed, or once every
+        attempt has failed and they are dropped. Returns whether they were
+        committed.
+        """
+        committed = False
+        for attempt in range(self.write_attempts):
+            try:
+                with connection:
+                    connection.executemany(
+                        'INSERT OR IGNORE INTO scores (score, date, player, game_id) VALUES (?, ?, ?, ?)', batch
+                    )
+                committed = True
+                break
+            except sqlite3.Error:
+                WRITE_ERRORS.inc()
+                if attempt + 1 < self.write_attempts:
+                    time.sleep(0.1 * 2 ** attempt)
+        if not committed:
+            DROPPED_SCORES.inc(len(batch))
+        with self._lock:
+            for row in batch:
+                self._pending.remove(row)
+        return committed
+    
+    def flush(self):
+        """Block until every queued score has been written"""
+        self._queue.join()
+    
+    def close(self):
+        """Flush pending scores and stop the writer thread"""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        with self._reader_lock:
+            self._reader.close()
+
+
+_store: Optional[ScoreStore] = None
+_store_lock = threading.Lock()
+
+
+def get_score_store() -> ScoreStore:
+    """The process-wide score store, created on first use"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            from app.config import settings
+            _store = ScoreStore(
+                settings.high_score_db,
+                fsync=settings.score_fsync,
+                cache_ttl=settings.score_cache_ttl,
+                legacy_json=settings.high_score_file
+            )
+            atexit.register(_store.close)
+        return _store
+
+
+class NullScoreStore:
+    """Score store that keeps nothing, for headless simulations and replays"""
+    
+    def add_score(self, score: int, player: str = "Player", game_id: Optional[str] = None):
+        """Discard a score"""
+    
+    def has_game(self, game_id: str) -> bool:
+        """Nothing is stored"""
+        return False
+    
+    def add_unique_score(self, score: int, player: str, game_id: str) -> bool:
+        """Discard a score, as if it were new"""
+        return True
+    
+    def get_high_scores(self) -> HighScores:
+        """Always empty"""
+        return HighScores()
+    
+    def get_high_score(self) -> int:
+        """Always zero"""
+        return 0
\ No newline at end of file
@@ -0,0 +1,123 @@
+"""
+Game Snapshots
+Compact binary snapshots of a running game, for resuming it in another process
+"""
+
+import sys
+import struct
+from array import array
+from models.game_state import GameState
+from core.game_engine import SnakeGameEngine
+from core.replay import DIRECTIONS, DIRECTION_CODES, Replay
+
+
+# Header: magic, format version, board size, flags, direction code, score,
+# moves, food cell, snake length, game id, replay seed, replay length
+SNAPSHOT_MAGIC = b'SNKS'
+SNAPSHOT_VERSION = 1
+_HEADER = struct.Struct('<4sBHBBIIiI16sQI')
+
+# Random.getstate() of the Mersenne Twister: 624 state words plus the position
+RNG_WORDS = 625
+_RNG_VERSION = 3
+_GAUSS = struct.Struct('<?d')
+
+_SPARSE = 1
+_PAUSED = 2
+_GAME_OVER = 4
+_WON = 8
+_AUTOPLAYED = 16
+
+
+class SnapshotError(ValueError):
+    """Raised for malformed snapshot data"""
+
+
+def _little_endian(words: array) -> bytes:
+    if sys.byteorder == 'big':
+        words = array(words.typecode, words)
+        words.byteswap()
+    return words.tobytes()
+
+
+def _from_little_endian(typecode: str, data: bytes) -> array:
+    words = array(typecode)
+    words.frombytes(data)
+    if sys.byteorder == 'big':
+        words.byteswap()
+    return words
+
+
+def snapshot_engine(engine: SnakeGameEngine) -> bytes:
+    """Serialize a game: board, score, RNG state and the replay so far
+    
+    Layout: header, gauss flag and value, the 625 RNG words, the snake as
+    packed cells head first (int32 each), then the replay's input bytes.
+    """
+    state = engine.game_state
+    flags = ((_SPARSE if state.body.grid is None else 0) | (_PAUSED if state.is_paused else 0) |
+             (_GAME_OVER if state.is_game_over else 0) | (_WON if state.is_won else 0) |
+             (_AUTOPLAYED if engine.autoplayed else 0))
+    _, words, gauss = engine.rng.getstate()
+    replay = engine.replay
+    header = _HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION, state.board_size, flags, DIRECTION_CODES[state.direction],
+        state.score, state.moves, state.food_cell, len(state.body),
+        bytes.fromhex(engine.game_id), replay.seed, len(replay)
+    )
+    return b''.join((
+        header,
+        _GAUSS.pack(gauss is not None, gauss or 0.0),
+        _little_endian(array('I', words)),
+        _little_endian(array('i', state.body)),
+        replay.inputs
+    ))
+
+
+def restore_engine(data: bytes, **engine_args) -> SnakeGameEngine:
+    """Rebuild an engine from snapshot_engine() output
+    
+    ``engine_args`` are passed to SnakeGameEngine, e.g. the score store and
+    replay archive; board size and occupancy mode come from the snapshot.
+    """
+    if len(data) < _HEADER.size + _GAUSS.size + RNG_WORDS * 4:
+        raise SnapshotError("snapshot is shorter than its header")
+    (magic, version, board_size, flags, direction, score, moves, food_cell,
+     length, game_id, seed, replay_length) = _HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError("not a snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"unsupported snapshot version {version}")
+    offset = _HEADER.size
+    has_gauss, gauss = _GAUSS.unpack_from(data, offset)
+    offset += _GAUSS.size
+    words = _from_little_endian('I', data[offset:offset + RNG_WORDS * 4])
+    offset += RNG_WORDS * 4
+    cells = _from_little_endian('i', data[offset:offset + length * 4])
+    offset += length * 4
+    inputs = data[offset:]
+    if len(cells) != length or len(inputs) != replay_length:
+        raise SnapshotError("truncated snapshot")
+    cell_count = board_size * board_size
+    if (direction >= len(DIRECTIONS) or not length or food_cell >= cell_count
+            or any(not 0 <= cell < cell_count for cell in cells)):
+        raise SnapshotError("invalid snapshot contents")
+    
+    engine = SnakeGameEngine(board_size=board_size, sparse=bool(flags & _SPARSE), seed=0, **engine_args)
+    state: GameState = engine.game_state
+    state.body.clear()
+    for cell in reversed(cells):
+        state.body.push_head(cell)
+    state.food_cell = food_cell
+    state.direction = DIRECTIONS[direction]
+    state.score = score
+    state.moves = moves
+    state.is_paused = bool(flags & _PAUSED)
+    state.is_game_over = bool(flags & _GAME_OVER)
+    state.is_won = bool(flags & _WON)
+    
+    engine.rng.setstate((_RNG_VERSION, tuple(words), gauss if has_gauss else None))
+    engine.game_id = game_id.hex()
+    engine.autoplayed = bool(flags & _AUTOPLAYED)
+    engine.replay = Replay(board_size, seed, inputs)
+    return engine
\ No newline at end of file
@@ -12,5 +12,12 @@ load_dotenv()
 
 # Import and run the application
 if __name__ == "__main__":
-    from app.main import main
-    main()
\ No newline at end of file
+    from app.config import settings
+    
+    if settings.workers > 1:
+        # One game process per worker behind a sticky router
+        from app.services.sharding import run_sharded
+        run_sharded(settings.host, settings.port, settings.workers, settings.worker_base_port)
+    else:
+        from app.main import main
+        main()
\ No newline at end of file
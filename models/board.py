@@ -0,0 +1,198 @@
+"""
+Board Models
+Compact snake body and occupancy representation
+"""
+
+import random
+from array import array
+from collections import deque
+from typing import Iterable, Iterator, Optional, Tuple
+
+
+class FreeCellIndex:
+    """Set of free cell ids supporting O(1) add, remove and uniform random pick.
+    
+    Free cells are kept densely packed in ``cells``; ``slots`` maps each cell id
+    to its index in ``cells`` (or -1 when occupied). Removal swaps the last
+    free cell into the vacated slot.
+    """
+    
+    __slots__ = ('cells', 'slots')
+    
+    def __init__(self, cell_count: int):
+        self.cells = array('i', range(cell_count))
+        self.slots = array('i', range(cell_count))
+    
+    def __len__(self) -> int:
+        return len(self.cells)
+    
+    def __contains__(self, cell: int) -> bool:
+        return self.slots[cell] >= 0
+    
+    def add(self, cell: int):
+        """Mark a cell as free"""
+        if self.slots[cell] < 0:
+            self.slots[cell] = len(self.cells)
+            self.cells.append(cell)
+    
+    def remove(self, cell: int):
+        """Mark a cell as occupied"""
+        index = self.slots[cell]
+        if index < 0:
+            return
+        last = self.cells.pop()
+        if last != cell:
+            self.cells[index] = last
+            self.slots[last] = index
+        self.slots[cell] = -1
+    
+    def choice(self, rng: random.Random = random) -> Optional[int]:
+        """Pick a uniformly random free cell, or None when the board is full"""
+        if not self.cells:
+            return None
+        return self.cells[rng.randrange(len(self.cells))]
+
+
+class SnakeBody:
+    """Snake segments stored as packed cell ids (y * board_size + x), head first.
+    
+    The segments live in a deque so moving and growing are O(1) at both ends,
+    and a bytearray occupancy grid of board_size**2 cells makes collision
+    checks O(1) regardless of snake length. A FreeCellIndex of the cells not
+    covered by the snake is kept in step with every move.
+    """
+    
+    __slots__ = ('board_size', 'cells', 'grid', 'free')
+    
+    def __init__(self, board_size: int, cells: Iterable[int] = ()):
+        self.board_size = board_size
+        self.cells: deque = deque()
+        self.grid = bytearray(board_size * board_size)
+        self.free = FreeCellIndex(board_size * board_size)
+        for cell in cells:
+            self.cells.append(cell)
+            self.grid[cell] = 1
+            self.free.remove(cell)
+    
+    def pack(self, x: int, y: int) -> int:
+        """Pack board coordinates into a cell id"""
+        return y * self.board_size + x
+    
+    def unpack(self, cell: int) -> Tuple[int, int]:
+        """Unpack a cell id into (x, y) board coordinates"""
+        y, x = divmod(cell, self.board_size)
+        return x, y
+    
+    @property
+    def head(self) -> int:
+        """Cell id of the snake head"""
+        return self.cells[0]
+    
+    @property
+    def tail(self) -> int:
+        """Cell id of the last snake segment"""
+        return self.cells[-1]
+    
+    def __len__(self) -> int:
+        return len(self.cells)
+    
+    def __contains__(self, cell: int) -> bool:
+        return self.grid[cell] == 1
+    
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.cells)
+    
+    def push_head(self, cell: int):
+        """Add a new head segment"""
+        self.cells.appendleft(cell)
+        self.grid[cell] = 1
+        self.free.remove(cell)
+    
+    def pop_tail(self) -> int:
+        """Remove and return the tail segment"""
+        cell = self.cells.pop()
+        self.grid[cell] = 0
+        self.free.add(cell)
+        return cell
+    
+    def clear(self):
+        """Remove all segments"""
+        for cell in self.cells:
+            self.grid[cell] = 0
+            self.free.add(cell)
+        self.cells.clear()
+
+
+class SparseFreeCells:
+    """Free-cell view of a SparseSnakeBody, without any per-cell storage
+    
+    Picks are made by rejection sampling, which needs about one try while
+    the snake covers a small fraction of the board; a board that is almost
+    full falls back to a scan.
+    """
+    
+    __slots__ = ('body',)
+    
+    # Random tries before falling back to scanning the board
+    MAX_TRIES = 64
+    
+    def __init__(self, body: 'SparseSnakeBody'):
+        self.body = body
+    
+    def __len__(self) -> int:
+        return self.body.board_size ** 2 - len(self.body.occupied)
+    
+    def __contains__(self, cell: int) -> bool:
+        return cell not in self.body.occupied
+    
+    def choice(self, rng: random.Random = random) -> Optional[int]:
+        """Pick a uniformly random free cell, or None when the board is full"""
+        occupied = self.body.occupied
+        cell_count = self.body.board_size ** 2
+        for _ in range(self.MAX_TRIES):
+            cell = rng.randrange(cell_count)
+            if cell not in occupied:
+                return cell
+        
+        free = [cell for cell in range(cell_count) if cell not in occupied]
+        return rng.choice(free) if free else None
+
+
+class SparseSnakeBody(SnakeBody):
+    """SnakeBody for very large boards, with memory proportional to snake length
+    
+    Occupancy is a hash set of packed cell ids instead of a board_size**2
+    grid, and there is no free-cell index, so a 2000x2000 board costs the
+    same per tick and per session as a small one.
+    """
+    
+    __slots__ = ('occupied',)
+    
+    def __init__(self, board_size: int, cells: Iterable[int] = ()):
+        self.board_size = board_size
+        self.cells: deque = deque()
+        self.grid = None
+        self.occupied = set()
+        self.free = SparseFreeCells(self)
+        for cell in cells:
+            self.cells.append(cell)
+            self.occupied.add(cell)
+    
+    def __contains__(self, cell: int) -> bool:
+        return cell in self.occupied
+    
+    def push_head(self, cell: int):
+        """Add a new head segment"""
+        self.cells.appendleft(cell)
+        self.occupied.add(cell)
+    
+    def pop_tail(self) -> int:
+        """Remove and return the tail segment"""
+        cell = self.cells.pop()
+        self.occupied.discard(cell)
+        return cell
+    
+    def clear(self):
+        """Remove all segments"""
+        self.occupied.clear()
+        self.cells.clear()
\ No newline at end of file
@@ -1,13 +1,17 @@
 """
 Game State Models
+Runtime game state uses plain __slots__ classes; pydantic models are only
+used at the edges (high-score I/O here, API serialization in models.schemas).
 """
 
-from pydantic import BaseModel, Field
-from typing import List, Tuple, Optional
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import List, Tuple, Optional, Iterator
+from collections.abc import Sequence
 from enum import Enum
 import json
 import os
 from datetime import datetime
+from models.board import SnakeBody, SparseSnakeBody
 
 
 class Direction(str, Enum):
@@ -18,10 +22,31 @@ class Direction(str, Enum):
     RIGHT = "right"
 
 
-class Position(BaseModel):
+# Per-direction (dx, dy) movement offsets
+DIRECTION_DELTAS = {
+    Direction.UP: (0, -1),
+    Direction.DOWN: (0, 1),
+    Direction.LEFT: (-1, 0),
+    Direction.RIGHT: (1, 0)
+}
+
+# Direction a snake may not turn to from each direction
+OPPOSITE_DIRECTIONS = {
+    Direction.UP: Direction.DOWN,
+    Direction.DOWN: Direction.UP,
+    Direction.LEFT: Direction.RIGHT,
+    Direction.RIGHT: Direction.LEFT
+}
+
+
+class Position:
     """2D position on the game board"""
-    x: int = Field(..., ge=0)
-    y: int = Field(..., ge=0)
+    
+    __slots__ = ('x', 'y')
+    
+    def __init__(self, x: int, y: int):
+        self.x = x
+        self.y = y
     
     def __eq__(self, other):
         if isinstance(other, Position):
@@ -30,31 +55,103 @@ class Position(BaseModel):
     
     def __hash__(self):
         return hash((self.x, self.y))
+    
+    def __repr__(self):
+        return f"Position(x={self.x}, y={self.y})"
 
 
-class GameState(BaseModel):
-    """Complete game state"""
-    snake: List[Position] = Field(default_factory=list)
-    food: Optional[Position] = None
-    direction: Direction = Direction.RIGHT
-    score: int = 0
-    is_game_over: bool = False
-    is_paused: bool = False
-    board_size: int = 20
+class SnakeView(Sequence):
+    """Read-only list-like view of a SnakeBody as positions, head first"""
+    
+    def __init__(self, body: SnakeBody):
+        self._body = body
+    
+    def __len__(self) -> int:
+        return len(self._body)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._position(cell) for cell in list(self._body.cells)[index]]
+        return self._position(self._body.cells[index])
+    
+    def __iter__(self) -> Iterator[Position]:
+        for cell in self._body.cells:
+            yield self._position(cell)
+    
+    def __contains__(self, item) -> bool:
+        """O(1) membership test through the occupancy grid"""
+        if not isinstance(item, Position):
+            return False
+        size = self._body.board_size
+        if not (0 <= item.x < size and 0 <= item.y < size):
+            return False
+        return self._body.pack(item.x, item.y) in self._body
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (SnakeView, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return repr(list(self))
+    
+    def _position(self, cell: int) -> Position:
+        x, y = self._body.unpack(cell)
+        return Position(x=x, y=y)
+
+
+class GameState:
+    """Complete game state
+    
+    The snake is a packed-cell SnakeBody (a SparseSnakeBody on very large
+    boards) and the food is a packed cell id (-1 when there is none);
+    ``snake`` and ``food`` expose them as positions.
+    """
+    
+    __slots__ = ('board_size', 'body', 'food_cell', 'direction', 'score',
+                 'is_game_over', 'is_paused', 'is_won', 'moves')
+    
+    def __init__(self, board_size: int = 20, sparse: bool = False):
+        self.board_size = board_size
+        self.body = SparseSnakeBody(board_size) if sparse else SnakeBody(board_size)
+        self.food_cell = -1
+        self.direction = Direction.RIGHT
+        self.score = 0
+        self.is_game_over = False
+        self.is_paused = False
+        self.is_won = False
+        self.moves = 0  # successful moves since the last reset
+    
+    @property
+    def snake(self) -> SnakeView:
+        """Snake segments as positions, head first"""
+        return SnakeView(self.body)
+    
+    @property
+    def food(self) -> Optional[Position]:
+        """Food position, if any"""
+        if self.food_cell < 0:
+            return None
+        x, y = self.body.unpack(self.food_cell)
+        return Position(x=x, y=y)
+    
+    @food.setter
+    def food(self, position: Optional[Position]):
+        self.food_cell = -1 if position is None else self.body.pack(position.x, position.y)
     
     def reset(self):
         """Reset game to initial state"""
         center = self.board_size // 2
-        self.snake = [
-            Position(x=center, y=center),
-            Position(x=center-1, y=center),
-            Position(x=center-2, y=center)
-        ]
+        self.body.clear()
+        for x in (center - 2, center - 1, center):
+            self.body.push_head(self.body.pack(x, center))
         self.direction = Direction.RIGHT
         self.score = 0
         self.is_game_over = False
         self.is_paused = False
-        self.food = None
+        self.is_won = False
+        self.moves = 0
+        self.food_cell = -1
 
 
 class HighScore(BaseModel):
@@ -62,22 +159,39 @@ class HighScore(BaseModel):
     score: int
     date: str
     player: str = "Player"
+    game_id: Optional[str] = None  # links the entry to its archived replay
 
 
 class HighScores(BaseModel):
     """High scores collection"""
     scores: List[HighScore] = Field(default_factory=list)
     
-    def add_score(self, score: int, player: str = "Player"):
+    # Bumped on every change so views can skip re-rendering unchanged scores
+    _revision: int = PrivateAttr(default=0)
+    
+    @property
+    def revision(self) -> int:
+        """Change counter for the scores list"""
+        return self._revision
+    
+    def add_score(self, score: int, player: str = "Player", game_id: Optional[str] = None):
         """Add a new high score"""
         new_score = HighScore(
             score=score,
             date=datetime.now().strftime("%Y-%m-%d %H:%M"),
-            player=player
+            player=player,
+            game_id=game_id
         )
         self.scores.append(new_score)
         self.scores.sort(key=lambda x: x.score, reverse=True)
         self.scores = self.scores[:10]  # Keep top 10
+        self._revision += 1
+    
+    def replace_scores(self, scores: List[HighScore]):
+        """Replace the scores list, bumping the revision only if it changed"""
+        if scores != self.scores:
+            self.scores = scores
+            self._revision += 1
     
     def get_high_score(self) -> int:
         """Get the highest score"""
@@ -0,0 +1,15 @@
+"""
+API Schemas
+Validated pydantic models for data crossing the application boundary
+"""
+
+from pydantic import BaseModel, Field
+
+
+class ScoreSubmissionModel(BaseModel):
+    """Score submitted by a client or bot, with the replay that proves it"""
+    player: str = Field("Player", min_length=1, max_length=32)
+    score: int = Field(..., ge=0)
+    board_size: int = Field(..., gt=2, le=4096)
+    seed: int = Field(..., ge=0, lt=2 ** 64)
+    inputs: str = Field(..., max_length=2_000_000)  # base64, one direction byte per tick